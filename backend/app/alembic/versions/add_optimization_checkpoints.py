@@ -0,0 +1,30 @@
+"""add optimization_checkpoints table
+
+Revision ID: add_optimization_checkpoints
+Revises: add_optimization_task_queue
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_optimization_checkpoints'
+down_revision = 'add_optimization_task_queue'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'optimization_checkpoints',
+        sa.Column('task_id', sa.Uuid(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['optimization_tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('optimization_checkpoints')
@@ -0,0 +1,26 @@
+"""add result_key to optimization_tasks
+
+Revision ID: add_optimization_result_key
+Revises: add_optimization_checkpoints
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = 'add_optimization_result_key'
+down_revision = 'add_optimization_checkpoints'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('optimization_tasks', sa.Column('result_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.create_index('ix_optimization_tasks_result_key', 'optimization_tasks', ['result_key'])
+
+
+def downgrade():
+    op.drop_index('ix_optimization_tasks_result_key', table_name='optimization_tasks')
+    op.drop_column('optimization_tasks', 'result_key')
@@ -0,0 +1,46 @@
+"""add task queue fields to optimization_tasks
+
+Revision ID: add_optimization_task_queue
+Revises: add_simulation_scenario
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = 'add_optimization_task_queue'
+down_revision = 'add_simulation_scenario'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PostgreSQL 12+ 允许在事务中添加枚举值（同一事务内不使用新值）
+    op.execute("ALTER TYPE taskstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+
+    op.add_column('optimization_tasks', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('optimization_tasks', sa.Column('worker_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+    op.add_column('optimization_tasks', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    op.add_column('optimization_tasks', sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('optimization_tasks', sa.Column('error_message', sa.String(), nullable=True))
+
+    # worker 按创建时间领取 PENDING 任务
+    op.create_index(
+        'ix_optimization_tasks_status_created_at',
+        'optimization_tasks',
+        ['status', 'created_at'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_optimization_tasks_status_created_at', table_name='optimization_tasks')
+    op.drop_column('optimization_tasks', 'error_message')
+    op.drop_column('optimization_tasks', 'cancel_requested')
+    op.drop_column('optimization_tasks', 'heartbeat_at')
+    op.drop_column('optimization_tasks', 'worker_id')
+    op.drop_column('optimization_tasks', 'attempts')
+
+    # PostgreSQL 不支持删除枚举值，已取消的任务降级为失败
+    op.execute("UPDATE optimization_tasks SET status = 'FAILED' WHERE status = 'CANCELLED'")
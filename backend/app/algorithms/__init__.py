@@ -4,15 +4,36 @@
 包含:
 - part1_optimization: 技术优化模块 (NSGA-II遗传算法)
 - part2_decision: 商业决策模块 (AHP-TOPSIS)
+- agv_routing: 多AGV冲突感知路由 (时间窗预约表)
+- convergence: 收敛检测与提前终止
+- fitness_cache: 适应度缓存 (LRU，按个体哈希)
+- moo_engine: 多目标进化引擎 (NSGA-II / NSGA-III)
+- parallel: 并行适应度评估 (进程池)
+- pareto: 帕累托非支配排序 (轻重工业优化器共用)
+- path_network: 车间通道路网与AGV行驶距离矩阵
 - scheme_translator: 技术指标到商业指标的转换层
 """
 
 from . import part1_optimization
 from . import part2_decision
+from . import agv_routing
+from . import convergence
+from . import fitness_cache
+from . import moo_engine
+from . import parallel
+from . import pareto
+from . import path_network
 from . import scheme_translator
 
 __all__ = [
     'part1_optimization',
     'part2_decision',
+    'agv_routing',
+    'convergence',
+    'fitness_cache',
+    'moo_engine',
+    'parallel',
+    'pareto',
+    'path_network',
     'scheme_translator',
 ]
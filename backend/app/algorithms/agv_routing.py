@@ -0,0 +1,154 @@
+"""
+多AGV冲突感知路由
+
+在通道路网（AisleGraph）上用时间窗预约表做优先级规划：运输任务按顺序依次规划，
+每次用时空 A*（允许在节点等待）求最早到达的路线，并把途经通道段的占用时间窗
+写入预约表，后规划的运输必须避开已预约的时间窗。
+
+- 通道段按区段互斥（区域控制）：窄通道（宽度小于 two_lane_width）和站点接入线
+  同一时刻只允许一辆AGV通过，不分方向；宽通道按行驶方向分为两条车道，各自互斥
+- AGV驶离通道段后，该段额外保持 headway 的安全间隔
+- 在节点等待不占用通道
+
+时间单位与调用方一致（重工业优化器为小时），距离单位为米。
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
+class ReservationTable:
+    """
+    时间窗预约表：每个资源（通道段或车道）上已预约的互不重叠的时间区间
+    """
+
+    def __init__(self):
+        self._starts = {}
+        self._ends = {}
+
+    def earliest_slot(self, resource, t, duration):
+        """不早于 t、且能连续占用 duration 的最早开始时间"""
+        starts = self._starts.get(resource)
+        if not starts:
+            return t
+        ends = self._ends[resource]
+        i = bisect_right(ends, t)
+        while i < len(starts) and starts[i] < t + duration:
+            t = max(t, ends[i])
+            i += 1
+        return t
+
+    def reserve(self, resource, start, end):
+        """预约 [start, end]，与已有区间重叠时合并"""
+        starts = self._starts.setdefault(resource, [])
+        ends = self._ends.setdefault(resource, [])
+        i = bisect_left(starts, start)
+        if i > 0 and ends[i - 1] >= start:
+            i -= 1
+            start = starts[i]
+            end = max(end, ends[i])
+            del starts[i], ends[i]
+        while i < len(starts) and starts[i] <= end:
+            end = max(end, ends[i])
+            del starts[i], ends[i]
+        starts.insert(i, start)
+        ends.insert(i, end)
+
+
+class ConflictAwareRouter:
+    """
+    基于预约表的多AGV路由器
+
+    参数:
+    graph: AisleGraph 通道路网
+    speed: AGV行驶速度（米/时间单位）
+    headway: 通道段的安全间隔（时间单位）
+    two_lane_width: 宽度不小于该值的通道视为双车道（米）
+    """
+
+    def __init__(self, graph, speed, headway=0.0, two_lane_width=8.0):
+        self.graph = graph
+        self.speed = speed
+        self.headway = headway
+        self.two_lane_width = two_lane_width
+        self.table = ReservationTable()
+        self.wait_time = {}
+        self.traversals = {}
+
+    def _resource(self, u, v, width):
+        if width is not None and width >= self.two_lane_width:
+            return (u, v)
+        return (min(u, v), max(u, v))
+
+    def plan(self, origin, destination, depart):
+        """
+        规划一次运输并写入预约表
+
+        参数:
+        origin / destination: 站点编号（AisleGraph 的 stations 顺序）
+        depart: 出发时间
+
+        返回:
+        (到达时间, 途中等待时间)
+        """
+        graph = self.graph
+        source = int(graph.station_nodes[origin])
+        target = int(graph.station_nodes[destination])
+        if source == target:
+            return depart, 0.0
+        if not np.isfinite(graph.distance[source, target]):
+            # 路网不可达：按直线距离行驶，不参与冲突
+            distance = graph.station_distance[origin, destination]
+            return depart + distance / self.speed, 0.0
+
+        heuristic = graph.distance[:, target] / self.speed
+        arrival = {source: depart}
+        parent = {}
+        heap = [(depart + heuristic[source], depart, source)]
+        while heap:
+            _, t, u = heapq.heappop(heap)
+            if u == target:
+                break
+            if t > arrival[u]:
+                continue
+            for v, length, width in graph.adjacency[u]:
+                travel = length / self.speed
+                resource = self._resource(u, v, width)
+                enter = self.table.earliest_slot(resource, t, travel + self.headway)
+                reach = enter + travel
+                if reach < arrival.get(v, np.inf):
+                    arrival[v] = reach
+                    parent[v] = (u, t, enter, travel, resource)
+                    heapq.heappush(heap, (reach + heuristic[v], reach, v))
+
+        total_wait = 0.0
+        node = target
+        while node != source:
+            u, ready, enter, travel, resource = parent[node]
+            self.table.reserve(resource, enter, enter + travel + self.headway)
+            wait = enter - ready
+            total_wait += wait
+            self.wait_time[resource] = self.wait_time.get(resource, 0.0) + wait
+            self.traversals[resource] = self.traversals.get(resource, 0) + 1
+            node = u
+        return arrival[target], total_wait
+
+    def hotspots(self, top=5):
+        """等待时间最长的通道段：[{from, to, wait_time, traversals}, ...]"""
+        ranked = sorted(
+            (item for item in self.wait_time.items() if item[1] > 0),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top]
+        nodes = self.graph.nodes
+        return [
+            {
+                "from": [float(c) for c in nodes[resource[0]]],
+                "to": [float(c) for c in nodes[resource[1]]],
+                "wait_time": float(wait),
+                "traversals": self.traversals[resource],
+            }
+            for resource, wait in ranked
+        ]
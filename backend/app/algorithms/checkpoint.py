@@ -0,0 +1,211 @@
+"""
+进化检查点
+
+长时间运行的遗传算法每隔 checkpoint_interval 代保存一次进化状态（种群、随机数生成器
+状态、帕累托存档、进化历史、收敛检测状态），进程中断后重新运行同一任务时从最近的
+检查点继续，结果与不中断时一致。
+
+检查点编码为 .npz（压缩）：数值数组（如 objective_log）直接存为数组，
+其余对象（个体、存档等）pickle 后存为 uint8 数组，读取时不需要 allow_pickle。
+检查点记录问题输入（input_data）的哈希，输入改变后旧检查点不再使用。
+
+保存位置二选一：
+- checkpoint_path: 本地 .npz 文件（先写临时文件再原子替换）
+- checkpoint_store: 提供 load() -> bytes | None 和 save(blob) 的对象，例如数据库存储
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# 只影响运行方式、不属于问题输入的选项，不参与输入哈希
+_RUNTIME_OPTIONS = {
+    "checkpoint_store",
+    "checkpoint_path",
+    "checkpoint_interval",
+    "should_stop",
+    "on_generation",
+    "time_budget_seconds",
+    "parallelism",
+    "workers",
+}
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def canonical_json(value):
+    """规范化 JSON（键排序、紧凑分隔符），相同内容总是得到相同的字符串"""
+    return json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    )
+
+
+def input_digest(input_data):
+    """问题输入的 SHA-256，忽略检查点、回调、并行方式等运行选项"""
+    problem = {
+        key: value for key, value in input_data.items() if key not in _RUNTIME_OPTIONS
+    }
+    return hashlib.sha256(canonical_json(problem).encode("utf-8")).hexdigest()
+
+
+def encode(state):
+    """把检查点状态编码为 .npz 字节串"""
+    arrays = {}
+    objects = {}
+    for key, value in state.items():
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            arrays[f"array_{key}"] = value
+        else:
+            objects[key] = value
+    payload = pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL)
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        version=np.array(FORMAT_VERSION),
+        objects=np.frombuffer(payload, dtype=np.uint8),
+        **arrays,
+    )
+    return buffer.getvalue()
+
+
+def decode(blob):
+    """解码 encode 生成的字节串，版本不符时抛出 ValueError"""
+    with np.load(io.BytesIO(blob)) as data:
+        version = int(data["version"])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"不支持的检查点版本: {version}")
+        state = pickle.loads(data["objects"].tobytes())
+        for name in data.files:
+            if name.startswith("array_"):
+                state[name[len("array_") :]] = data[name]
+    return state
+
+
+class FileCheckpointStore:
+    """本地 .npz 文件存储"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def save(self, blob):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, self.path)
+
+
+class Checkpointer:
+    """
+    检查点读写
+
+    参数:
+    store: 提供 load() 和 save(blob) 的存储
+    interval: 每隔多少代保存一次
+    digest: 问题输入的哈希（见 input_digest），与运行配置一起写入检查点签名
+    """
+
+    def __init__(self, store, interval=10, digest=None):
+        self.store = store
+        self.interval = max(1, int(interval))
+        self.digest = digest
+
+    @classmethod
+    def from_options(cls, input_data):
+        """从优化器的 input_data 读取检查点选项，未配置存储时返回 None"""
+        store = input_data.get("checkpoint_store")
+        if store is None and input_data.get("checkpoint_path"):
+            store = FileCheckpointStore(input_data["checkpoint_path"])
+        if store is None:
+            return None
+        return cls(
+            store,
+            input_data.get("checkpoint_interval", 10),
+            digest=input_digest(input_data),
+        )
+
+    def due(self, gen, ngen):
+        """第 gen 代结束后是否保存（最后一代不保存）"""
+        return (gen + 1) % self.interval == 0 and gen + 1 < ngen
+
+    def save(self, signature, generation, state):
+        """保存第 generation 代结束时的状态"""
+        self.store.save(
+            encode(
+                {
+                    **state,
+                    "signature": {**signature, "input": self.digest},
+                    "generation": generation,
+                }
+            )
+        )
+
+    def load(self, signature):
+        """
+        读取最近的检查点，没有检查点或与当前运行配置不一致时返回 None
+
+        signature 为运行配置（引擎、种子、种群规模、代数等），与问题输入的哈希
+        一起比较，不一致说明检查点来自另一次运行，不能继续
+        """
+        blob = self.store.load()
+        if blob is None:
+            return None
+        try:
+            state = decode(blob)
+        except Exception:
+            logger.warning("检查点无法读取，重新开始", exc_info=True)
+            return None
+        if state.get("signature") != {**signature, "input": self.digest}:
+            logger.warning("检查点与当前运行配置或输入不一致，重新开始")
+            return None
+        return state
+
+
+def run_signature(optimizer):
+    """运行配置，检查点只能在配置相同的运行中继续"""
+    return {
+        "optimizer": type(optimizer).__name__,
+        "engine": optimizer.engine,
+        "seed": optimizer.seed,
+        "pop_size": optimizer.pop_size,
+        "ngen": optimizer.ngen,
+    }
+
+
+def rng_state(optimizer):
+    """优化器两个随机数生成器的状态"""
+    return {
+        "random": optimizer.rng.getstate(),
+        "numpy": optimizer.np_rng.bit_generator.state,
+    }
+
+
+def restore_rng_state(optimizer, state):
+    optimizer.rng.setstate(state["random"])
+    optimizer.np_rng.bit_generator.state = state["numpy"]
@@ -0,0 +1,213 @@
+"""
+进化收敛检测与提前终止
+
+每代结束后用当前最优总目标和帕累托存档更新 ConvergenceMonitor，满足任一条件即停止：
+
+- best_fitness_plateau: 最优总目标连续 patience 代相对改进不超过 tolerance
+- hypervolume_stagnation: 存档超体积连续 hv_patience 代相对增长不超过 hv_tolerance
+- time_budget: 运行时间超过 time_budget_seconds
+- cancelled: should_stop() 返回 True（外部取消运行中的任务）
+
+提前终止时优化器照常用已有的存档生成帕累托解，作为部分结果返回。
+
+on_generation 回调（可选）在每代的 evolution_history 条目写入后收到该条目，用于推送进度。
+
+全部条件未启用时与固定代数的行为完全一致，跑满 ngen 代时终止原因为 max_generations。
+
+超体积在归一化目标空间中计算：第一次更新时以存档的理想点和最差点把各目标缩放到
+[0, 1]，参考点为 1.1；之后固定该归一化，使各代的超体积可以直接比较。
+"""
+
+import time
+
+import numpy as np
+from pymoo.indicators.hv import HV
+
+# 终止原因
+MAX_GENERATIONS = "max_generations"
+BEST_FITNESS_PLATEAU = "best_fitness_plateau"
+HYPERVOLUME_STAGNATION = "hypervolume_stagnation"
+TIME_BUDGET = "time_budget"
+CANCELLED = "cancelled"
+
+
+class ConvergenceMonitor:
+    """
+    收敛检测器
+
+    参数:
+    senses: 各目标方向，1 最小化，-1 最大化（用于超体积）
+    patience: 最优总目标无改进的代数上限，None 表示不启用
+    tolerance: 视为改进的最小相对下降
+    hv_patience: 超体积无增长的代数上限，None 表示不启用
+    hv_tolerance: 视为增长的最小相对增量
+    time_budget: 墙钟时间预算（秒），None 表示不启用
+    should_stop: 无参可调用对象，返回 True 时停止，None 表示不启用
+    on_generation: 每代结束后以 evolution_history 条目调用，None 表示不启用
+    """
+
+    def __init__(
+        self,
+        senses,
+        patience=None,
+        tolerance=1e-4,
+        hv_patience=None,
+        hv_tolerance=1e-3,
+        time_budget=None,
+        should_stop=None,
+        on_generation=None,
+        clock=time.monotonic,
+    ):
+        self.senses = np.asarray(senses, dtype=np.float64)
+        self.patience = patience
+        self.tolerance = tolerance
+        self.hv_patience = hv_patience
+        self.hv_tolerance = hv_tolerance
+        self.time_budget = time_budget
+        self.should_stop = should_stop
+        self.on_generation = on_generation
+        self.clock = clock
+        self.start()
+
+    @classmethod
+    def from_options(cls, input_data, senses):
+        """从优化器的 input_data 读取终止选项"""
+        return cls(
+            senses,
+            patience=input_data.get("stop_patience"),
+            tolerance=input_data.get("stop_tolerance", 1e-4),
+            hv_patience=input_data.get("hv_patience"),
+            hv_tolerance=input_data.get("hv_tolerance", 1e-3),
+            time_budget=input_data.get("time_budget_seconds"),
+            should_stop=input_data.get("should_stop"),
+            on_generation=input_data.get("on_generation"),
+        )
+
+    def __getstate__(self):
+        # 优化器会被 pickle 到评估进程，回调只在主进程中使用
+        state = self.__dict__.copy()
+        state["should_stop"] = None
+        state["on_generation"] = None
+        return state
+
+    @property
+    def tracks_hypervolume(self):
+        return self.hv_patience is not None
+
+    def start(self):
+        """开始一次运行：重置计时和所有计数"""
+        self.started_at = self.clock()
+        self.best_total = np.inf
+        self.stale = 0
+        self.hypervolume = 0.0
+        self.best_hypervolume = 0.0
+        self.hv_stale = 0
+        self._indicator = None
+        self._ideal = None
+        self._scale = None
+        self.stop_reason = None
+
+    def update(self, best_total, front=None):
+        """
+        记录一代的结果，需要停止时返回终止原因，否则返回 None
+
+        参数:
+        best_total: 本代种群的最优总目标（越小越好）
+        front: 帕累托存档的 (n, m) 目标矩阵，启用超体积检测时需要
+        """
+        if self.patience is not None:
+            threshold = (
+                self.tolerance * abs(self.best_total)
+                if np.isfinite(self.best_total)
+                else 0.0
+            )
+            if best_total < self.best_total - threshold:
+                self.best_total = best_total
+                self.stale = 0
+            else:
+                self.stale += 1
+
+        if self.tracks_hypervolume and front is not None and len(front):
+            self.hypervolume = self._hypervolume(front)
+            if self.hypervolume > self.best_hypervolume * (1 + self.hv_tolerance):
+                self.best_hypervolume = self.hypervolume
+                self.hv_stale = 0
+            else:
+                self.hv_stale += 1
+
+        if self.should_stop is not None and self.should_stop():
+            self.stop_reason = CANCELLED
+        elif self.patience is not None and self.stale >= self.patience:
+            self.stop_reason = BEST_FITNESS_PLATEAU
+        elif self.tracks_hypervolume and self.hv_stale >= self.hv_patience:
+            self.stop_reason = HYPERVOLUME_STAGNATION
+        elif self.time_budget is not None and self.elapsed >= self.time_budget:
+            self.stop_reason = TIME_BUDGET
+        return self.stop_reason
+
+    def stats(self):
+        """写入 evolution_history 当代条目的字段：超体积（启用时）和终止原因（停止时）"""
+        stats = {}
+        if self.tracks_hypervolume:
+            stats["hypervolume"] = float(self.hypervolume)
+        if self.stop_reason is not None:
+            stats["stop_reason"] = self.stop_reason
+        return stats
+
+    def report(self, entry):
+        """把一代的 evolution_history 条目交给 on_generation 回调"""
+        if self.on_generation is not None:
+            self.on_generation(entry)
+
+    def finish(self, history):
+        """
+        运行结束：未提前停止时终止原因为跑满代数，并写入 history 的最后一代条目
+
+        返回终止原因
+        """
+        if self.stop_reason is None:
+            self.stop_reason = MAX_GENERATIONS
+        if history:
+            history[-1]["stop_reason"] = self.stop_reason
+        return self.stop_reason
+
+    def state(self):
+        """检查点用的运行状态（已用时间代替时钟读数，可跨进程恢复）"""
+        return {
+            "elapsed": self.elapsed,
+            "best_total": self.best_total,
+            "stale": self.stale,
+            "hypervolume": self.hypervolume,
+            "best_hypervolume": self.best_hypervolume,
+            "hv_stale": self.hv_stale,
+            "ideal": self._ideal,
+            "scale": self._scale,
+        }
+
+    def restore(self, state):
+        """从检查点恢复运行状态，计时从已用时间继续"""
+        self.started_at = self.clock() - state["elapsed"]
+        self.best_total = state["best_total"]
+        self.stale = state["stale"]
+        self.hypervolume = state["hypervolume"]
+        self.best_hypervolume = state["best_hypervolume"]
+        self.hv_stale = state["hv_stale"]
+        self._ideal = state["ideal"]
+        self._scale = state["scale"]
+        self._indicator = None
+        if self._ideal is not None:
+            self._indicator = HV(ref_point=np.full(len(self._ideal), 1.1))
+        self.stop_reason = None
+
+    @property
+    def elapsed(self):
+        return self.clock() - self.started_at
+
+    def _hypervolume(self, front):
+        F = np.asarray(front, dtype=np.float64) * self.senses
+        if self._indicator is None:
+            self._ideal = F.min(axis=0)
+            span = F.max(axis=0) - self._ideal
+            self._scale = np.where(span > 0, span, 1.0)
+            self._indicator = HV(ref_point=np.full(F.shape[1], 1.1))
+        return float(self._indicator((F - self._ideal) / self._scale))
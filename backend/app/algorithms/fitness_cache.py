@@ -0,0 +1,124 @@
+"""
+适应度缓存
+
+以个体的规范化字节表示的哈希为键缓存目标值 (total, f1, f2, f3)，按最近最少使用（LRU）
+淘汰，同时受条目数和内存字节数约束。只适用于适应度是个体的确定性函数的情形；
+规范化字节表示由各优化器给出（轻工业为 float64 坐标，重工业为编码列表的 repr）。
+
+用法:
+    cache = FitnessCache(max_entries=10000)
+    key = FitnessCache.key(canonical_bytes)
+    objectives = cache.get(key)
+    if objectives is None:
+        objectives = evaluate(individual)
+        cache.put(key, objectives)
+"""
+
+import hashlib
+import sys
+from collections import OrderedDict
+
+# 每个条目的固定开销估计（OrderedDict 节点、元组和浮点对象）
+_ENTRY_OVERHEAD = 200
+
+
+class FitnessCache:
+    """
+    有界 LRU 适应度缓存
+
+    参数:
+    max_entries: 最大条目数，0 表示禁用缓存
+    max_bytes: 估算内存上限（字节），None 表示不限
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries or 0
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(data):
+        """规范化字节表示的 128 位 blake2b 哈希"""
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(self, key):
+        """命中时返回目标值并记为最近使用，否则返回 None；同时更新命中计数"""
+        objectives = self._entries.get(key)
+        if objectives is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return objectives
+
+    def lookup(self, keys):
+        """
+        批量查询，返回 (found, pending)
+
+        found: {位置: 目标值}，命中缓存的个体
+        pending: {键: [位置, ...]}，需要评估的个体；同一批次内重复的个体只评估一次，
+                 重复出现的记为命中
+        """
+        found, pending = {}, {}
+        for k, key in enumerate(keys):
+            if key in pending:
+                pending[key].append(k)
+                self.hits += 1
+                continue
+            objectives = self.get(key)
+            if objectives is None:
+                pending[key] = [k]
+            else:
+                found[k] = objectives
+        return found, pending
+
+    def put(self, key, objectives):
+        """写入目标值（转为浮点元组）并返回写入的值；缓存禁用时只做转换"""
+        objectives = tuple(float(v) for v in objectives)
+        if not self.enabled:
+            return objectives
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return objectives
+        self._entries[key] = objectives
+        self.nbytes += self._entry_size(key, objectives)
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes
+        ):
+            old_key, old_objectives = self._entries.popitem(last=False)
+            self.nbytes -= self._entry_size(old_key, old_objectives)
+        return objectives
+
+    @staticmethod
+    def _entry_size(key, objectives):
+        return sys.getsizeof(key) + 8 * len(objectives) + _ENTRY_OVERHEAD
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """累计统计，用于写入 evolution_history"""
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_rate": float(self.hit_rate),
+            "cache_size": len(self._entries),
+        }
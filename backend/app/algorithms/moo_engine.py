@@ -0,0 +1,203 @@
+"""
+多目标进化引擎（NSGA-II / NSGA-III）
+
+把第一部分的两个优化器接入 pymoo 的 NSGA-II（非支配排序 + 拥挤距离）或
+NSGA-III（非支配排序 + 参考点小生境），直接进化出帕累托前沿，
+不再从加权和 GA 的历史中重建前沿。
+
+- 决策变量是一列对象，每个元素就是优化器原有的编码（轻工业为设备坐标列表，
+  重工业为 [分配, AGV调度, 路径选择, 解码基因]），交叉、变异和初始化沿用优化器自己的算子
+- 算子作用在父代的深拷贝上（与 DEAP 的 toolbox.clone 一致），不会改动种群中已评估的个体
+- 每代在整个子代种群上调用一次 optimizer.evaluate_batch，共享适应度缓存和并行评估
+- 目标方向由 senses 给出：1 最小化，-1 最大化
+
+用法:
+    engine = MOOEngine(optimizer, senses=(1, 1, -1), algorithm="nsga2")
+    for gen, individuals, objectives in engine.generations():
+        ...  # objectives 为 (n, 4) 数组：total, f1, f2, f3
+    front_individuals, front_objectives = engine.front()
+"""
+
+from copy import deepcopy
+
+import numpy as np
+from pymoo.algorithms.moo.nsga2 import NSGA2
+from pymoo.algorithms.moo.nsga3 import NSGA3
+from pymoo.core.crossover import Crossover
+from pymoo.core.duplicate import DuplicateElimination
+from pymoo.core.mutation import Mutation
+from pymoo.core.problem import Problem
+from pymoo.core.sampling import Sampling
+from pymoo.termination import get_termination
+from pymoo.util.ref_dirs import get_reference_directions
+
+# 可选的进化引擎："ga" 为原有的加权和遗传算法
+ENGINES = ("ga", "nsga2", "nsga3")
+
+
+def _encoding_key(individual):
+    """编码的规范化表示，用于判重"""
+    return repr([list(part) for part in individual])
+
+
+def _object_column(items):
+    """把编码列表装进 (n, 1) 的对象数组，避免 numpy 展开嵌套列表"""
+    X = np.empty((len(items), 1), dtype=object)
+    for k, item in enumerate(items):
+        X[k, 0] = item
+    return X
+
+
+class EncodedProblem(Problem):
+    """
+    以优化器原始编码为决策变量的三目标问题，整个种群一次批量评估
+
+    F 为按 senses 转成最小化形式的 (f1, f2, f3)；
+    total 为优化器的加权总目标，只用于记录和排序展示
+    """
+
+    def __init__(self, optimizer, senses):
+        super().__init__(n_var=1, n_obj=3, vtype=object)
+        self.optimizer = optimizer
+        self.senses = np.asarray(senses, dtype=np.float64)
+
+    def _evaluate(self, X, out, *args, **kwargs):
+        objectives = np.asarray(
+            self.optimizer.evaluate_batch(list(X[:, 0])), dtype=np.float64
+        ).reshape(-1, 4)
+        out["F"] = objectives[:, 1:] * self.senses
+        out["total"] = objectives[:, 0]
+
+
+class EncodedSampling(Sampling):
+    """用优化器的 create_individual 生成初始种群"""
+
+    def __init__(self, create):
+        super().__init__()
+        self.create = create
+
+    def _do(self, problem, n_samples, *args, **kwargs):
+        return _object_column([self.create() for _ in range(n_samples)])
+
+
+class EncodedCrossover(Crossover):
+    """两亲本两子代，包装优化器的 crossover_individuals（交叉概率由其自身控制）"""
+
+    def __init__(self, mate):
+        super().__init__(2, 2, prob=1.0)
+        self.mate = mate
+
+    def _do(self, problem, X, *args, **kwargs):
+        _, n_matings, _ = X.shape
+        Y = np.empty_like(X)
+        for k in range(n_matings):
+            child1, child2 = self.mate(deepcopy(X[0, k, 0]), deepcopy(X[1, k, 0]))
+            Y[0, k, 0] = child1
+            Y[1, k, 0] = child2
+        return Y
+
+
+class EncodedMutation(Mutation):
+    """以 mutpb 的概率对每个子代调用优化器的变异算子"""
+
+    def __init__(self, mutate, rng, mutpb):
+        super().__init__(prob=1.0)
+        self.mutate = mutate
+        self.rng = rng
+        self.mutpb = mutpb
+
+    def _do(self, problem, X, *args, **kwargs):
+        Y = X.copy()
+        for k in range(len(X)):
+            if self.rng.random() < self.mutpb():
+                Y[k, 0] = self.mutate(deepcopy(X[k, 0]))
+        return Y
+
+
+class EncodingDuplicateElimination(DuplicateElimination):
+    """按编码的规范化表示判重"""
+
+    def _do(self, pop, other, is_duplicate):
+        seen = set()
+        if other is not None:
+            seen.update(_encoding_key(x) for x in other.get("X")[:, 0])
+        for k, x in enumerate(pop.get("X")[:, 0]):
+            key = _encoding_key(x)
+            if key in seen:
+                is_duplicate[k] = True
+            else:
+                seen.add(key)
+        return is_duplicate
+
+
+class MOOEngine:
+    """
+    NSGA-II / NSGA-III 进化引擎
+
+    参数:
+    optimizer: 提供 create_individual、crossover_individuals、evaluate_batch、
+               pop_size、ngen、mutpb、rng、seed 的优化器
+    senses: 三个目标的方向
+    algorithm: "nsga2" 或 "nsga3"
+    mutate: 变异函数 individual -> 新个体，默认 optimizer.mutate_individual
+    """
+
+    def __init__(self, optimizer, senses, algorithm="nsga2", mutate=None):
+        if algorithm not in ("nsga2", "nsga3"):
+            raise ValueError(f"不支持的多目标引擎: {algorithm}")
+        self.optimizer = optimizer
+        self.senses = np.asarray(senses, dtype=np.float64)
+        self.name = algorithm
+        self.generation = 0
+        self.problem = EncodedProblem(optimizer, senses)
+
+        operators = {
+            "sampling": EncodedSampling(optimizer.create_individual),
+            "crossover": EncodedCrossover(optimizer.crossover_individuals),
+            "mutation": EncodedMutation(
+                mutate or optimizer.mutate_individual,
+                optimizer.rng,
+                lambda: optimizer.mutpb,
+            ),
+            "eliminate_duplicates": EncodingDuplicateElimination(),
+        }
+        if algorithm == "nsga3":
+            # 参考方向数不超过种群规模
+            n_partitions = 1
+            while (n_partitions + 2) * (n_partitions + 3) // 2 <= optimizer.pop_size:
+                n_partitions += 1
+            ref_dirs = get_reference_directions(
+                "das-dennis", 3, n_partitions=n_partitions
+            )
+            self.algorithm = NSGA3(
+                ref_dirs=ref_dirs, pop_size=optimizer.pop_size, **operators
+            )
+        else:
+            self.algorithm = NSGA2(pop_size=optimizer.pop_size, **operators)
+
+    def generations(self):
+        """
+        逐代运行，每代结束后产出 (代数, 个体列表, (n, 4) 目标数组)
+
+        目标数组的列为 total, f1, f2, f3（恢复为原始方向）
+        """
+        self.algorithm.setup(
+            self.problem,
+            termination=get_termination("n_gen", self.optimizer.ngen),
+            seed=self.optimizer.seed,
+            verbose=False,
+        )
+        self.generation = 0
+        while self.algorithm.has_next():
+            self.algorithm.next()
+            yield (self.generation, *self._objectives(self.algorithm.pop))
+            self.generation += 1
+
+    def front(self):
+        """最终种群中的非支配解：(个体列表, (n, 4) 目标数组)"""
+        return self._objectives(self.algorithm.opt)
+
+    def _objectives(self, pop):
+        individuals = list(pop.get("X")[:, 0])
+        objectives = np.column_stack([pop.get("total"), pop.get("F") * self.senses])
+        return individuals, objectives.reshape(-1, 4)
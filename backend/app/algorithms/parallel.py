@@ -0,0 +1,121 @@
+"""
+并行适应度评估
+
+优化器对象在每个工作进程启动时只传输一次（pickle），之后每批任务只传输个体本身。
+需要随机数的评估（如重工业调度解码）由主进程为每个个体预先抽取种子，
+工作进程在评估前用该种子调用 optimizer.reseed，因此结果与工作进程数量无关。
+
+用法:
+    with EvaluationPool(optimizer, workers=8) as pool:
+        results = pool.map("evaluate_individual", individuals, seeds)
+"""
+
+import copy
+import logging
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+PARALLELISM_MODES = ("serial", "process")
+
+_WORKER_OPTIMIZER = None
+
+
+def _init_worker(payload):
+    """工作进程初始化：反序列化优化器，整个进程生命周期内复用"""
+    global _WORKER_OPTIMIZER
+    _WORKER_OPTIMIZER = pickle.loads(payload)
+
+
+def _call(optimizer, method, item, seed):
+    if seed is not None:
+        optimizer.reseed(seed)
+    return getattr(optimizer, method)(item)
+
+
+def _worker_call(task):
+    method, item, seed = task
+    return _call(_WORKER_OPTIMIZER, method, item, seed)
+
+
+class EvaluationPool:
+    """
+    适应度评估进程池
+
+    参数:
+    optimizer: 可 pickle 的优化器对象，需提供 reseed(seed) 方法
+    workers: 工作进程数，None 表示使用 CPU 核数
+    parallelism: "process" 使用进程池；"serial" 在当前进程按同样的种子规则逐个评估，
+                 结果与 "process" 完全一致，便于调试和对比
+    """
+
+    def __init__(self, optimizer, workers=None, parallelism="process"):
+        if parallelism not in PARALLELISM_MODES:
+            raise ValueError(
+                f"不支持的并行方式: {parallelism}，可选: {', '.join(PARALLELISM_MODES)}"
+            )
+        self.optimizer = optimizer
+        self.parallelism = parallelism
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._executor = None
+        # 当前进程评估时使用浅拷贝，重置种子不会影响主优化器的随机数序列
+        self._local_optimizer = copy.copy(optimizer)
+
+        if parallelism == "process":
+            # 使用 spawn 启动，避免在多线程的 API 进程中 fork
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(pickle.dumps(optimizer),),
+            )
+
+    def map(self, method, items, seeds=None):
+        """
+        对每个 item 调用 optimizer.method(item)，按输入顺序返回结果
+
+        seeds: 与 items 等长的整数种子列表；None 表示不重置随机数状态
+        """
+        items = list(items)
+        if seeds is None:
+            seeds = [None] * len(items)
+        if self._executor is None:
+            return [
+                _call(self._local_optimizer, method, item, seed)
+                for item, seed in zip(items, seeds, strict=True)
+            ]
+
+        chunksize = max(1, -(-len(items) // (self.workers * 4)))
+        tasks = [(method, item, seed) for item, seed in zip(items, seeds, strict=True)]
+        return list(self._executor.map(_worker_call, tasks, chunksize=chunksize))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def create_evaluation_pool(optimizer):
+    """
+    按优化器的 parallelism / workers 配置创建评估进程池
+
+    parallelism 为 None 时返回 None，调用方直接在当前进程评估
+    """
+    parallelism = getattr(optimizer, "parallelism", None)
+    if not parallelism:
+        return None
+    logger.info(
+        "启用并行评估: %s, 工作进程数: %s",
+        parallelism,
+        optimizer.workers or os.cpu_count(),
+    )
+    return EvaluationPool(optimizer, workers=optimizer.workers, parallelism=parallelism)
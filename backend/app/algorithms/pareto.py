@@ -0,0 +1,250 @@
+"""
+帕累托非支配排序
+
+基于 NumPy 目标矩阵的非支配筛选与分层排序，轻工业和重工业优化器共用。
+
+- 目标矩阵 F 形状为 (n, m)，senses 为每个目标的方向：1 表示最小化，-1 表示最大化
+- 支配关系带容差 epsilon：b 支配 a 当且仅当 b 在所有目标上不差于 a + epsilon，
+  且至少一个目标上优于 a - epsilon（epsilon = 0 时即为标准帕累托支配）
+- 前沿过大时用 k-means 聚类挑选代表解
+"""
+
+import numpy as np
+
+
+def _to_minimization(F, senses):
+    """把目标矩阵统一转换为全部最小化的形式"""
+    F = np.asarray(F, dtype=np.float64)
+    if F.ndim != 2:
+        raise ValueError(f"目标矩阵必须是二维的, 实际形状: {F.shape}")
+    if senses is None:
+        return F
+    senses = np.asarray(senses, dtype=np.float64)
+    if senses.shape != (F.shape[1],):
+        raise ValueError(f"senses 长度 {senses.shape} 与目标数 {F.shape[1]} 不一致")
+    return F * senses
+
+
+def _dominates(A, B, epsilon):
+    """A 中每一行是否支配 B 中每一行，返回形状 (len(A), len(B)) 的布尔矩阵"""
+    A = A[:, None, :]
+    B = B[None, :, :]
+    not_worse = np.all(A <= B + epsilon, axis=-1)
+    better = np.any(A < B - epsilon, axis=-1)
+    return not_worse & better
+
+
+def non_dominated_mask(F, senses=None, epsilon=0.0, block_size=256):
+    """
+    返回非支配解的布尔掩码
+
+    按各目标之和排序后分块扫描：当 epsilon = 0 时，支配者的目标和严格更小，
+    因此每一块只需与已确认的前沿以及块内的点比较，复杂度为 O(n·|前沿|)，
+    远小于两两比较的 O(n²)。epsilon > 0 时新加入的点还会剔除被它支配的旧前沿点，
+    与逐个插入的存档更新语义一致。
+
+    参数:
+    F: (n, m) 目标矩阵
+    senses: 长度为 m 的方向数组，1 最小化，-1 最大化；None 表示全部最小化
+    epsilon: 支配判断的容差
+    block_size: 每次向量化比较的块大小
+    """
+    G = _to_minimization(F, senses)
+    n = len(G)
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+
+    order = np.argsort(G.sum(axis=1), kind="stable")
+    front_idx = np.zeros(0, dtype=np.intp)
+
+    for start in range(0, n, block_size):
+        block = order[start : start + block_size]
+        candidates = G[block]
+
+        if front_idx.size:
+            dominated = np.any(_dominates(G[front_idx], candidates, epsilon), axis=0)
+            block = block[~dominated]
+            candidates = candidates[~dominated]
+        if not block.size:
+            continue
+
+        inner = _dominates(candidates, candidates, epsilon)
+        survivors = ~np.any(inner, axis=0)
+        block = block[survivors]
+
+        if epsilon > 0 and front_idx.size and block.size:
+            removed = np.any(_dominates(G[block], G[front_idx], epsilon), axis=0)
+            front_idx = front_idx[~removed]
+
+        front_idx = np.concatenate([front_idx, block])
+
+    mask[front_idx] = True
+    return mask
+
+
+def non_dominated_rank(F, senses=None, epsilon=0.0, max_rank=None):
+    """
+    非支配分层排序：第一前沿的秩为 0，依次递增
+
+    参数:
+    max_rank: 只计算到该秩为止，剩余的解秩记为 max_rank + 1；None 表示全部分层
+
+    返回:
+    长度为 n 的整数数组
+    """
+    G = _to_minimization(F, senses)
+    n = len(G)
+    ranks = np.full(n, -1, dtype=np.intp)
+    remaining = np.arange(n)
+    rank = 0
+
+    while remaining.size:
+        if max_rank is not None and rank > max_rank:
+            ranks[remaining] = rank
+            break
+        front = non_dominated_mask(G[remaining], epsilon=epsilon)
+        ranks[remaining[front]] = rank
+        remaining = remaining[~front]
+        rank += 1
+
+    return ranks
+
+
+def objective_matrix(solutions, keys=("f1", "f2", "f3")):
+    """把解字典列表转换为 (n, len(keys)) 的目标矩阵"""
+    if not solutions:
+        return np.zeros((0, len(keys)))
+    return np.array([[sol[key] for key in keys] for sol in solutions], dtype=np.float64)
+
+
+def crowding_distance(F):
+    """
+    NSGA-II 拥挤距离：每个目标上相邻两解的归一化间距之和，边界解为无穷大
+
+    F: (n, m) 目标矩阵（方向不影响结果）
+    """
+    F = np.asarray(F, dtype=np.float64)
+    n, m = F.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        distance[:] = np.inf
+        return distance
+
+    order = np.argsort(F, axis=0, kind="stable")
+    sorted_F = np.take_along_axis(F, order, axis=0)
+    span = sorted_F[-1] - sorted_F[0]
+    span[span == 0] = 1.0
+    gaps = (sorted_F[2:] - sorted_F[:-2]) / span
+
+    for k in range(m):
+        distance[order[1:-1, k]] += gaps[:, k]
+        distance[order[[0, -1], k]] = np.inf
+    return distance
+
+
+def kmeans(X, n_clusters, rng, max_iter=30, tol=1e-9):
+    """
+    向量化 k-means：k-means++ 初始化，迭代分配与更新直到标签不变、中心移动小于 tol
+    或达到 max_iter
+
+    参数:
+    X: (n, d) 特征矩阵
+    rng: numpy Generator
+    返回:
+    (labels, centers)，labels 长度为 n，centers 形状为 (k, d)，k = min(n_clusters, n)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n = len(X)
+    k = min(n_clusters, n)
+
+    # k-means++：按到已选中心最近距离的平方加权抽样
+    centers = np.empty((k, X.shape[1]))
+    centers[0] = X[rng.integers(n)]
+    closest = np.sum((X - centers[0]) ** 2, axis=1)
+    for j in range(1, k):
+        total = closest.sum()
+        idx = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+        centers[j] = X[idx]
+        np.minimum(closest, np.sum((X - centers[j]) ** 2, axis=1), out=closest)
+
+    XT = np.ascontiguousarray(X.T)
+    labels = None
+    for _ in range(max_iter):
+        # |x|² 对 argmin 没有影响，只需比较 |c|² - 2 c·x；按 (k, n) 布局计算更快
+        dist = np.einsum("ij,ij->i", centers, centers)[:, None] - 2 * centers @ XT
+        new_labels = np.argmin(dist, axis=0)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack(
+            [
+                np.bincount(labels, weights=X[:, d], minlength=k)
+                for d in range(X.shape[1])
+            ],
+            axis=1,
+        )
+        occupied = counts > 0
+        # 空聚类保留原中心
+        new_centers = centers.copy()
+        new_centers[occupied] = sums[occupied] / counts[occupied, None]
+        shift = np.max(np.abs(new_centers - centers))
+        centers = new_centers
+        if shift < tol:
+            break
+
+    return labels, centers
+
+
+class ParetoArchive:
+    """
+    有界在线帕累托存档
+
+    只保存非支配解（解字典须包含 f1、f2、f3 等目标键），目标值完全相同的解只保留
+    先加入的一个；超过容量时按拥挤距离逐步剔除最拥挤的解。
+    """
+
+    def __init__(self, senses, capacity=200, epsilon=0.0, keys=("f1", "f2", "f3")):
+        self.senses = tuple(senses)
+        self.capacity = capacity
+        self.epsilon = epsilon
+        self.keys = tuple(keys)
+        self.solutions = []
+        self.objectives = np.zeros((0, len(self.keys)))
+
+    def __len__(self):
+        return len(self.solutions)
+
+    def add(self, solutions):
+        """批量加入解，返回存档当前大小"""
+        if not solutions:
+            return len(self.solutions)
+
+        candidates = self.solutions + list(solutions)
+        objectives = np.vstack(
+            [self.objectives, objective_matrix(solutions, self.keys)]
+        )
+
+        _, first_idx = np.unique(objectives, axis=0, return_index=True)
+        keep = np.sort(first_idx)
+        keep = keep[
+            non_dominated_mask(objectives[keep], self.senses, epsilon=self.epsilon)
+        ]
+
+        if self.capacity and len(keep) > self.capacity:
+            keep = self._truncate(objectives, keep)
+
+        self.solutions = [candidates[i] for i in keep]
+        self.objectives = objectives[keep]
+        return len(self.solutions)
+
+    def _truncate(self, objectives, keep):
+        """按拥挤距离剔除到容量上限，每轮剔除至多一半的超出量后重新计算拥挤距离"""
+        while len(keep) > self.capacity:
+            excess = len(keep) - self.capacity
+            distance = crowding_distance(objectives[keep])
+            drop = np.argsort(distance, kind="stable")[: max(1, excess // 2)]
+            keep = np.delete(keep, drop)
+        return keep
@@ -2,7 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib
 import random
-from deap import base, creator, tools, algorithms
+from deap import base, tools, algorithms
 import warnings
 import time
 from matplotlib.patches import Rectangle, Patch, Circle, FancyBboxPatch, Polygon
@@ -13,6 +13,29 @@ import os
 from collections import defaultdict, OrderedDict
 import itertools
 
+from app.algorithms.agv_routing import ConflictAwareRouter
+from app.algorithms.checkpoint import (
+    Checkpointer,
+    restore_rng_state,
+    rng_state,
+    run_signature,
+)
+from app.algorithms.convergence import ConvergenceMonitor
+from app.algorithms.fitness_cache import FitnessCache
+from app.algorithms.moo_engine import ENGINES, MOOEngine
+from app.algorithms.parallel import EvaluationPool, create_evaluation_pool
+from app.algorithms.path_network import AisleGraph
+from app.algorithms.pareto import (
+    ParetoArchive,
+    kmeans,
+    non_dominated_mask,
+    non_dominated_rank,
+    objective_matrix,
+)
+
+# 算法版本：修改会改变优化结果时递增，相同请求的缓存结果随之失效
+ALGORITHM_VERSION = 3
+
 # ========== 设置中文字体和美观样式 ==========
 # 优先使用 WenQuanYi 字体（Docker 容器中安装的字体）
 plt.rcParams["font.sans-serif"] = ["WenQuanYi Micro Hei", "WenQuanYi Zen Hei", "SimHei", "Microsoft YaHei", "DejaVu Sans"]
@@ -42,6 +65,24 @@ else:
     print(f"[OK] 图片保存目录已存在: {SAVE_PATH}")
 
 
+# ========== DEAP 个体类型 ==========
+# 在模块级定义一次，所有优化器实例共用；不经过 deap.creator 的全局注册，
+# 同一进程内先后或并发运行多个优化任务时不会重复创建类，也不存在同名类的竞争。
+# 模块级类可以直接 pickle，个体能够传给工作进程。
+class FitnessMin(base.Fitness):
+    """单目标最小化适应度（加权总目标）"""
+
+    weights = (-1.0,)
+
+
+class Individual(list):
+    """个体：编码列表，附带 fitness 属性"""
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.fitness = FitnessMin()
+
+
 # ========== 行业分类判断器 ==========
 class IndustryClassifier:
     """行业分类判断器"""
@@ -446,6 +487,9 @@ class SLP_GA_Optimizer:
         """
         初始化SLP-GA优化器 - 基于真实纺织企业布局
         """
+        # 随机数生成器：所有随机操作都使用实例自己的生成器，相同种子可复现结果
+        self.reseed(input_data.get("seed"))
+
         self.L = input_data["L"]  # 车间长度
         self.W = input_data["W"]  # 车间宽度
         self.N = input_data["N"]  # 设备总数
@@ -472,10 +516,42 @@ class SLP_GA_Optimizer:
         self.cxpb = 0.7  # 交叉概率
         self.mutpb = 0.4  # 变异概率
         self.tournament_size = 2
+        # 进化结束后对最优个体做局部搜索的步数（0 表示不做），使用增量评估
+        self.local_search_steps = input_data.get("local_search_steps", 0)
+        # 进化引擎："ga" 为加权和遗传算法（默认），"nsga2" / "nsga3" 为多目标引擎
+        self.engine = input_data.get("engine", "ga")
+        if self.engine not in ENGINES:
+            raise ValueError(f"不支持的进化引擎: {self.engine}")
+        # 提前终止：stop_patience（最优总目标停滞代数）、hv_patience（存档超体积
+        # 停滞代数）、time_budget_seconds（墙钟预算），均未设置时跑满 ngen 代
+        self.convergence = ConvergenceMonitor.from_options(input_data, (1, 1, -1))
+        # 检查点：配置 checkpoint_path 或 checkpoint_store 后每隔 checkpoint_interval 代
+        # 保存进化状态，重新运行时从最近的检查点继续；多目标引擎不保存检查点
+        self.checkpointer = (
+            Checkpointer.from_options(input_data) if self.engine == "ga" else None
+        )
+        self.stop_reason = None
+        self.generations_run = 0
+        # 多样性诊断：每隔多少代计算一次；抽样个体对数（None 表示精确计算所有个体对）
+        self.diversity_interval = max(1, input_data.get("diversity_interval", 1))
+        self.diversity_sample_pairs = input_data.get("diversity_sample_pairs")
+        # 并行评估：parallelism 为 "process" 或 "serial"，None 表示直接在当前进程评估
+        self.parallelism = input_data.get("parallelism")
+        self.workers = input_data.get("workers")
+        self._evaluation_pool = None
+        # 适应度缓存：按布局坐标哈希缓存目标值，fitness_cache_size 为 0 时禁用
+        self.fitness_cache = FitnessCache(
+            input_data.get("fitness_cache_size", 10000),
+            input_data.get("fitness_cache_bytes", 64 * 1024 * 1024),
+        )
 
         # 存储优化结果
         self.pareto_solutions = []
+        # all_solutions 为有界非支配存档中的解；objective_log 为每代全部个体的
+        # 目标值 (f1, f2, f3)，只用于绘图
+        self.archive_size = input_data.get("archive_size", 200)
         self.all_solutions = []
+        self.objective_log = np.zeros((0, 3))
         self.initial_f1 = 0
         self.all_pareto_solutions = []
 
@@ -518,6 +594,127 @@ class SLP_GA_Optimizer:
             "储料机",
         ]
 
+        # 预计算向量化评估所需的常量
+        self._build_evaluation_engine()
+
+    def reseed(self, seed=None):
+        """
+        重置随机数生成器
+
+        seed 为 None 时随机生成一个种子，实际使用的种子记录在 self.seed 中
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        self.seed = int(seed)
+        self.rng = random.Random(self.seed)
+        self.np_rng = np.random.default_rng(self.seed)
+
+    def select_tournament(self, individuals, k):
+        """锦标赛选择（使用实例随机数生成器，替代 tools.selTournament）"""
+        return [
+            min(
+                (self.rng.choice(individuals) for _ in range(self.tournament_size)),
+                key=lambda ind: ind.fitness.values[0],
+            )
+            for _ in range(k)
+        ]
+
+    def _build_evaluation_engine(self):
+        """
+        预计算向量化评估引擎的常量数组
+
+        - 搬运权重矩阵 f_matrix * w_matrix * c_transport（对角线置零）
+        - 可移动设备索引及其移动成本
+        - 产品线内设备对的索引，用于紧凑度的数组归约
+        - 与布局无关的面积利用率和归一化上界
+        """
+        f_matrix = np.asarray(self.f_matrix, dtype=np.float64)
+        w_matrix = np.asarray(self.w_matrix, dtype=np.float64)
+        transport_weight = f_matrix * w_matrix * self.c_transport
+        np.fill_diagonal(transport_weight, 0.0)
+        self._transport_weight = transport_weight
+
+        self._movable_idx = np.asarray(self.M, dtype=np.intp)
+        self._move_cost_vec = np.asarray(self.move_costs, dtype=np.float64)[
+            self._movable_idx
+        ]
+        self._original_xy = np.asarray(self.original_positions, dtype=np.float64)
+
+        # 产品线设备对 (i, j)，i < j，以及每个设备对所属的产品线编号
+        pair_i, pair_j, pair_line = [], [], []
+        line_pair_counts = []
+        for line_idx, devices in enumerate(self.product_lines.values()):
+            n_dev = len(devices)
+            for a in range(n_dev):
+                for b in range(a + 1, n_dev):
+                    pair_i.append(devices[a])
+                    pair_j.append(devices[b])
+                    pair_line.append(line_idx)
+            line_pair_counts.append(n_dev * (n_dev - 1) / 2)
+        self._n_lines = len(self.product_lines)
+        self._line_pair_i = np.asarray(pair_i, dtype=np.intp)
+        self._line_pair_j = np.asarray(pair_j, dtype=np.intp)
+        self._line_pair_onehot = np.zeros((len(pair_line), self._n_lines))
+        self._line_pair_onehot[np.arange(len(pair_line)), pair_line] = 1.0
+        self._line_pair_counts = np.asarray(line_pair_counts, dtype=np.float64)
+        self._line_has_pairs = self._line_pair_counts > 0
+
+        # 约束惩罚：边界、设备对的重叠阈值、通道矩形
+        device_sizes = np.asarray(self.device_sizes, dtype=np.float64)
+        safety = np.asarray(self.safety_distances, dtype=np.float64)
+        self._half_sizes = device_sizes / 2
+        self._x_min = self._half_sizes[:, 0] + safety
+        self._x_max = self.L - self._half_sizes[:, 0] - safety
+        self._y_min = self._half_sizes[:, 1] + safety
+        self._y_max = self.W - self._half_sizes[:, 1] - safety
+        self._device_sizes = device_sizes
+        self._s_safe = 0.5
+        # 扫描裁剪的区间半宽：两设备区间相交 <=> |dx| < (li + lj) / 2 + s_safe
+        self._sweep_half_x = self._half_sizes[:, 0] + self._s_safe / 2
+        self._sweep_half_y = self._half_sizes[:, 1] + self._s_safe / 2
+        # 宽阶段的浮点余量：宁可多给候选，精确阶段会排除
+        self._sweep_margin = 1e-6
+        self._aisles = np.asarray(
+            [[a[0], a[1], a[0] + a[2], a[1] + a[3]] for a in self.aisle_areas],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+
+        # 产品线约束：只考虑设备数大于 1 的产品线
+        member_idx, member_line = [], []
+        penalty_lines = [d for d in self.product_lines.values() if len(d) > 1]
+        for line_idx, devices in enumerate(penalty_lines):
+            member_idx.extend(devices)
+            member_line.extend([line_idx] * len(devices))
+        self._line_member_idx = np.asarray(member_idx, dtype=np.intp)
+        self._line_member_line = np.asarray(member_line, dtype=np.intp)
+        self._line_member_weight = np.zeros((len(member_idx), len(penalty_lines)))
+        for entry, line_idx in enumerate(member_line):
+            self._line_member_weight[entry, line_idx] = 1.0 / len(
+                penalty_lines[line_idx]
+            )
+
+        # 批量评估时 P×N×N 中间数组的元素上限
+        self.eval_chunk_elements = 4_000_000
+
+        # 面积利用率与布局无关，只需计算一次
+        total_area = self.L * self.W
+        for aisle in self.aisle_areas:
+            total_area -= aisle[2] * aisle[3]
+        used_area = float(np.sum(device_sizes[:, 0] * device_sizes[:, 1]))
+        self._area_utilization = used_area / total_area if total_area > 0 else 0
+
+        max_f1 = (
+            np.max(self.f_matrix)
+            * np.max(self.w_matrix)
+            * self.c_transport
+            * self.L
+            * self.W
+            * self.N
+        )
+        max_f2 = np.max(self.move_costs) * (self.L + self.W) * len(self.M)
+        self._max_f1 = max(max_f1, 1)
+        self._max_f2 = max(max_f2, 1)
+
     def get_device_name(self, device_id):
         """根据设备ID获取对应的机器名称"""
         # 使用设备ID对设备名称列表长度取模，循环使用设备名称
@@ -544,7 +741,7 @@ class SLP_GA_Optimizer:
 
             for dev_idx, device_id in enumerate(devices):
                 x = start_x + (dev_idx + 1) * device_spacing
-                y = line_y + random.uniform(-line_spacing / 3, line_spacing / 3)
+                y = line_y + self.rng.uniform(-line_spacing / 3, line_spacing / 3)
 
                 # 确保在边界内
                 l, w = self.device_sizes[device_id]
@@ -561,9 +758,9 @@ class SLP_GA_Optimizer:
                     # 使用产品线分配的位置
                     x, y = line_positions[i]
                     # 添加随机扰动
-                    if random.random() < 0.3:
-                        x += random.uniform(-3, 3)
-                        y += random.uniform(-1, 1)
+                    if self.rng.random() < 0.3:
+                        x += self.rng.uniform(-3, 3)
+                        y += self.rng.uniform(-1, 1)
                 else:
                     # 随机放置
                     l, w = self.device_sizes[i]
@@ -572,8 +769,8 @@ class SLP_GA_Optimizer:
                     x_max = self.L - l / 2 - s_min
                     y_min = w / 2 + s_min
                     y_max = self.W - w / 2 - s_min
-                    x = random.uniform(x_min, x_max)
-                    y = random.uniform(y_min, y_max)
+                    x = self.rng.uniform(x_min, x_max)
+                    y = self.rng.uniform(y_min, y_max)
             else:  # 固定设备
                 x, y = self.original_positions[i]
 
@@ -585,9 +782,332 @@ class SLP_GA_Optimizer:
         """计算曼哈顿距离（更适合车间布局）"""
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
+    def _material_handling_cost(self, coords):
+        """
+        向量化计算物料搬运成本 f1
+
+        coords: 形状为 (..., N, 2) 的坐标数组，通过广播计算两两曼哈顿距离
+        """
+        x = coords[..., 0]
+        y = coords[..., 1]
+        dist = np.abs(x[..., :, None] - x[..., None, :]) + np.abs(
+            y[..., :, None] - y[..., None, :]
+        )
+        return np.sum(dist * self._transport_weight, axis=(-2, -1))
+
+    def _device_move_cost(self, coords):
+        """向量化计算设备移动成本 f2，coords 形状为 (..., N, 2)"""
+        moved = coords[..., self._movable_idx, :]
+        move_dist = np.sum(
+            np.abs(moved - self._original_xy[self._movable_idx]), axis=-1
+        )
+        return np.sum(
+            np.where(move_dist > 0.001, self._move_cost_vec * move_dist, 0.0), axis=-1
+        )
+
+    def _space_utilization(self, coords):
+        """向量化计算空间利用率和产品线紧凑度 f3，coords 形状为 (..., N, 2)"""
+        line_efficiency = np.zeros(coords.shape[:-2])
+        if self._line_pair_i.size:
+            pair_dist = np.sum(
+                np.abs(
+                    coords[..., self._line_pair_i, :]
+                    - coords[..., self._line_pair_j, :]
+                ),
+                axis=-1,
+            )
+            # 按产品线归约：每条产品线的设备对平均距离
+            line_sums = pair_dist @ self._line_pair_onehot
+            avg_distance = line_sums / np.where(
+                self._line_has_pairs, self._line_pair_counts, 1.0
+            )
+            line_efficiency = np.sum(
+                np.where(self._line_has_pairs, 1.0 / (1.0 + avg_distance), 0.0),
+                axis=-1,
+            )
+
+        f3 = 0.6 * self._area_utilization + 0.4 * (line_efficiency / self._n_lines)
+        return np.clip(f3, 0, 1)
+
     def evaluate_individual(self, individual):
         """
-        评估个体 - 考虑产品线效率
+        评估个体 - 向量化版本
+
+        与 evaluate_individual_reference 的结果一致（浮点误差范围内）。
+        """
+        coords = np.asarray(individual, dtype=np.float64)[None]
+        total_obj, f1, f2, f3, _ = self.evaluate_population(coords)
+        return total_obj[0], f1[0], f2[0], float(f3[0])
+
+    def evaluate_population(self, coords):
+        """
+        批量评估整个种群
+
+        参数:
+        coords: 形状为 (P, N, 2) 的坐标数组，或由个体组成的列表
+
+        返回:
+        (total, f1, f2, f3, penalty)，每项均为长度为 P 的数组
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.ndim == 2:
+            coords = coords[None]
+
+        # 两两距离的中间数组大小为 P×N×N，种群较大时分块计算以限制内存
+        chunk = max(1, int(self.eval_chunk_elements // max(1, self.N * self.N)))
+        f1 = np.empty(len(coords))
+        for start in range(0, len(coords), chunk):
+            f1[start : start + chunk] = self._material_handling_cost(
+                coords[start : start + chunk]
+            )
+
+        f2 = self._device_move_cost(coords)
+        f3 = self._space_utilization(coords)
+        penalty = self._constraint_penalty_batch(coords)
+
+        total = (
+            self.alpha1 * f1 / self._max_f1
+            + self.alpha2 * f2 / self._max_f2
+            + self.alpha3 * (1 - f3)
+            + penalty * 0.0001
+        )
+
+        return total, f1, f2, f3, penalty
+
+    def evaluate_invalid(self, individuals):
+        """
+        批量评估适应度失效的个体，并在个体上缓存四个目标值
+
+        评估后 ind.fitness.values = (total,)，ind.objectives = (total, f1, f2, f3)
+        """
+        invalid = [ind for ind in individuals if not ind.fitness.valid]
+        if not invalid:
+            return 0
+
+        for ind, objectives in zip(
+            invalid, self.evaluate_batch(invalid), strict=True
+        ):
+            ind.objectives = objectives
+            ind.fitness.values = (objectives[0],)
+        return len(invalid)
+
+    def evaluate_batch(self, individuals):
+        """
+        批量评估布局，返回每个布局的 (total, f1, f2, f3)
+
+        命中适应度缓存的布局不再重复计算；启用并行评估时未命中的布局分块交给进程池
+        """
+        if not len(individuals):
+            return []
+        coords = np.asarray([list(ind) for ind in individuals], dtype=np.float64)
+        if self.fitness_cache.enabled:
+            keys = [FitnessCache.key(layout.tobytes()) for layout in coords]
+        else:
+            keys = range(len(individuals))
+        found, pending = self.fitness_cache.lookup(keys)
+
+        if pending:
+            rows = coords[[positions[0] for positions in pending.values()]]
+            if self._evaluation_pool is not None:
+                # 按工作进程数切块，每块在一个进程内批量评估
+                chunks = np.array_split(
+                    rows, min(len(rows), self._evaluation_pool.workers)
+                )
+                parts = self._evaluation_pool.map("evaluate_population", chunks)
+                total, f1, f2, f3, _ = (
+                    np.concatenate(col) for col in zip(*parts, strict=True)
+                )
+            else:
+                total, f1, f2, f3, _ = self.evaluate_population(rows)
+
+            for j, (key, positions) in enumerate(pending.items()):
+                objectives = self.fitness_cache.put(
+                    key, (total[j], f1[j], f2[j], f3[j])
+                )
+                for k in positions:
+                    found[k] = objectives
+
+        return [found[k] for k in range(len(individuals))]
+
+    def _constraint_penalty_batch(self, coords):
+        """
+        批量计算约束违反惩罚，与 calculate_constraint_penalty 的公式一致
+
+        coords: 形状为 (P, N, 2) 的坐标数组
+        """
+        x = coords[..., 0]
+        y = coords[..., 1]
+
+        # 边界约束
+        penalty = 2 * np.sum(
+            np.maximum(0, self._x_min - x)
+            + np.maximum(0, x - self._x_max)
+            + np.maximum(0, self._y_min - y)
+            + np.maximum(0, y - self._y_max),
+            axis=-1,
+        )
+
+        # 设备间无重叠约束：扫描裁剪得到候选设备对后再精确计算重叠面积
+        pop_idx, dev_i, dev_j = self._overlap_candidate_pairs(x, y)
+        if pop_idx.size:
+            sizes_i = self._device_sizes[dev_i]
+            sizes_j = self._device_sizes[dev_j]
+            overlap_x = np.maximum(
+                0,
+                (sizes_i[:, 0] + sizes_j[:, 0]) / 2
+                + self._s_safe
+                - np.abs(x[pop_idx, dev_i] - x[pop_idx, dev_j]),
+            )
+            overlap_y = np.maximum(
+                0,
+                (sizes_i[:, 1] + sizes_j[:, 1]) / 2
+                + self._s_safe
+                - np.abs(y[pop_idx, dev_i] - y[pop_idx, dev_j]),
+            )
+            penalty += 5 * np.bincount(
+                pop_idx, weights=overlap_x * overlap_y, minlength=len(penalty)
+            )
+
+        # 通道约束：同样只对 x 方向区间相交的设备-通道组合精确计算
+        pop_idx, dev_i, aisle_idx = self._aisle_candidate_pairs(x)
+        if pop_idx.size:
+            half_l = self._half_sizes[dev_i, 0]
+            half_w = self._half_sizes[dev_i, 1]
+            aisle_x, aisle_y, aisle_right, aisle_top = self._aisles[aisle_idx].T
+            xs = x[pop_idx, dev_i]
+            ys = y[pop_idx, dev_i]
+            overlap_width = np.maximum(
+                0,
+                np.minimum(xs + half_l, aisle_right) - np.maximum(xs - half_l, aisle_x),
+            )
+            overlap_height = np.maximum(
+                0,
+                np.minimum(ys + half_w, aisle_top) - np.maximum(ys - half_w, aisle_y),
+            )
+            penalty += 2 * np.bincount(
+                pop_idx, weights=overlap_width * overlap_height, minlength=len(penalty)
+            )
+
+        # 产品线约束：设备到产品线中心的曼哈顿距离超过 15 的部分
+        if self._line_member_idx.size:
+            members = coords[..., self._line_member_idx, :]
+            centers = np.swapaxes(
+                np.swapaxes(members, -1, -2) @ self._line_member_weight, -1, -2
+            )
+            member_centers = centers[..., self._line_member_line, :]
+            dist = np.sum(np.abs(members - member_centers), axis=-1)
+            penalty += np.sum(np.maximum(0, dist - 15), axis=-1)
+
+        return penalty
+
+    @staticmethod
+    def _expand_ranges(starts, ends):
+        """把若干半开区间 [start, end) 展开为 (区间编号, 位置) 两个扁平数组"""
+        counts = np.maximum(ends - starts, 0)
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(len(starts)), counts)
+        if total == 0:
+            return owner, owner
+        first = np.cumsum(counts) - counts
+        positions = np.repeat(starts, counts) + (
+            np.arange(total) - np.repeat(first, counts)
+        )
+        return owner, positions
+
+    def _sweep_layout(self, x, extra_lo=None, extra_hi=None):
+        """
+        扫描裁剪的坐标平移：把第 p 个布局整体平移 p * span，
+        使所有布局可以在同一条排好序的 x 轴上扫描而互不相交
+        """
+        lo = x.min()
+        hi = x.max()
+        if extra_lo is not None:
+            lo = min(lo, extra_lo)
+            hi = max(hi, extra_hi)
+        reach = float(self._sweep_half_x.max(initial=0)) + float(
+            self._half_sizes[:, 0].max(initial=0)
+        )
+        span = (hi - lo) + 2 * reach + 1.0
+        return (np.arange(len(x)) * span - lo)[:, None]
+
+    def _overlap_candidate_pairs(self, x, y):
+        """
+        设备重叠的宽阶段检测（sweep-and-prune）
+
+        x, y: 形状为 (P, N) 的坐标。按区间左端排序后，每个设备只与左端落在
+        自身区间内的设备配对，再用 y 方向区间过滤。返回的候选集合包含所有
+        重叠面积大于 0 的设备对（留有浮点余量），精确面积由调用方计算。
+
+        返回 (布局编号, 设备 i, 设备 j)，其中 i < j
+        """
+        P, N = x.shape
+        if N < 2:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty, empty
+
+        shifted = x + self._sweep_layout(x)
+        lefts = (shifted - self._sweep_half_x).ravel()
+        rights = (shifted + self._sweep_half_x).ravel()
+        order = np.argsort(lefts, kind="stable")
+        sorted_lefts = lefts[order]
+
+        ends = np.searchsorted(
+            sorted_lefts, rights[order] + self._sweep_margin, side="left"
+        )
+        owner, positions = self._expand_ranges(np.arange(1, P * N + 1), ends)
+        a = order[owner]
+        b = order[positions]
+
+        pop_idx = a // N
+        dev_a = a % N
+        dev_b = b % N
+        keep = pop_idx == b // N
+        keep &= np.abs(y[pop_idx, dev_a] - y[pop_idx, dev_b]) < (
+            self._sweep_half_y[dev_a] + self._sweep_half_y[dev_b] + self._sweep_margin
+        )
+        pop_idx = pop_idx[keep]
+        dev_a = dev_a[keep]
+        dev_b = dev_b[keep]
+        return pop_idx, np.minimum(dev_a, dev_b), np.maximum(dev_a, dev_b)
+
+    def _aisle_candidate_pairs(self, x):
+        """
+        设备与通道重叠的宽阶段检测
+
+        设备按左端排序后，与通道 [ax, ax + aw) 在 x 方向相交的设备，其左端必然
+        落在 [ax - 设备最大长度, ax + aw) 内，因此每个通道只需两次二分查找。
+
+        返回 (布局编号, 设备编号, 通道编号)
+        """
+        P, N = x.shape
+        n_aisles = len(self._aisles)
+        if n_aisles == 0 or N == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty, empty
+
+        aisle_x = self._aisles[:, 0]
+        aisle_right = self._aisles[:, 2]
+        offset = self._sweep_layout(x, aisle_x.min(), aisle_right.max())
+        lefts = (x + offset - self._half_sizes[:, 0]).ravel()
+        order = np.argsort(lefts, kind="stable")
+        sorted_lefts = lefts[order]
+
+        max_length = 2 * float(self._half_sizes[:, 0].max())
+        query_lo = (aisle_x[None, :] + offset - max_length - self._sweep_margin).ravel()
+        query_hi = (aisle_right[None, :] + offset + self._sweep_margin).ravel()
+        owner, positions = self._expand_ranges(
+            np.searchsorted(sorted_lefts, query_lo, side="left"),
+            np.searchsorted(sorted_lefts, query_hi, side="left"),
+        )
+        device = order[positions]
+
+        pop_idx = owner // n_aisles
+        keep = pop_idx == device // N
+        return pop_idx[keep], device[keep] % N, (owner % n_aisles)[keep]
+
+    def evaluate_individual_reference(self, individual):
+        """
+        评估个体 - 考虑产品线效率（逐元素的参考实现，用于校验向量化版本）
         """
         new_positions = individual
 
@@ -653,7 +1173,7 @@ class SLP_GA_Optimizer:
         f3 = max(0, min(1, f3))
 
         # 4. 计算约束惩罚项
-        penalty = self.calculate_constraint_penalty(new_positions)
+        penalty = self.calculate_constraint_penalty_reference(new_positions)
 
         # 5. 归一化目标值并加权求和
         max_f1 = (
@@ -685,6 +1205,101 @@ class SLP_GA_Optimizer:
     def calculate_constraint_penalty(self, positions):
         """
         计算约束违反惩罚 - 增加产品线约束
+
+        设备重叠与通道占用先经宽阶段筛选，复杂度近似线性，
+        数值与 calculate_constraint_penalty_reference 完全相同
+        """
+        penalty = 0
+
+        # 边界约束
+        for i in range(self.N):
+            x, y = positions[i]
+            l, w = self.device_sizes[i]
+            s_min = self.safety_distances[i]
+
+            if x < l / 2 + s_min:
+                penalty += (l / 2 + s_min - x) * 2
+            if x > self.L - l / 2 - s_min:
+                penalty += (x - (self.L - l / 2 - s_min)) * 2
+
+            if y < w / 2 + s_min:
+                penalty += (w / 2 + s_min - y) * 2
+            if y > self.W - w / 2 - s_min:
+                penalty += (y - (self.W - w / 2 - s_min)) * 2
+
+        # 设备间无重叠约束：先用扫描裁剪筛出候选设备对，只对候选对精确计算；
+        # 按 (i, j) 顺序累加，结果与逐对检查完全一致
+        coords = np.asarray(positions, dtype=np.float64)
+        _, cand_i, cand_j = self._overlap_candidate_pairs(
+            coords[None, :, 0], coords[None, :, 1]
+        )
+        s_safe = 0.5
+        overlap_penalty = 0
+
+        for k in np.lexsort((cand_j, cand_i)):
+            i, j = int(cand_i[k]), int(cand_j[k])
+            xi, yi = positions[i]
+            xj, yj = positions[j]
+            li, wi = self.device_sizes[i]
+            lj, wj = self.device_sizes[j]
+
+            overlap_x = max(0, (li + lj) / 2 + s_safe - abs(xi - xj))
+            overlap_y = max(0, (wi + wj) / 2 + s_safe - abs(yi - yj))
+
+            if overlap_x > 0 and overlap_y > 0:
+                overlap_area = overlap_x * overlap_y
+                overlap_penalty += overlap_area * 5
+
+        penalty += overlap_penalty
+
+        # 通道约束：只检查 x 方向与通道相交的设备，按 (通道, 设备) 顺序累加
+        _, cand_dev, cand_aisle = self._aisle_candidate_pairs(coords[None, :, 0])
+        for k in np.lexsort((cand_dev, cand_aisle)):
+            i = int(cand_dev[k])
+            aisle_x, aisle_y, aisle_w, aisle_h = self.aisle_areas[int(cand_aisle[k])]
+            x, y = positions[i]
+            l, w = self.device_sizes[i]
+
+            device_left = x - l / 2
+            device_right = x + l / 2
+            device_bottom = y - w / 2
+            device_top = y + w / 2
+
+            aisle_right = aisle_x + aisle_w
+            aisle_top = aisle_y + aisle_h
+
+            overlap_width = max(
+                0, min(device_right, aisle_right) - max(device_left, aisle_x)
+            )
+            overlap_height = max(
+                0, min(device_top, aisle_top) - max(device_bottom, aisle_y)
+            )
+
+            if overlap_width > 0 and overlap_height > 0:
+                overlap_area = overlap_width * overlap_height
+                penalty += overlap_area * 2
+
+        # 产品线约束：同一产品线的设备应该相对集中
+        line_penalty = 0
+        for line_id, devices in self.product_lines.items():
+            if len(devices) > 1:
+                # 计算设备中心点
+                center_x = sum(positions[dev][0] for dev in devices) / len(devices)
+                center_y = sum(positions[dev][1] for dev in devices) / len(devices)
+
+                # 计算每个设备到中心的距离
+                for dev in devices:
+                    dist = self.calculate_distance(positions[dev], (center_x, center_y))
+                    if dist > 15:  # 如果设备离产品线中心太远
+                        line_penalty += dist - 15
+
+        penalty += line_penalty
+
+        return penalty
+
+    def calculate_constraint_penalty_reference(self, positions):
+        """
+        计算约束违反惩罚 - 逐对检查的参考实现（O(N²)），用于校验宽阶段版本
         """
         penalty = 0
 
@@ -780,8 +1395,8 @@ class SLP_GA_Optimizer:
             current_mutpb = self.mutpb * (1.5 - 0.5 * progress)
 
         for i in self.M:
-            if random.random() < current_mutpb:
-                mutation_type = random.choice(
+            if self.rng.random() < current_mutpb:
+                mutation_type = self.rng.choice(
                     ["small", "medium", "large", "swap", "reset", "line_focus"]
                 )
 
@@ -795,21 +1410,21 @@ class SLP_GA_Optimizer:
                 y_max = self.W - w / 2 - s_min
 
                 if mutation_type == "small":
-                    new_x = max(x_min, min(x_max, x + random.uniform(-2, 2)))
-                    new_y = max(y_min, min(y_max, y + random.uniform(-2, 2)))
+                    new_x = max(x_min, min(x_max, x + self.rng.uniform(-2, 2)))
+                    new_y = max(y_min, min(y_max, y + self.rng.uniform(-2, 2)))
 
                 elif mutation_type == "medium":
-                    new_x = max(x_min, min(x_max, x + random.uniform(-5, 5)))
-                    new_y = max(y_min, min(y_max, y + random.uniform(-5, 5)))
+                    new_x = max(x_min, min(x_max, x + self.rng.uniform(-5, 5)))
+                    new_y = max(y_min, min(y_max, y + self.rng.uniform(-5, 5)))
 
                 elif mutation_type == "large":
-                    new_x = random.uniform(x_min, x_max)
-                    new_y = random.uniform(y_min, y_max)
+                    new_x = self.rng.uniform(x_min, x_max)
+                    new_y = self.rng.uniform(y_min, y_max)
 
                 elif mutation_type == "swap":
                     possible_swaps = [j for j in self.M if j != i]
                     if possible_swaps:
-                        swap_with = random.choice(possible_swaps)
+                        swap_with = self.rng.choice(possible_swaps)
                         mutant[i], mutant[swap_with] = mutant[swap_with], mutant[i]
                     continue
 
@@ -822,8 +1437,8 @@ class SLP_GA_Optimizer:
                     # 向产品线中心移动
                     line_center = self.find_line_center(i, mutant)
                     if line_center:
-                        new_x = x + (line_center[0] - x) * random.uniform(0.1, 0.3)
-                        new_y = y + (line_center[1] - y) * random.uniform(0.1, 0.3)
+                        new_x = x + (line_center[0] - x) * self.rng.uniform(0.1, 0.3)
+                        new_y = y + (line_center[1] - y) * self.rng.uniform(0.1, 0.3)
                         new_x = max(x_min, min(x_max, new_x))
                         new_y = max(y_min, min(y_max, new_y))
                     else:
@@ -856,33 +1471,33 @@ class SLP_GA_Optimizer:
         child1 = list(ind1)
         child2 = list(ind2)
 
-        if random.random() < self.cxpb:
-            crossover_type = random.choice(
+        if self.rng.random() < self.cxpb:
+            crossover_type = self.rng.choice(
                 ["single", "two_point", "uniform", "blend", "line_based"]
             )
 
             if crossover_type == "single":
-                crossover_point = random.randint(1, self.N - 1)
+                crossover_point = self.rng.randint(1, self.N - 1)
                 for i in range(crossover_point, self.N):
                     if i in self.M:
                         child1[i], child2[i] = child2[i], child1[i]
 
             elif crossover_type == "two_point":
-                point1 = random.randint(1, self.N - 2)
-                point2 = random.randint(point1 + 1, self.N - 1)
+                point1 = self.rng.randint(1, self.N - 2)
+                point2 = self.rng.randint(point1 + 1, self.N - 1)
                 for i in range(point1, point2):
                     if i in self.M:
                         child1[i], child2[i] = child2[i], child1[i]
 
             elif crossover_type == "uniform":
                 for i in self.M:
-                    if random.random() < 0.5:
+                    if self.rng.random() < 0.5:
                         child1[i], child2[i] = child2[i], child1[i]
 
             elif crossover_type == "blend":
                 for i in self.M:
-                    if random.random() < 0.5:
-                        alpha = random.random()
+                    if self.rng.random() < 0.5:
+                        alpha = self.rng.random()
                         x1, y1 = child1[i]
                         x2, y2 = child2[i]
 
@@ -910,7 +1525,7 @@ class SLP_GA_Optimizer:
             elif crossover_type == "line_based":
                 # 按产品线交叉
                 for line_id, devices in self.product_lines.items():
-                    if random.random() < 0.5:
+                    if self.rng.random() < 0.5:
                         for dev in devices:
                             if dev in self.M:
                                 child1[dev], child2[dev] = child2[dev], child1[dev]
@@ -921,19 +1536,16 @@ class SLP_GA_Optimizer:
         """
         设置遗传算法
         """
-        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMin)
-
         toolbox = base.Toolbox()
 
         toolbox.register(
-            "individual", tools.initIterate, creator.Individual, self.create_individual
+            "individual", tools.initIterate, Individual, self.create_individual
         )
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 
         toolbox.register("evaluate", lambda ind: (self.evaluate_individual(ind)[0],))
         toolbox.register("mate", self.crossover_individuals)
-        toolbox.register("select", tools.selTournament, tournsize=self.tournament_size)
+        toolbox.register("select", self.select_tournament)
 
         return toolbox
 
@@ -941,43 +1553,73 @@ class SLP_GA_Optimizer:
         """
         运行优化算法
         """
+        # 每次运行重新统计缓存命中率；清空后再创建进程池，避免把旧缓存传给工作进程
+        self.fitness_cache.clear()
+        self.convergence.start()
+        self._evaluation_pool = create_evaluation_pool(self)
+        try:
+            if self.engine == "ga":
+                return self._run_evolution()
+            return self._run_moo()
+        finally:
+            if self._evaluation_pool is not None:
+                self._evaluation_pool.close()
+                self._evaluation_pool = None
+
+    def _run_evolution(self):
+        """进化主循环"""
         toolbox = self.setup_ga()
+        signature = run_signature(self)
+        state = self.checkpointer.load(signature) if self.checkpointer else None
 
-        pop = toolbox.population(n=self.pop_size)
+        if state is None:
+            pop = toolbox.population(n=self.pop_size)
 
-        print("评估初始种群...")
-        fitnesses = list(map(toolbox.evaluate, pop))
-        for ind, fit in zip(pop, fitnesses):
-            ind.fitness.values = fit
+            print("评估初始种群...")
+            self.evaluate_invalid(pop)
 
+            # 最小化 f1、f2，最大化 f3
+            archive = ParetoArchive((1, 1, -1), capacity=self.archive_size)
+            objective_log = []
+            self.evolution_history = []
+            diversity = 0.0
+            start_gen = 0
+        else:
+            print(f"从第 {state['generation']} 代的检查点继续...")
+            pop = state["pop"]
+            archive = state["archive"]
+            objective_log = [state["objective_log"]]
+            self.evolution_history = state["evolution_history"]
+            diversity = state["diversity"]
+            self.mutpb = state["mutpb"]
+            restore_rng_state(self, state["rng"])
+            self.convergence.restore(state["convergence"])
+            start_gen = state["generation"] + 1
         self.all_solutions = []
-        self.evolution_history = []
 
         print("开始进化...")
-        start_time = time.time()
+        start_time = time.time() - (state["elapsed"] if state else 0.0)
 
-        for gen in range(self.ngen):
-            diversity = self.calculate_population_diversity(pop)
+        for gen in range(start_gen, self.ngen):
+            # 多样性仅用于诊断和自适应变异率，非计算代沿用上一次的值
+            if gen % self.diversity_interval == 0:
+                diversity = self.calculate_population_diversity(pop)
 
             offspring = toolbox.select(pop, len(pop))
             offspring = list(map(toolbox.clone, offspring))
 
             for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < self.cxpb:
+                if self.rng.random() < self.cxpb:
                     toolbox.mate(child1, child2)
                     del child1.fitness.values
                     del child2.fitness.values
 
             for mutant in offspring:
-                if random.random() < self.mutpb:
+                if self.rng.random() < self.mutpb:
                     mutant[:] = self.mutate_individual(mutant, gen, self.ngen)
                     del mutant.fitness.values
 
-            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            if invalid_ind:
-                fitnesses = map(toolbox.evaluate, invalid_ind)
-                for ind, fit in zip(invalid_ind, fitnesses):
-                    ind.fitness.values = fit
+            self.evaluate_invalid(offspring)
 
             elite_size = max(1, int(0.1 * len(pop)))
             elite = tools.selBest(pop, elite_size)
@@ -989,24 +1631,29 @@ class SLP_GA_Optimizer:
             else:
                 pop[:] = elite
 
+            # 种群中的个体均已带有目标值，直接复用，不再重复评估
             current_best = min(pop, key=lambda ind: ind.fitness.values[0])
-            total_obj, f1, f2, f3 = self.evaluate_individual(current_best)
+            total_obj, f1, f2, f3 = current_best.objectives
 
+            generation_solutions = []
             for ind in pop:
-                total_obj, f1, f2, f3 = self.evaluate_individual(ind)
-                self.all_solutions.append(
+                ind_total, ind_f1, ind_f2, ind_f3 = ind.objectives
+                generation_solutions.append(
                     {
                         "individual": ind,
-                        "f1": f1,
-                        "f2": f2,
-                        "f3": f3,
-                        "total": total_obj,
+                        "f1": ind_f1,
+                        "f2": ind_f2,
+                        "f3": ind_f3,
+                        "total": ind_total,
                         "generation": gen,
                     }
                 )
+            archive.add(generation_solutions)
+            objective_log.append(objective_matrix(generation_solutions))
 
             elapsed = time.time() - start_time
 
+            stop_reason = self.convergence.update(total_obj, archive.objectives)
             self.evolution_history.append(
                 {
                     "generation": gen,
@@ -1016,8 +1663,11 @@ class SLP_GA_Optimizer:
                     "diversity": float(diversity),
                     "mutpb": float(self.mutpb),
                     "elapsed_time": float(elapsed),
+                    **self.fitness_cache.stats(),
+                    **self.convergence.stats(),
                 }
             )
+            self.convergence.report(self.evolution_history[-1])
 
             if gen % 20 == 0 or gen == self.ngen - 1:
                 print(
@@ -1029,78 +1679,272 @@ class SLP_GA_Optimizer:
                     self.mutpb = min(0.8, self.mutpb * 1.2)
                     print(f"  警告：种群多样性过低，增加变异率到 {self.mutpb:.3f}")
 
-        self.pareto_solutions = self.get_pareto_front(self.all_solutions)
-        self.all_pareto_solutions = self.pareto_solutions.copy()
+            if stop_reason is not None:
+                print(f"第 {gen} 代提前终止: {stop_reason}")
+                break
 
-        return self.pareto_solutions, self.all_solutions, self.evolution_history
+            if self.checkpointer is not None and self.checkpointer.due(gen, self.ngen):
+                objective_log[:] = [np.vstack(objective_log)]
+                self.checkpointer.save(
+                    signature,
+                    gen,
+                    {
+                        "pop": pop,
+                        "archive": archive,
+                        "objective_log": objective_log[0],
+                        "evolution_history": self.evolution_history,
+                        "diversity": diversity,
+                        "mutpb": self.mutpb,
+                        "rng": rng_state(self),
+                        "convergence": self.convergence.state(),
+                        "elapsed": elapsed,
+                    },
+                )
 
-    def calculate_population_diversity(self, population):
-        """计算种群多样性"""
-        if len(population) <= 1:
-            return 0
+        self.stop_reason = self.convergence.finish(self.evolution_history)
+        self.generations_run = len(self.evolution_history)
 
-        total_distance = 0
-        count = 0
+        if self.local_search_steps > 0:
+            print(f"局部搜索精修: {self.local_search_steps} 步/个体...")
+            refined_solutions = []
+            for ind in tools.selBest(pop, min(5, len(pop))):
+                refined = self.local_search(ind, self.local_search_steps)
+                total_obj, f1, f2, f3 = refined.objectives
+                refined_solutions.append(
+                    {
+                        "individual": refined,
+                        "f1": f1,
+                        "f2": f2,
+                        "f3": f3,
+                        "total": total_obj,
+                        "generation": self.generations_run,
+                    }
+                )
+            archive.add(refined_solutions)
+            objective_log.append(objective_matrix(refined_solutions))
 
-        for i in range(len(population)):
-            for j in range(i + 1, len(population)):
-                dist = 0
-                for k in range(self.N):
-                    if k in self.M:
-                        pos1 = population[i][k]
-                        pos2 = population[j][k]
-                        dist += self.calculate_distance(pos1, pos2)
+        self.all_solutions = archive.solutions
+        if objective_log:
+            self.objective_log = np.vstack(objective_log)
+        print(f"存档保留 {len(self.all_solutions)} 个非支配解")
 
-                total_distance += dist
-                count += 1
+        self.pareto_solutions = self.get_pareto_front(self.all_solutions)
+        self.all_pareto_solutions = self.pareto_solutions.copy()
 
-        avg_distance = total_distance / count if count > 0 else 0
+        return self.pareto_solutions, self.all_solutions, self.evolution_history
 
-        max_possible_distance = self.N * (self.L + self.W)
-        normalized_diversity = (
-            avg_distance / max_possible_distance if max_possible_distance > 0 else 0
+    def _run_moo(self):
+        """
+        NSGA-II / NSGA-III 主循环
+
+        帕累托前沿直接取最终种群中的非支配解；存档只用于记录历史上的非支配解
+        """
+        engine = MOOEngine(
+            self,
+            (1, 1, -1),
+            self.engine,
+            mutate=lambda ind: self.mutate_individual(ind, engine.generation, self.ngen),
         )
 
-        return normalized_diversity
+        archive = ParetoArchive((1, 1, -1), capacity=self.archive_size)
+        objective_log = []
+        self.all_solutions = []
+        self.evolution_history = []
 
-    def get_pareto_front(self, solutions):
-        """获取帕累托前沿"""
-        if not solutions:
-            return []
+        print(f"开始进化（{self.engine.upper()}）...")
+        start_time = time.time()
 
-        unique_solutions = []
-        seen_positions = set()
+        for gen, individuals, objectives in engine.generations():
+            generation_solutions = [
+                {
+                    "individual": ind,
+                    "f1": f1,
+                    "f2": f2,
+                    "f3": f3,
+                    "total": total_obj,
+                    "generation": gen,
+                }
+                for ind, (total_obj, f1, f2, f3) in zip(
+                    individuals, objectives.tolist(), strict=True
+                )
+            ]
+            archive.add(generation_solutions)
+            objective_log.append(objectives[:, 1:])
 
-        for sol in solutions:
-            pos_hash = tuple(
-                (round(pos[0], 2), round(pos[1], 2)) for pos in sol["individual"]
+            elapsed = time.time() - start_time
+            best_total, f1, f2, f3 = objectives[np.argmin(objectives[:, 0])]
+            stop_reason = self.convergence.update(best_total, archive.objectives)
+            self.evolution_history.append(
+                {
+                    "generation": gen,
+                    "f1": float(f1),
+                    "f2": float(f2),
+                    "f3": float(f3),
+                    "mutpb": float(self.mutpb),
+                    "elapsed_time": float(elapsed),
+                    **self.fitness_cache.stats(),
+                    **self.convergence.stats(),
+                }
             )
-            if pos_hash not in seen_positions:
-                seen_positions.add(pos_hash)
-                unique_solutions.append(sol)
-
-        print(f"找到 {len(unique_solutions)} 个唯一解")
-
-        pareto_front = []
-
-        sorted_solutions = sorted(unique_solutions, key=lambda x: x["total"])
-        candidates = sorted_solutions[: min(200, len(sorted_solutions))]
+            self.convergence.report(self.evolution_history[-1])
 
-        for sol in candidates:
-            dominated = False
+            if gen % 20 == 0 or gen == self.ngen - 1:
+                print(
+                    f"Generation {gen}: f1={f1:.2f}, f2={f2:.2f}, f3={f3:.4f}, "
+                    f"time={elapsed:.1f}s"
+                )
 
-            for pf in pareto_front:
-                if self.is_dominated(sol, pf):
-                    dominated = True
-                    break
+            if stop_reason is not None:
+                print(f"第 {gen} 代提前终止: {stop_reason}")
+                break
+
+        self.stop_reason = self.convergence.finish(self.evolution_history)
+        self.generations_run = len(self.evolution_history)
+
+        self.all_solutions = archive.solutions
+        if objective_log:
+            self.objective_log = np.vstack(objective_log)
+
+        front_individuals, front_objectives = engine.front()
+        self.pareto_solutions = sorted(
+            (
+                {
+                    "individual": ind,
+                    "f1": f1,
+                    "f2": f2,
+                    "f3": f3,
+                    "total": total_obj,
+                    "generation": self.generations_run - 1,
+                }
+                for ind, (total_obj, f1, f2, f3) in zip(
+                    front_individuals, front_objectives.tolist(), strict=True
+                )
+            ),
+            key=lambda x: x["total"],
+        )
+        self.all_pareto_solutions = self.pareto_solutions.copy()
+        print(f"帕累托前沿包含 {len(self.pareto_solutions)} 个解")
+
+        return self.pareto_solutions, self.all_solutions, self.evolution_history
+
+    def local_search(self, individual, steps):
+        """
+        局部搜索精修 - 每步随机平移或交换可移动设备，只接受使总目标下降的移动
+
+        使用 LayoutDeltaEvaluator 增量评估，每步只计算移动设备相关的变化量
+        """
+        evaluator = LayoutDeltaEvaluator(self, individual)
+        movable = list(self.M)
+
+        for _ in range(steps if movable else 0):
+            i = self.rng.choice(movable)
+            if len(movable) > 1 and self.rng.random() < 0.2:
+                j = self.rng.choice([dev for dev in movable if dev != i])
+                moves = {i: tuple(evaluator.coords[j]), j: tuple(evaluator.coords[i])}
+            else:
+                l, w = self.device_sizes[i]
+                s_min = self.safety_distances[i]
+                step = self.rng.choice([0.5, 2, 5])
+                x, y = evaluator.coords[i]
+                x, y = (
+                    x + self.rng.uniform(-step, step),
+                    y + self.rng.uniform(-step, step),
+                )
+                new_x = max(l / 2 + s_min, min(self.L - l / 2 - s_min, float(x)))
+                new_y = max(w / 2 + s_min, min(self.W - w / 2 - s_min, float(y)))
+                moves = {i: (new_x, new_y)}
+
+            if evaluator.propose(moves)[0] < evaluator.objectives[0]:
+                evaluator.accept()
+
+        refined = Individual(evaluator.individual())
+        # 输出前做一次全量评估，保证缓存的目标值与 evaluate_individual 一致
+        refined.objectives = self.evaluate_individual(refined)
+        refined.fitness.values = (refined.objectives[0],)
+        return refined
+
+    def calculate_population_diversity(self, population):
+        """
+        计算种群多样性 - 可移动设备坐标的平均两两曼哈顿距离（归一化）
+
+        向量化实现：对每个坐标分量排序后，两两距离之和
+        sum_{i<j} |a_i - a_j| = sum_k a_(k) * (2k - P + 1)，复杂度 O(P log P · N)。
+        设置 diversity_sample_pairs 时改为在随机抽样的个体对上估计。
+        """
+        P = len(population)
+        if P <= 1:
+            return 0
+
+        coords = np.asarray([list(ind) for ind in population], dtype=np.float64)
+        movable = coords[:, self._movable_idx, :].reshape(P, -1)
+        n_pairs = P * (P - 1) // 2
+
+        if self.diversity_sample_pairs and self.diversity_sample_pairs < n_pairs:
+            i = self.np_rng.integers(0, P, self.diversity_sample_pairs)
+            j = (i + self.np_rng.integers(1, P, self.diversity_sample_pairs)) % P
+            pair_dist = np.sum(np.abs(movable[i] - movable[j]), axis=1)
+            avg_distance = float(np.mean(pair_dist))
+        else:
+            ranks = 2 * np.arange(P) - P + 1
+            total_distance = float(np.sum(ranks @ np.sort(movable, axis=0)))
+            avg_distance = total_distance / n_pairs
+
+        max_possible_distance = self.N * (self.L + self.W)
+        normalized_diversity = (
+            avg_distance / max_possible_distance if max_possible_distance > 0 else 0
+        )
+
+        return normalized_diversity
+
+    def calculate_population_diversity_reference(self, population):
+        """计算种群多样性（逐对比较的参考实现）"""
+        if len(population) <= 1:
+            return 0
+
+        total_distance = 0
+        count = 0
+
+        for i in range(len(population)):
+            for j in range(i + 1, len(population)):
+                dist = 0
+                for k in range(self.N):
+                    if k in self.M:
+                        pos1 = population[i][k]
+                        pos2 = population[j][k]
+                        dist += self.calculate_distance(pos1, pos2)
+
+                total_distance += dist
+                count += 1
+
+        avg_distance = total_distance / count if count > 0 else 0
 
-            if not dominated:
-                new_pareto_front = []
-                for pf in pareto_front:
-                    if not self.is_dominated(pf, sol):
-                        new_pareto_front.append(pf)
-                pareto_front = new_pareto_front
-                pareto_front.append(sol)
+        max_possible_distance = self.N * (self.L + self.W)
+        normalized_diversity = (
+            avg_distance / max_possible_distance if max_possible_distance > 0 else 0
+        )
+
+        return normalized_diversity
+
+    def get_pareto_front(self, solutions):
+        """获取帕累托前沿 - 对全部存档做非支配筛选（最小化 f1、f2，最大化 f3）"""
+        if not solutions:
+            return []
+
+        # 按坐标（保留两位小数）去重，保留首次出现的解
+        layouts = np.asarray(
+            [list(sol["individual"]) for sol in solutions], dtype=np.float64
+        )
+        layouts = np.round(layouts, 2).reshape(len(solutions), -1)
+        _, first_idx = np.unique(layouts, axis=0, return_index=True)
+        unique_solutions = [solutions[i] for i in np.sort(first_idx)]
+
+        print(f"找到 {len(unique_solutions)} 个唯一解")
+
+        mask = non_dominated_mask(objective_matrix(unique_solutions), senses=(1, 1, -1))
+        pareto_front = sorted(
+            (sol for sol, keep in zip(unique_solutions, mask, strict=True) if keep),
+            key=lambda x: x["total"],
+        )
 
         print(f"帕累托前沿包含 {len(pareto_front)} 个解")
         return pareto_front
@@ -1121,13 +1965,11 @@ class SLP_GA_Optimizer:
         """
         可视化结果 - 美化版
         """
-        if not self.all_solutions:
+        if not len(self.objective_log):
             print("没有找到解决方案")
             return []
 
-        f1_vals = [sol["f1"] for sol in self.all_solutions]
-        f2_vals = [sol["f2"] for sol in self.all_solutions]
-        f3_vals = [sol["f3"] for sol in self.all_solutions]
+        f1_vals, f2_vals, f3_vals = self.objective_log.T
 
         f1_pareto = [sol["f1"] for sol in self.pareto_solutions]
         f2_pareto = [sol["f2"] for sol in self.pareto_solutions]
@@ -1233,12 +2075,10 @@ class SLP_GA_Optimizer:
         import base64
         from io import BytesIO
 
-        if not self.all_solutions:
+        if not len(self.objective_log):
             return None
 
-        f1_vals = [sol["f1"] for sol in self.all_solutions]
-        f2_vals = [sol["f2"] for sol in self.all_solutions]
-        f3_vals = [sol["f3"] for sol in self.all_solutions]
+        f1_vals, f2_vals, f3_vals = self.objective_log.T
 
         f1_pareto = [sol["f1"] for sol in self.pareto_solutions]
         f2_pareto = [sol["f2"] for sol in self.pareto_solutions]
@@ -2080,12 +2920,387 @@ class SLP_GA_Optimizer:
             )
 
 
+# ========== 轻工业布局增量评估器 ==========
+class LayoutDeltaEvaluator:
+    """
+    布局增量评估器
+
+    缓存一个布局的各项分量（物料搬运成本、逐设备移动成本、重叠惩罚、
+    逐设备边界/通道惩罚、产品线设备对距离与中心点惩罚）。当 k 台设备移动时，
+    只需计算这 k 台设备与其余设备之间的变化量，复杂度为 O(k·N)，
+    而不是整体重新评估的 O(N²)。
+
+    用法：
+        evaluator = LayoutDeltaEvaluator(optimizer, individual)
+        objectives = evaluator.propose({device_id: (x, y)})
+        if objectives[0] < evaluator.objectives[0]:
+            evaluator.accept()
+    """
+
+    def __init__(self, optimizer, individual, resync_interval=200):
+        self.opt = optimizer
+        # 每接受若干次移动后做一次全量重算，消除浮点累积误差
+        self.resync_interval = resync_interval
+
+        T = optimizer._transport_weight
+        self._sym_weight = T + T.T
+        self._movable_mask = np.zeros(optimizer.N, dtype=bool)
+        self._movable_mask[optimizer._movable_idx] = True
+        self._move_cost_full = np.zeros(optimizer.N)
+        self._move_cost_full[optimizer._movable_idx] = optimizer._move_cost_vec
+
+        # 每台设备参与的产品线设备对编号、所在的惩罚产品线编号
+        self._device_line_pairs = [[] for _ in range(optimizer.N)]
+        for k, (i, j) in enumerate(
+            zip(optimizer._line_pair_i, optimizer._line_pair_j, strict=True)
+        ):
+            self._device_line_pairs[i].append(k)
+            self._device_line_pairs[j].append(k)
+        self._device_penalty_lines = [set() for _ in range(optimizer.N)]
+        for dev, line in zip(
+            optimizer._line_member_idx, optimizer._line_member_line, strict=True
+        ):
+            self._device_penalty_lines[dev].add(int(line))
+        self._penalty_line_members = [
+            optimizer._line_member_idx[optimizer._line_member_line == line]
+            for line in range(optimizer._line_member_weight.shape[1])
+        ]
+
+        self._pending = None
+        self.reset(individual)
+
+    def reset(self, individual):
+        """全量计算并缓存各项分量"""
+        opt = self.opt
+        self.coords = np.array(individual, dtype=np.float64).reshape(opt.N, 2)
+        all_idx = np.arange(opt.N)
+        coords = self.coords
+
+        self.f1 = float(opt._material_handling_cost(coords))
+        self.move_cost = self._device_move_costs(all_idx, coords)
+        self.boundary = self._boundary_penalties(all_idx, coords)
+        self.aisle = self._aisle_penalties(all_idx, coords)
+
+        overlap = self._overlap_rows(all_idx, coords)
+        np.fill_diagonal(overlap, 0.0)
+        self.overlap = float(np.sum(np.triu(overlap, k=1)))
+
+        self.line_pair_dist = np.sum(
+            np.abs(coords[opt._line_pair_i] - coords[opt._line_pair_j]), axis=-1
+        )
+        self.line_penalty = np.array(
+            [
+                self._line_penalty(members, coords)
+                for members in self._penalty_line_members
+            ]
+        )
+        self._accepted = 0
+        self.objectives = self._combine(
+            self.f1,
+            self.move_cost,
+            self.overlap,
+            self.boundary,
+            self.aisle,
+            self.line_pair_dist,
+            self.line_penalty,
+        )
+        return self.objectives
+
+    def individual(self):
+        """以 (x, y) 元组列表的形式返回当前布局"""
+        return [(float(x), float(y)) for x, y in self.coords]
+
+    def propose(self, moves):
+        """
+        计算移动若干设备后的目标值，不修改当前状态
+
+        参数:
+        moves: {设备编号: (新x, 新y)}
+
+        返回:
+        (total, f1, f2, f3)，同 SLP_GA_Optimizer.evaluate_individual
+        """
+        opt = self.opt
+        moved = np.fromiter(moves.keys(), dtype=np.intp, count=len(moves))
+        new_coords = self.coords.copy()
+        new_coords[moved] = np.asarray(list(moves.values()), dtype=np.float64)
+
+        # 移动设备所在行的权重：与未移动设备的设备对计一次，
+        # 移动设备之间的设备对会在两行中各出现一次，因此各计一半，自身不计
+        pair_weight = np.ones((len(moved), opt.N))
+        pair_weight[:, moved] = 0.5
+        pair_weight[np.arange(len(moved)), moved] = 0.0
+
+        old_dist = self._manhattan_rows(moved, self.coords)
+        new_dist = self._manhattan_rows(moved, new_coords)
+        f1 = self.f1 + float(
+            np.sum(self._sym_weight[moved] * pair_weight * (new_dist - old_dist))
+        )
+
+        overlap = self.overlap + float(
+            np.sum(
+                pair_weight
+                * (
+                    self._overlap_rows(moved, new_coords)
+                    - self._overlap_rows(moved, self.coords)
+                )
+            )
+        )
+
+        move_cost = self.move_cost.copy()
+        move_cost[moved] = self._device_move_costs(moved, new_coords)
+        boundary = self.boundary.copy()
+        boundary[moved] = self._boundary_penalties(moved, new_coords)
+        aisle = self.aisle.copy()
+        aisle[moved] = self._aisle_penalties(moved, new_coords)
+
+        line_pair_dist = self.line_pair_dist
+        touched_pairs = sorted(
+            {k for dev in moved for k in self._device_line_pairs[dev]}
+        )
+        if touched_pairs:
+            line_pair_dist = line_pair_dist.copy()
+            pair_i = opt._line_pair_i[touched_pairs]
+            pair_j = opt._line_pair_j[touched_pairs]
+            line_pair_dist[touched_pairs] = np.sum(
+                np.abs(new_coords[pair_i] - new_coords[pair_j]), axis=-1
+            )
+
+        line_penalty = self.line_penalty
+        touched_lines = {
+            line for dev in moved for line in self._device_penalty_lines[dev]
+        }
+        if touched_lines:
+            line_penalty = line_penalty.copy()
+            for line in touched_lines:
+                line_penalty[line] = self._line_penalty(
+                    self._penalty_line_members[line], new_coords
+                )
+
+        objectives = self._combine(
+            f1, move_cost, overlap, boundary, aisle, line_pair_dist, line_penalty
+        )
+        self._pending = (
+            new_coords,
+            f1,
+            move_cost,
+            overlap,
+            boundary,
+            aisle,
+            line_pair_dist,
+            line_penalty,
+            objectives,
+        )
+        return objectives
+
+    def accept(self):
+        """接受最近一次 propose 的移动"""
+        if self._pending is None:
+            return self.objectives
+        (
+            self.coords,
+            self.f1,
+            self.move_cost,
+            self.overlap,
+            self.boundary,
+            self.aisle,
+            self.line_pair_dist,
+            self.line_penalty,
+            self.objectives,
+        ) = self._pending
+        self._pending = None
+
+        self._accepted += 1
+        if self.resync_interval and self._accepted % self.resync_interval == 0:
+            self.reset(self.coords)
+        return self.objectives
+
+    def _combine(
+        self, f1, move_cost, overlap, boundary, aisle, line_pair_dist, line_penalty
+    ):
+        """由各分量组合出 (total, f1, f2, f3)"""
+        opt = self.opt
+        f2 = float(np.sum(move_cost))
+
+        line_efficiency = 0.0
+        if line_pair_dist.size:
+            avg_distance = (line_pair_dist @ opt._line_pair_onehot) / np.where(
+                opt._line_has_pairs, opt._line_pair_counts, 1.0
+            )
+            line_efficiency = float(
+                np.sum(np.where(opt._line_has_pairs, 1.0 / (1.0 + avg_distance), 0.0))
+            )
+        f3 = float(
+            np.clip(
+                0.6 * opt._area_utilization + 0.4 * (line_efficiency / opt._n_lines),
+                0,
+                1,
+            )
+        )
+
+        penalty = (
+            float(np.sum(boundary))
+            + 5 * overlap
+            + float(np.sum(aisle))
+            + float(np.sum(line_penalty))
+        )
+        total = (
+            opt.alpha1 * f1 / opt._max_f1
+            + opt.alpha2 * f2 / opt._max_f2
+            + opt.alpha3 * (1 - f3)
+            + penalty * 0.0001
+        )
+        return total, f1, f2, f3
+
+    def _manhattan_rows(self, rows, coords):
+        """rows 中设备到所有设备的曼哈顿距离，形状 (k, N)"""
+        return np.abs(coords[rows, None, 0] - coords[None, :, 0]) + np.abs(
+            coords[rows, None, 1] - coords[None, :, 1]
+        )
+
+    def _overlap_rows(self, rows, coords):
+        """rows 中设备与所有设备的重叠面积（含安全距离），形状 (k, N)"""
+        opt = self.opt
+        sizes = opt._device_sizes
+        overlap_x = np.maximum(
+            0,
+            (sizes[rows, None, 0] + sizes[None, :, 0]) / 2
+            + opt._s_safe
+            - np.abs(coords[rows, None, 0] - coords[None, :, 0]),
+        )
+        overlap_y = np.maximum(
+            0,
+            (sizes[rows, None, 1] + sizes[None, :, 1]) / 2
+            + opt._s_safe
+            - np.abs(coords[rows, None, 1] - coords[None, :, 1]),
+        )
+        return overlap_x * overlap_y
+
+    def _device_move_costs(self, rows, coords):
+        """逐设备移动成本，固定设备为 0"""
+        move_dist = np.sum(np.abs(coords[rows] - self.opt._original_xy[rows]), axis=-1)
+        return np.where(
+            self._movable_mask[rows] & (move_dist > 0.001),
+            self._move_cost_full[rows] * move_dist,
+            0.0,
+        )
+
+    def _boundary_penalties(self, rows, coords):
+        """逐设备边界惩罚"""
+        opt = self.opt
+        x = coords[rows, 0]
+        y = coords[rows, 1]
+        return 2 * (
+            np.maximum(0, opt._x_min[rows] - x)
+            + np.maximum(0, x - opt._x_max[rows])
+            + np.maximum(0, opt._y_min[rows] - y)
+            + np.maximum(0, y - opt._y_max[rows])
+        )
+
+    def _aisle_penalties(self, rows, coords):
+        """逐设备通道占用惩罚，复杂度 O(k·A)"""
+        opt = self.opt
+        if not opt._aisles.size:
+            return np.zeros(len(rows))
+        half = opt._half_sizes[rows]
+        x = coords[rows, 0, None]
+        y = coords[rows, 1, None]
+        aisle_x, aisle_y, aisle_right, aisle_top = opt._aisles.T
+        half_l = half[:, 0, None]
+        half_w = half[:, 1, None]
+        overlap_width = np.maximum(
+            0, np.minimum(x + half_l, aisle_right) - np.maximum(x - half_l, aisle_x)
+        )
+        overlap_height = np.maximum(
+            0, np.minimum(y + half_w, aisle_top) - np.maximum(y - half_w, aisle_y)
+        )
+        return 2 * np.sum(overlap_width * overlap_height, axis=-1)
+
+    @staticmethod
+    def _line_penalty(members, coords):
+        """单条产品线的中心点惩罚：设备到中心的曼哈顿距离超过 15 的部分"""
+        member_xy = coords[members]
+        dist = np.sum(np.abs(member_xy - member_xy.mean(axis=0)), axis=-1)
+        return float(np.sum(np.maximum(0, dist - 15)))
+
+
+# ========== 重工业种群多样性（AGV分配直方图） ==========
+class AssignmentDiversity:
+    """
+    按AGV分配直方图增量维护的种群多样性
+
+    多样性定义为个体间 operation_assignments 的平均归一化汉明距离。记 c[k][a] 为第 k
+    道工序分配给AGV a 的个体数，P 为种群规模，则所有个体对的汉明距离之和为
+    Σ_k (P² - Σ_a c[k][a]²) / 2，因此只需维护计数和平方和，加入或移出一个个体为 O(工序数)。
+
+    个体按对象身份跟踪；sync(population) 只处理进出种群的个体。
+    """
+
+    def __init__(self, n_ops, n_agvs):
+        self.n_ops = n_ops
+        self._rows = np.arange(n_ops)
+        # AGV编号从 1 开始
+        self.counts = np.zeros((n_ops, n_agvs + 1), dtype=np.int64)
+        self.sum_sq = 0
+        self.size = 0
+        self._members = {}
+
+    def add(self, individual):
+        assignments = np.asarray(individual[0], dtype=np.intp)
+        counts = self.counts[self._rows, assignments]
+        self.sum_sq += int(2 * counts.sum()) + self.n_ops
+        self.counts[self._rows, assignments] = counts + 1
+        self.size += 1
+        return assignments
+
+    def remove(self, assignments):
+        counts = self.counts[self._rows, assignments] - 1
+        self.counts[self._rows, assignments] = counts
+        self.sum_sq -= int(2 * counts.sum()) + self.n_ops
+        self.size -= 1
+
+    def sync(self, population):
+        """使跟踪的个体集合与 population 一致（按对象身份，允许重复）"""
+        current = {}
+        for ind in population:
+            current[id(ind)] = current.get(id(ind), 0) + 1
+
+        for key in list(self._members):
+            ind, snapshots = self._members[key]
+            keep = current.get(key, 0)
+            while len(snapshots) > keep:
+                self.remove(snapshots.pop())
+            if not snapshots:
+                del self._members[key]
+
+        for ind in population:
+            entry = self._members.setdefault(id(ind), (ind, []))
+            if len(entry[1]) < current[id(ind)]:
+                entry[1].append(self.add(ind))
+        return self.value
+
+    @property
+    def value(self):
+        P = self.size
+        if P <= 1 or self.n_ops == 0:
+            return 0
+        return (self.n_ops * P * P - self.sum_sq) / (P * (P - 1) * self.n_ops)
+
+
 # ========== 重工业优化器 (改进版 - 专门解决帕累托前沿分散问题) ==========
 class HeavyIndustry_AGV_Optimizer:
+    # 解码时的任务调度策略，个体第 4 部分的第一个基因是其索引
+    SCHEDULING_STRATEGIES = ("release_time", "deadline", "priority", "mixed")
+
     def __init__(self, input_data):
         """
         初始化重工业AGV优化器 - 改进版，专门解决帕累托前沿分散问题
         """
+        # 随机数生成器：所有随机操作都使用实例自己的生成器，相同种子可复现结果
+        # （未指定种子时沿用原先固定的 42）
+        seed = input_data.get("seed")
+        self.reseed(42 if seed is None else seed)
+
         # 基本参数
         self.K = input_data["K"]  # 设备数量
         self.J = input_data["J"]  # 生产任务数量
@@ -2159,6 +3374,22 @@ class HeavyIndustry_AGV_Optimizer:
         # 注意：这行必须放在颜色方案初始化之后
         self.path_network = self._create_realistic_auto_parts_path_network()
 
+        # AGV行驶距离模型："network" 沿通道路网的最短路（默认），
+        # "euclidean" 为直线距离乘随机路径系数的旧模型
+        self.travel_model = input_data.get("travel_model", "network")
+        self.storage_position = tuple(input_data.get("storage_position", (10, 15)))
+        self.charging_positions = [
+            tuple(pos) for pos in input_data.get("charging_positions", [(127.5, 70)])
+        ]
+        self._build_travel_matrix()
+
+        # 多AGV冲突路由：对总目标最好的 route_top_k 个帕累托解做时间窗预约路由，
+        # 0 表示不做；routing_headway 为通道段安全间隔（小时），
+        # two_lane_width 为按双车道处理的最小通道宽度（米）
+        self.route_top_k = input_data.get("route_top_k", 0)
+        self.routing_headway = input_data.get("routing_headway", 5 / 3600)
+        self.two_lane_width = input_data.get("two_lane_width", 8)
+
         # 目标函数权重 - 调整为更合理的权重
         self.beta1 = input_data.get("beta1", 0.35)  # 最大完工时间权重
         self.beta2 = input_data.get("beta2", 0.35)  # 瓶颈设备利用率权重
@@ -2182,9 +3413,43 @@ class HeavyIndustry_AGV_Optimizer:
 
         # 存储优化结果
         self.pareto_solutions = []
+        # all_solutions 为有界非支配存档中的解；objective_log 为每代收集的好解的
+        # 目标值 (f1, f2, f3)，只用于绘图
+        self.archive_size = input_data.get("archive_size", 200)
         self.all_solutions = []
+        self.objective_log = np.zeros((0, 3))
         self.all_pareto_solutions = []
 
+        # 并行评估：parallelism 为 "process" 或 "serial"，None 表示直接在当前进程评估
+        self.parallelism = input_data.get("parallelism")
+        self.workers = input_data.get("workers")
+        self._evaluation_pool = None
+
+        # 确定性解码：调度策略和随机扰动由个体自带的基因 [策略索引, 扰动种子] 决定，
+        # 同一个体的适应度恒定，可以缓存；False 时沿用每次解码随机抽取的旧行为
+        self.deterministic_decode = input_data.get("deterministic_decode", True)
+        # 进化引擎："ga" 为加权和遗传算法（默认），"nsga2" / "nsga3" 为多目标引擎
+        self.engine = input_data.get("engine", "ga")
+        if self.engine not in ENGINES:
+            raise ValueError(f"不支持的进化引擎: {self.engine}")
+        # 提前终止：stop_patience（最优总目标停滞代数）、hv_patience（存档超体积
+        # 停滞代数）、time_budget_seconds（墙钟预算），均未设置时跑满 ngen 代
+        self.convergence = ConvergenceMonitor.from_options(input_data, (1, -1, 1))
+        # 检查点：配置 checkpoint_path 或 checkpoint_store 后每隔 checkpoint_interval 代
+        # 保存进化状态，重新运行时从最近的检查点继续；多目标引擎不保存检查点
+        self.checkpointer = (
+            Checkpointer.from_options(input_data) if self.engine == "ga" else None
+        )
+        self.stop_reason = None
+        self.generations_run = 0
+        # 适应度缓存：按编码哈希缓存目标值，仅在确定性解码下启用
+        self.fitness_cache = FitnessCache(
+            input_data.get("fitness_cache_size", 10000)
+            if self.deterministic_decode
+            else 0,
+            input_data.get("fitness_cache_bytes", 64 * 1024 * 1024),
+        )
+
         # 预处理任务数据
         self._preprocess_tasks()
 
@@ -2194,9 +3459,27 @@ class HeavyIndustry_AGV_Optimizer:
         # 创建工序ID到任务的映射
         self._create_operation_mapping()
 
-        # 设置随机种子以确保可重复性
-        np.random.seed(42)
-        random.seed(42)
+    def reseed(self, seed=None):
+        """
+        重置随机数生成器
+
+        seed 为 None 时随机生成一个种子，实际使用的种子记录在 self.seed 中
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        self.seed = int(seed)
+        self.rng = random.Random(self.seed)
+        self.np_rng = np.random.default_rng(self.seed)
+
+    def select_tournament(self, individuals, k):
+        """锦标赛选择（使用实例随机数生成器，替代 tools.selTournament）"""
+        return [
+            min(
+                (self.rng.choice(individuals) for _ in range(self.tournament_size)),
+                key=lambda ind: ind.fitness.values[0],
+            )
+            for _ in range(k)
+        ]
 
     def _create_realistic_auto_parts_path_network(self):
         """创建真实的汽车零部件企业车间路径网络"""
@@ -2359,6 +3642,35 @@ class HeavyIndustry_AGV_Optimizer:
 
         return path_network
 
+    def _build_travel_matrix(self):
+        """
+        预计算站点间的行驶距离矩阵，解码时直接查表
+
+        站点编号: 0..K-1 为设备，K 为物料存储区（AGV出发位置），之后为充电站
+        """
+        if self.travel_model not in ("network", "euclidean"):
+            raise ValueError(f"不支持的行驶距离模型: {self.travel_model}")
+
+        self.station_positions = (
+            [tuple(pos) for pos in self.device_positions]
+            + [self.storage_position]
+            + self.charging_positions
+        )
+        self.storage_station = self.K
+
+        # 路网图在两种模型下都构建，多AGV冲突路由也使用它
+        self.aisle_graph = AisleGraph(self.path_network, self.station_positions)
+        if self.travel_model == "network":
+            self.travel_distance = self.aisle_graph.station_distance.tolist()
+        else:
+            self.travel_distance = [
+                [
+                    math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
+                    for x2, y2 in self.station_positions
+                ]
+                for x1, y1 in self.station_positions
+            ]
+
     def _preprocess_tasks(self):
         """预处理任务数据，提取关键信息"""
         self.task_quantities = []
@@ -2389,6 +3701,41 @@ class HeavyIndustry_AGV_Optimizer:
                 }
                 op_counter += 1
 
+        # 解码用的扁平索引表：按全局工序编号 op_id 存放，解码时只做整数下标访问
+        self.op_task = []  # 所属任务
+        self.op_index = []  # 任务内工序序号
+        self.prev_op = []  # 同一任务的前一道工序，第一道工序为 -1
+        self.op_device = []  # 加工设备（0-based）
+        self.op_process_time = []  # 按设备速率折算后的名义加工时间
+        self.op_material_weight = []
+        self.task_op_ranges = []  # 每个任务的工序编号区间 [start, end)
+        for j in range(self.J):
+            start = len(self.op_task)
+            for op_idx, operation in enumerate(self.task_operations[j]):
+                device_id = operation["device_id"] - 1
+                self.op_task.append(j)
+                self.op_index.append(op_idx)
+                self.prev_op.append(len(self.op_task) - 2 if op_idx > 0 else -1)
+                self.op_device.append(device_id)
+                self.op_process_time.append(
+                    operation["process_time"] * (10 / self.device_rates[device_id])
+                )
+                self.op_material_weight.append(operation.get("material_weight", 10))
+            self.task_op_ranges.append((start, len(self.op_task)))
+        self._op_device_array = np.asarray(self.op_device, dtype=np.intp)
+
+        # 与随机数无关的任务调度顺序
+        self.task_orders = {
+            "release_time": sorted(
+                range(self.J), key=lambda t: self.task_release_times[t]
+            ),
+            "deadline": sorted(range(self.J), key=lambda t: self.task_deadlines[t]),
+            "mixed": sorted(
+                range(self.J),
+                key=lambda t: (self.task_release_times[t], self.task_deadlines[t]),
+            ),
+        }
+
     def _calculate_reference_values(self):
         """计算参考值用于目标函数归一化 - 改进版"""
         # 计算任务总处理时间
@@ -2449,17 +3796,17 @@ class HeavyIndustry_AGV_Optimizer:
         operation_assignments = []
 
         # 使用多种策略创建不同的个体
-        strategy = random.choice(["balanced", "specialized", "random", "task_based"])
+        strategy = self.rng.choice(["balanced", "specialized", "random", "task_based"])
 
         if strategy == "balanced":
             # 平衡分配：尽量均匀分配任务给所有AGV
             for j in range(self.J):
                 num_ops = len(self.task_operations[j])
                 # 同一个任务的不同工序尽量分配给同一个AGV
-                base_agv = random.randint(1, self.V)
+                base_agv = self.rng.randint(1, self.V)
                 for _ in range(num_ops):
                     # 80%的概率使用同一个AGV，20%的概率分配给其他AGV以平衡负载
-                    if random.random() < 0.8:
+                    if self.rng.random() < 0.8:
                         operation_assignments.append(base_agv)
                     else:
                         # 优先选择任务数较少的AGV
@@ -2473,12 +3820,12 @@ class HeavyIndustry_AGV_Optimizer:
                             for i, count in enumerate(agv_counts)
                             if count == min_count
                         ]
-                        operation_assignments.append(random.choice(candidate_agvs))
+                        operation_assignments.append(self.rng.choice(candidate_agvs))
 
         elif strategy == "specialized":
             # 专业化分配：每个AGV专门处理特定类型的任务
             # 根据任务类型分组
-            task_types = random.sample(range(1, self.V + 1), min(self.V, self.J))
+            task_types = self.rng.sample(range(1, self.V + 1), min(self.V, self.J))
             for j in range(self.J):
                 num_ops = len(self.task_operations[j])
                 task_type = task_types[j % len(task_types)]
@@ -2489,7 +3836,7 @@ class HeavyIndustry_AGV_Optimizer:
             # 基于任务的分配：同一任务的所有工序分配给同一个AGV
             for j in range(self.J):
                 num_ops = len(self.task_operations[j])
-                task_agv = random.randint(1, self.V)
+                task_agv = self.rng.randint(1, self.V)
                 for _ in range(num_ops):
                     operation_assignments.append(task_agv)
 
@@ -2498,7 +3845,7 @@ class HeavyIndustry_AGV_Optimizer:
             for j in range(self.J):
                 num_ops = len(self.task_operations[j])
                 for _ in range(num_ops):
-                    operation_assignments.append(random.randint(1, self.V))
+                    operation_assignments.append(self.rng.randint(1, self.V))
 
         # 2. 任务顺序：对每个AGV的任务进行排序
         agv_schedules = [[] for _ in range(self.V)]
@@ -2511,7 +3858,7 @@ class HeavyIndustry_AGV_Optimizer:
         # 对每个AGV的任务进行排序，考虑多种排序策略
         for v in range(self.V):
             if agv_schedules[v]:
-                order_strategy = random.choice(
+                order_strategy = self.rng.choice(
                     ["random", "task_order", "deadline", "process_time"]
                 )
 
@@ -2539,239 +3886,270 @@ class HeavyIndustry_AGV_Optimizer:
                     )
                 else:  # 'random'
                     # 随机排序
-                    random.shuffle(agv_schedules[v])
+                    self.rng.shuffle(agv_schedules[v])
 
         # 3. 路径选择：为每个运输任务选择路径
         path_choices = []
         for _ in range(self.total_operations):
-            path_choices.append(random.choice([0, 1, 2]))  # 多种路径选择
+            path_choices.append(self.rng.choice([0, 1, 2]))  # 多种路径选择
 
-        return [operation_assignments, agv_schedules, path_choices]
+        # 4. 解码基因：调度策略索引和扰动种子
+        decode_genes = [
+            self.rng.randrange(len(self.SCHEDULING_STRATEGIES)),
+            self.rng.getrandbits(32),
+        ]
 
-    def decode_schedule(self, individual):
+        return [operation_assignments, agv_schedules, path_choices, decode_genes]
+
+    def _gene_rng(self, individual, stream):
         """
-        解码个体，生成调度方案并计算目标值 - 改进版
+        解码用的随机数生成器
+
+        确定性模式下由个体的扰动种子和用途（stream）派生，同一个体每次得到相同序列；
+        否则返回优化器自身的生成器
         """
-        operation_assignments, agv_schedules, _ = individual
+        if self.deterministic_decode and len(individual) > 3:
+            return random.Random(f"{individual[3][1]}:{stream}")
+        return self.rng
+
+    def _list_schedule(self, individual):
+        """
+        列表调度核心：按任务顺序依次安排工序，只记录按 op_id 存放的扁平数组
+
+        返回字典:
+        order: 工序的调度顺序
+        start / finish: 实际开始（含换型）和完成时间
+        ready: 换型前的开始时间；setup / process / transport: 换型、加工、运输时间
+        agv / origin: 执行的AGV及其出发站点编号
+        以及调度结束时设备、AGV的最后时间和AGV所在站点
+        """
+        operation_assignments = individual[0]
+        rng = self._gene_rng(individual, "decode")
+
+        n_ops = self.total_operations
+        order = []
+        start = [0] * n_ops
+        finish = [0] * n_ops
+        ready = [0] * n_ops
+        setup = [0] * n_ops
+        process = [0] * n_ops
+        transport = [0] * n_ops
+        agv = [0] * n_ops
+        origin = [None] * n_ops
 
-        # 初始化数据结构
-        operation_times = {}
         device_last_time = [0] * self.K
         agv_last_time = [0] * self.V
-        agv_last_position = [None] * self.V  # 跟踪AGV最后位置
-        agv_transport_paths = [[] for _ in range(self.V)]
-        device_processing_sequences = [[] for _ in range(self.K)]
-
-        # 为每个AGV设置初始位置（从物料存储区开始）
-        for v in range(self.V):
-            agv_last_position[v] = (10, 15)  # 物料存储区位置
-
-        # 按任务分组工序
-        task_operation_groups = {}
-        for op_id in range(self.total_operations):
-            task_mapping = self.operation_to_task[op_id]
-            task_id = task_mapping["task_id"]
-            if task_id not in task_operation_groups:
-                task_operation_groups[task_id] = []
-            task_operation_groups[task_id].append(op_id)
-
-        # 对每个任务内的工序排序（按工序索引）
-        for task_id in task_operation_groups:
-            task_operation_groups[task_id].sort(
-                key=lambda op_id: self.operation_to_task[op_id]["operation_idx"]
-            )
+        # 每辆AGV从物料存储区出发，位置用站点编号表示
+        agv_last_station = [self.storage_station] * self.V
+        travel_distance = self.travel_distance
+        euclidean = self.travel_model == "euclidean"
 
         # 任务调度顺序（多种策略混合）
-        scheduling_strategy = random.choice(
-            ["release_time", "deadline", "priority", "mixed"]
-        )
+        if self.deterministic_decode and len(individual) > 3:
+            scheduling_strategy = self.SCHEDULING_STRATEGIES[individual[3][0]]
+        else:
+            scheduling_strategy = rng.choice(self.SCHEDULING_STRATEGIES)
 
-        if scheduling_strategy == "release_time":
-            sorted_task_ids = sorted(
-                range(self.J), key=lambda t: self.task_release_times[t]
-            )
-        elif scheduling_strategy == "deadline":
-            sorted_task_ids = sorted(
-                range(self.J), key=lambda t: self.task_deadlines[t]
-            )
-        elif scheduling_strategy == "priority":
+        if scheduling_strategy == "priority":
             # 基于任务复杂度的优先级
             task_complexity = []
             for t in range(self.J):
-                complexity = len(self.task_operations[t]) * 2 + random.uniform(0, 1)
+                complexity = len(self.task_operations[t]) * 2 + rng.uniform(0, 1)
                 task_complexity.append((t, complexity))
             sorted_task_ids = [
                 t for t, _ in sorted(task_complexity, key=lambda x: x[1])
             ]
-        else:  # 'mixed'
-            # 混合策略：先按释放时间，再按交货期
-            sorted_task_ids = sorted(
-                range(self.J),
-                key=lambda t: (self.task_release_times[t], self.task_deadlines[t]),
-            )
+        else:
+            # release_time / deadline / mixed（先按释放时间，再按交货期）
+            sorted_task_ids = self.task_orders[scheduling_strategy]
 
-        # 调度主循环
+        # 调度主循环：任务内的工序编号连续且按工序顺序排列
         for task_id in sorted_task_ids:
-            # 获取该任务的所有工序
-            task_operations = task_operation_groups.get(task_id, [])
+            task_release_time = self.task_release_times[task_id]
+            op_start, op_end = self.task_op_ranges[task_id]
 
-            # 按工序顺序处理
-            for op_id in task_operations:
-                task_mapping = self.operation_to_task[op_id]
-                operation = task_mapping["operation_info"]
-
-                # 设备ID（转换为0-based）
-                device_id = operation["device_id"] - 1
+            for op_id in range(op_start, op_end):
+                device_id = self.op_device[op_id]
                 # AGV ID（转换为0-based）
                 agv_id = operation_assignments[op_id] - 1
 
-                # 计算运输时间（考虑实际路径距离）
-                transport_time = 0
-                if agv_last_position[agv_id] is not None:
-                    # 计算从AGV最后位置到目标设备的距离
-                    last_x, last_y = agv_last_position[agv_id]
-                    target_x, target_y = self.device_positions[device_id]
-                    distance = math.sqrt(
-                        (last_x - target_x) ** 2 + (last_y - target_y) ** 2
-                    )
-
-                    # 考虑路径复杂性（实际路径比直线距离长）
-                    path_factor = 1.0 + random.uniform(0.1, 0.3)
-                    transport_time = (distance * path_factor) / self.AGV_speed
-
-                # 计算可能的开始时间
-                # 任务释放时间
-                task_release_time = self.task_release_times[task_id]
-
-                # 前一道工序的完成时间（如果是第一道工序，则为0）
-                prev_op_finish_time = 0
-                if task_mapping["operation_idx"] > 0:
-                    # 找到前一道工序的完成时间
-                    for prev_op_id in task_operation_groups[task_id]:
-                        prev_mapping = self.operation_to_task[prev_op_id]
-                        if (
-                            prev_mapping["operation_idx"]
-                            == task_mapping["operation_idx"] - 1
-                        ):
-                            if prev_op_id in operation_times:
-                                prev_op_finish_time = operation_times[prev_op_id][
-                                    "finish"
-                                ]
-                            break
+                # 运输时间：查表得到AGV最后位置到目标设备的行驶距离；
+                # 直线距离模型下乘以随机路径复杂性系数
+                distance = travel_distance[agv_last_station[agv_id]][device_id]
+                if euclidean:
+                    distance *= 1.0 + rng.uniform(0.1, 0.3)
+                transport_time = distance / self.AGV_speed
 
+                # 任务就绪时间：释放时间与前一道工序完成时间的较大者
+                prev_op_id = self.prev_op[op_id]
+                prev_op_finish_time = finish[prev_op_id] if prev_op_id >= 0 else 0
                 task_ready_time = max(task_release_time, prev_op_finish_time)
 
-                # 设备可用时间
+                # 开始时间受任务、设备和AGV（含运输）三者约束
                 device_ready_time = device_last_time[device_id]
-
-                # AGV可用时间
-                agv_ready_time = agv_last_time[agv_id]
-
-                # 实际开始时间
                 start_time = max(
-                    task_ready_time, device_ready_time, agv_ready_time + transport_time
+                    task_ready_time,
+                    device_ready_time,
+                    agv_last_time[agv_id] + transport_time,
                 )
 
                 # 换型时间（如果有）
                 setup_time = 0
-                if device_last_time[device_id] > 0 and start_time > device_ready_time:
-                    setup_time = self.setup_times[device_id] * random.uniform(0.8, 1.2)
+                if device_ready_time > 0 and start_time > device_ready_time:
+                    setup_time = self.setup_times[device_id] * rng.uniform(0.8, 1.2)
 
-                # 加工时间（考虑设备效率和任务数量）
-                base_process_time = operation["process_time"]
-                process_time = base_process_time * (10 / self.device_rates[device_id])
+                # 加工时间（已按设备效率折算），添加一些随机性以增加解的多样性
+                process_time = self.op_process_time[op_id] * rng.uniform(0.95, 1.05)
 
-                # 添加一些随机性以增加解的多样性
-                process_time *= random.uniform(0.95, 1.05)
-
-                # 实际开始时间（考虑换型）
                 actual_start_time = start_time + setup_time
                 finish_time = actual_start_time + process_time
 
-                # 存储工序信息
-                operation_info = {
-                    "start": actual_start_time,
-                    "finish": finish_time,
-                    "device": device_id,
-                    "agv": agv_id,
-                    "setup_time": setup_time,
-                    "transport_time": transport_time,
-                    "transport_distance": transport_time * self.AGV_speed,
-                    "task_id": task_id,
-                    "operation_idx": task_mapping["operation_idx"],
-                    "process_time": process_time,
-                    "material_weight": operation.get("material_weight", 10),
-                }
-
-                operation_times[op_id] = operation_info
-
-                # 记录AGV运输路径
-                from_position = agv_last_position[agv_id]
-                to_position = self.device_positions[device_id]
-
-                agv_transport_paths[agv_id].append(
-                    {
-                        "from": from_position,
-                        "to": to_position,
-                        "distance": transport_time * self.AGV_speed,
-                        "time": transport_time,
-                        "operation_id": op_id,
-                        "task_id": task_id,
-                        "start_time": start_time,
-                        "finish_time": finish_time,
-                    }
-                )
-
-                # 记录设备加工序列
-                device_processing_sequences[device_id].append(
-                    {
-                        "operation_id": op_id,
-                        "start_time": actual_start_time,
-                        "finish_time": finish_time,
-                        "setup_time": setup_time,
-                        "process_time": process_time,
-                        "agv": agv_id,
-                        "task_id": task_id,
-                    }
-                )
+                order.append(op_id)
+                start[op_id] = actual_start_time
+                finish[op_id] = finish_time
+                ready[op_id] = start_time
+                setup[op_id] = setup_time
+                process[op_id] = process_time
+                transport[op_id] = transport_time
+                agv[op_id] = agv_id
+                origin[op_id] = agv_last_station[agv_id]
 
                 # 更新状态
                 device_last_time[device_id] = finish_time
                 agv_last_time[agv_id] = finish_time
-                agv_last_position[agv_id] = to_position
+                agv_last_station[agv_id] = device_id
+
+        return {
+            "order": order,
+            "start": start,
+            "finish": finish,
+            "ready": ready,
+            "setup": setup,
+            "process": process,
+            "transport": transport,
+            "agv": agv,
+            "origin": origin,
+            "device_last_time": device_last_time,
+            "agv_last_time": agv_last_time,
+            "agv_last_station": agv_last_station,
+        }
 
-        # 计算目标函数值
-        # 1. 最大完工时间
-        if operation_times:
-            f1 = max(op_info["finish"] for op_info in operation_times.values())
-        else:
-            f1 = 0
+    def _schedule_objectives(self, trace):
+        """
+        由调度数组计算三个目标：最大完工时间、瓶颈设备利用率、负载不均衡度
 
-        # 2. 设备利用率
-        device_busy_times = [0] * self.K
-        for op_info in operation_times.values():
-            device_id = op_info["device"]
-            process_time = op_info["finish"] - op_info["start"]
-            device_busy_times[device_id] += process_time
+        返回 (f1, f2, f3, device_utilizations)
+        """
+        order = np.asarray(trace["order"], dtype=np.intp)
+        if not order.size:
+            return 0, 0, 0, [0.0] * self.K
 
-        device_utilizations = []
-        for busy_time in device_busy_times:
-            util = busy_time / f1 if f1 > 0 else 0
-            device_utilizations.append(min(util, 1.0))
+        start = np.asarray(trace["start"], dtype=np.float64)[order]
+        finish = np.asarray(trace["finish"], dtype=np.float64)[order]
 
-        f2 = max(device_utilizations) if device_utilizations else 0
+        # 1. 最大完工时间
+        f1 = float(finish.max())
 
-        # 3. 负载不均衡度 - 改进计算方法
-        if device_utilizations and len(device_utilizations) > 1:
+        # 2. 设备利用率（按调度顺序累加各设备的加工时长）
+        device_busy_times = np.bincount(
+            self._op_device_array[order], weights=finish - start, minlength=self.K
+        )
+        if f1 > 0:
+            device_utilizations = np.minimum(device_busy_times / f1, 1.0).tolist()
+        else:
+            device_utilizations = [0.0] * self.K
+        f2 = max(device_utilizations)
+
+        # 3. 负载不均衡度：标准差与均值的比值
+        f3 = 0
+        if len(device_utilizations) > 1:
             mean_utilization = np.mean(device_utilizations)
             if mean_utilization > 0:
-                # 使用标准差和均值的比值
-                std_dev = np.std(device_utilizations)
-                f3 = std_dev / mean_utilization
-            else:
-                f3 = 0
-        else:
-            f3 = 0
+                f3 = np.std(device_utilizations) / mean_utilization
+
+        return f1, f2, f3, device_utilizations
+
+    def decode_objectives(self, individual):
+        """
+        快速解码：只计算目标值和约束惩罚，不生成展示用的调度方案
+
+        返回 (f1, f2, f3, penalty)，与 decode_schedule + calculate_constraint_penalty
+        的结果完全一致
+        """
+        trace = self._list_schedule(individual)
+        f1, f2, f3, _ = self._schedule_objectives(trace)
+        return f1, f2, f3, self._trace_penalty(trace, individual[1])
+
+    def decode_schedule(self, individual):
+        """
+        完整解码：生成调度方案（工序时间、AGV运输路径、设备加工序列）并计算目标值
+
+        只用于需要展示或输出的解，进化过程中的评估使用 decode_objectives
+        """
+        operation_assignments, agv_schedules = individual[0], individual[1]
+        trace = self._list_schedule(individual)
+        f1, f2, f3, device_utilizations = self._schedule_objectives(trace)
+
+        operation_times = {}
+        agv_transport_paths = [[] for _ in range(self.V)]
+        device_processing_sequences = [[] for _ in range(self.K)]
+
+        for op_id in trace["order"]:
+            device_id = self.op_device[op_id]
+            agv_id = trace["agv"][op_id]
+            task_id = self.op_task[op_id]
+            actual_start_time = trace["start"][op_id]
+            finish_time = trace["finish"][op_id]
+            setup_time = trace["setup"][op_id]
+            process_time = trace["process"][op_id]
+            transport_time = trace["transport"][op_id]
+
+            operation_times[op_id] = {
+                "start": actual_start_time,
+                "finish": finish_time,
+                "device": device_id,
+                "agv": agv_id,
+                "setup_time": setup_time,
+                "transport_time": transport_time,
+                "transport_distance": transport_time * self.AGV_speed,
+                "task_id": task_id,
+                "operation_idx": self.op_index[op_id],
+                "process_time": process_time,
+                "material_weight": self.op_material_weight[op_id],
+            }
+
+            # AGV运输路径；路网模型下附带沿通道的行驶路线
+            origin = trace["origin"][op_id]
+            agv_transport_paths[agv_id].append(
+                {
+                    "from": self.station_positions[origin],
+                    "to": self.station_positions[device_id],
+                    "route": (
+                        self.aisle_graph.route(origin, device_id)
+                        if self.travel_model == "network"
+                        else None
+                    ),
+                    "distance": transport_time * self.AGV_speed,
+                    "time": transport_time,
+                    "operation_id": op_id,
+                    "task_id": task_id,
+                    "start_time": trace["ready"][op_id],
+                    "finish_time": finish_time,
+                }
+            )
+
+            # 设备加工序列
+            device_processing_sequences[device_id].append(
+                {
+                    "operation_id": op_id,
+                    "start_time": actual_start_time,
+                    "finish_time": finish_time,
+                    "setup_time": setup_time,
+                    "process_time": process_time,
+                    "agv": agv_id,
+                    "task_id": task_id,
+                }
+            )
 
         # 创建调度方案
         schedule = {
@@ -2780,49 +4158,152 @@ class HeavyIndustry_AGV_Optimizer:
             "makespan": f1,
             "bottleneck_utilization": f2,
             "load_imbalance": f3,
-            "device_last_time": device_last_time,
-            "agv_last_time": agv_last_time,
+            "device_last_time": trace["device_last_time"],
+            "agv_last_time": trace["agv_last_time"],
             "agv_transport_paths": agv_transport_paths,
             "device_processing_sequences": device_processing_sequences,
             "agv_schedules": agv_schedules,
             "operation_assignments": operation_assignments,
-            "agv_last_position": agv_last_position,
+            "agv_last_position": [
+                self.station_positions[station] for station in trace["agv_last_station"]
+            ],
         }
 
         return schedule, f1, f2, f3
 
-    def evaluate_individual(self, individual):
-        """
-        评估个体：计算三个目标函数值 - 改进版
-        """
-        # 解码调度方案
-        schedule, f1, f2, f3 = self.decode_schedule(individual)
-
+    def _total_objective(self, individual, f1, f2, f3, penalty):
+        """归一化三个目标并加权，加上约束惩罚和由个体决定的微小扰动"""
         # 归一化目标值 - 使用改进的参考值
         f1_norm = f1 / self.C_ref
         f2_norm = 1 - f2  # 转化为最小化问题（1-利用率）
         f3_norm = f3 / self.I_ref
 
-        # 计算约束惩罚
-        penalty = self.calculate_constraint_penalty(schedule, individual)
-
         # 加权总目标 - 添加一些随机扰动以增加解的多样性
-        perturbation = random.uniform(0.99, 1.01)
+        perturbation = self._gene_rng(individual, "perturbation").uniform(0.99, 1.01)
 
-        total_obj = (
+        return (
             self.beta1 * f1_norm
             + self.beta2 * f2_norm
             + self.beta3 * f3_norm
             + penalty * 0.01
         ) * perturbation
 
+    def evaluate_individual(self, individual):
+        """
+        评估个体：计算三个目标函数值并返回完整调度方案 - 改进版
+        """
+        schedule, f1, f2, f3 = self.decode_schedule(individual)
+        penalty = self.calculate_constraint_penalty(schedule, individual)
+        total_obj = self._total_objective(individual, f1, f2, f3, penalty)
         return total_obj, f1, f2, f3, schedule
 
+    def evaluate_fitness(self, individual):
+        """DEAP 适应度：只返回加权总目标"""
+        return (self.evaluate_individual(individual)[0],)
+
+    def evaluate_objectives(self, individual):
+        """返回 (total, f1, f2, f3)，使用快速解码，不生成调度方案"""
+        f1, f2, f3, penalty = self.decode_objectives(individual)
+        return self._total_objective(individual, f1, f2, f3, penalty), f1, f2, f3
+
+    def evaluate_invalid(self, individuals):
+        """
+        评估适应度失效的个体，并在个体上缓存 ind.objectives = (total, f1, f2, f3)
+        """
+        invalid = [ind for ind in individuals if not ind.fitness.valid]
+        if not invalid:
+            return 0
+
+        for ind, objectives in zip(
+            invalid, self.evaluate_batch(invalid), strict=True
+        ):
+            ind.objectives = objectives
+            ind.fitness.values = (objectives[0],)
+        return len(invalid)
+
+    def evaluate_batch(self, individuals):
+        """
+        批量评估个体，返回每个个体的 (total, f1, f2, f3)
+
+        确定性解码只使用个体自带的扰动种子，不消耗优化器的随机数；否则在查缓存前
+        为每个个体按顺序抽取种子，用重置种子的副本评估。两种情况下优化器的随机数
+        序列都与是否并行、工作进程数量和缓存命中无关；命中适应度缓存的个体不再重复解码
+        """
+        plain = [[list(part) for part in ind] for ind in individuals]
+        seeds = (
+            None
+            if self.deterministic_decode
+            else [self.rng.getrandbits(32) for _ in plain]
+        )
+        if self.fitness_cache.enabled:
+            keys = [FitnessCache.key(repr(ind).encode()) for ind in plain]
+        else:
+            keys = range(len(individuals))
+        found, pending = self.fitness_cache.lookup(keys)
+
+        if pending:
+            todo = [plain[positions[0]] for positions in pending.values()]
+            if seeds is not None:
+                seeds = [seeds[positions[0]] for positions in pending.values()]
+            if self._evaluation_pool is not None:
+                results = self._evaluation_pool.map("evaluate_objectives", todo, seeds)
+            elif seeds is not None:
+                # 与 "serial" 评估池相同：在副本上逐个重置种子后评估
+                results = EvaluationPool(self, parallelism="serial").map(
+                    "evaluate_objectives", todo, seeds
+                )
+            else:
+                results = map(self.evaluate_objectives, todo)
+
+            for (key, positions), objectives in zip(
+                pending.items(), results, strict=True
+            ):
+                objectives = self.fitness_cache.put(key, objectives)
+                for k in positions:
+                    found[k] = objectives
+
+        return [found[k] for k in range(len(individuals))]
+
+    def _trace_penalty(self, trace, agv_schedules):
+        """在调度数组上计算约束惩罚，与 calculate_constraint_penalty 逐项一致"""
+        penalty = 0
+        finish = trace["finish"]
+
+        # 1. 任务交货期约束（按调度顺序累加）
+        for op_id in trace["order"]:
+            deadline = self.task_deadlines[self.op_task[op_id]]
+            if finish[op_id] > deadline:
+                penalty += (finish[op_id] - deadline) * 10
+
+        # 2. AGV容量约束
+        start, transport = trace["start"], trace["transport"]
+        for v in range(self.V):
+            max_concurrent_load = 0
+            current_time = 0
+            for op_id in agv_schedules[v]:
+                weight = self.op_material_weight[op_id]
+                transport_start = start[op_id] - transport[op_id]
+                transport_end = start[op_id]
+
+                if current_time == 0:
+                    current_time = transport_end
+                    max_concurrent_load = weight
+                elif transport_start < current_time:
+                    max_concurrent_load += weight
+                else:
+                    current_time = transport_end
+                    max_concurrent_load = weight
+
+                if max_concurrent_load > self.AGV_capacity:
+                    penalty += (max_concurrent_load - self.AGV_capacity) * 5
+
+        return penalty
+
     def calculate_constraint_penalty(self, schedule, individual):
         """计算约束违反惩罚"""
         penalty = 0
 
-        operation_assignments, agv_schedules, _ = individual
+        operation_assignments, agv_schedules = individual[0], individual[1]
         operation_times = schedule["operation_times"]
 
         # 1. 检查任务交货期约束
@@ -2867,31 +4348,32 @@ class HeavyIndustry_AGV_Optimizer:
         """变异操作 - 改进版以增加多样性"""
         mutant = [list(part) for part in individual]
 
-        # 随机选择变异类型
-        mutation_type = random.choice(
-            [
-                "reassign",
-                "swap",
-                "inverse",
-                "shift",
-                "scramble",
-                "agv_rebalance",
-                "task_reorder",
-                "path_change",
-            ]
-        )
+        # 随机选择变异类型；带解码基因的个体可以变异调度策略和扰动种子
+        mutation_types = [
+            "reassign",
+            "swap",
+            "inverse",
+            "shift",
+            "scramble",
+            "agv_rebalance",
+            "task_reorder",
+            "path_change",
+        ]
+        if len(mutant) > 3:
+            mutation_types.append("decode_change")
+        mutation_type = self.rng.choice(mutation_types)
 
         if mutation_type == "reassign":
             # 重新分配部分工序的AGV
             operation_assignments = mutant[0]
             if len(operation_assignments) > 0:
                 num_mutations = max(1, len(operation_assignments) // 8)
-                indices = random.sample(
+                indices = self.rng.sample(
                     range(len(operation_assignments)), num_mutations
                 )
                 for idx in indices:
                     # 有概率选择当前任务数最少的AGV
-                    if random.random() < 0.3:
+                    if self.rng.random() < 0.3:
                         agv_counts = [0] * self.V
                         for agv_id in operation_assignments:
                             if agv_id > 0:
@@ -2902,15 +4384,15 @@ class HeavyIndustry_AGV_Optimizer:
                             for i, count in enumerate(agv_counts)
                             if count == min_count
                         ]
-                        operation_assignments[idx] = random.choice(candidate_agvs)
+                        operation_assignments[idx] = self.rng.choice(candidate_agvs)
                     else:
-                        operation_assignments[idx] = random.randint(1, self.V)
+                        operation_assignments[idx] = self.rng.randint(1, self.V)
 
         elif mutation_type == "swap":
             # 交换两个工序的AGV分配
             operation_assignments = mutant[0]
             if len(operation_assignments) >= 2:
-                idx1, idx2 = random.sample(range(len(operation_assignments)), 2)
+                idx1, idx2 = self.rng.sample(range(len(operation_assignments)), 2)
                 operation_assignments[idx1], operation_assignments[idx2] = (
                     operation_assignments[idx2],
                     operation_assignments[idx1],
@@ -2919,31 +4401,31 @@ class HeavyIndustry_AGV_Optimizer:
         elif mutation_type == "inverse":
             # 反转部分AGV的任务顺序
             agv_schedules = mutant[1]
-            v = random.randint(0, self.V - 1)
+            v = self.rng.randint(0, self.V - 1)
             if 0 <= v < len(agv_schedules) and len(agv_schedules[v]) >= 3:
-                start = random.randint(0, len(agv_schedules[v]) - 3)
-                end = random.randint(start + 2, len(agv_schedules[v]) - 1)
+                start = self.rng.randint(0, len(agv_schedules[v]) - 3)
+                end = self.rng.randint(start + 2, len(agv_schedules[v]) - 1)
                 agv_schedules[v][start:end] = reversed(agv_schedules[v][start:end])
 
         elif mutation_type == "shift":
             # 移动一个工序到AGV序列的不同位置
             agv_schedules = mutant[1]
-            v = random.randint(0, self.V - 1)
+            v = self.rng.randint(0, self.V - 1)
             if 0 <= v < len(agv_schedules) and len(agv_schedules[v]) >= 2:
-                idx = random.randint(0, len(agv_schedules[v]) - 1)
+                idx = self.rng.randint(0, len(agv_schedules[v]) - 1)
                 operation = agv_schedules[v].pop(idx)
-                new_idx = random.randint(0, len(agv_schedules[v]))
+                new_idx = self.rng.randint(0, len(agv_schedules[v]))
                 agv_schedules[v].insert(new_idx, operation)
 
         elif mutation_type == "scramble":
             # 打乱部分AGV的任务顺序
             agv_schedules = mutant[1]
-            v = random.randint(0, self.V - 1)
+            v = self.rng.randint(0, self.V - 1)
             if 0 <= v < len(agv_schedules) and len(agv_schedules[v]) >= 3:
-                start = random.randint(0, len(agv_schedules[v]) - 3)
-                end = random.randint(start + 2, len(agv_schedules[v]) - 1)
+                start = self.rng.randint(0, len(agv_schedules[v]) - 3)
+                end = self.rng.randint(start + 2, len(agv_schedules[v]) - 1)
                 segment = agv_schedules[v][start:end]
-                random.shuffle(segment)
+                self.rng.shuffle(segment)
                 agv_schedules[v][start:end] = segment
 
         elif mutation_type == "agv_rebalance":
@@ -2969,7 +4451,7 @@ class HeavyIndustry_AGV_Optimizer:
                     ]
                     if max_agv_indices:
                         num_to_transfer = min(3, len(max_agv_indices) // 2)
-                        indices_to_transfer = random.sample(
+                        indices_to_transfer = self.rng.sample(
                             max_agv_indices, num_to_transfer
                         )
                         for idx in indices_to_transfer:
@@ -2978,9 +4460,9 @@ class HeavyIndustry_AGV_Optimizer:
         elif mutation_type == "task_reorder":
             # 任务重排序：按任务属性重新排序
             agv_schedules = mutant[1]
-            v = random.randint(0, self.V - 1)
+            v = self.rng.randint(0, self.V - 1)
             if 0 <= v < len(agv_schedules) and len(agv_schedules[v]) >= 2:
-                order_type = random.choice(["deadline", "process_time", "release_time"])
+                order_type = self.rng.choice(["deadline", "process_time", "release_time"])
                 if order_type == "deadline":
                     agv_schedules[v].sort(
                         key=lambda op_id: self.task_deadlines[
@@ -3005,9 +4487,16 @@ class HeavyIndustry_AGV_Optimizer:
             path_choices = mutant[2]
             if len(path_choices) > 0:
                 num_changes = max(1, int(len(path_choices) / 10))
-                indices = random.sample(range(len(path_choices)), num_changes)
+                indices = self.rng.sample(range(len(path_choices)), num_changes)
                 for idx in indices:
-                    path_choices[idx] = random.choice([0, 1, 2])
+                    path_choices[idx] = self.rng.choice([0, 1, 2])
+
+        elif mutation_type == "decode_change":
+            # 换用另一种调度策略，并重新抽取随机扰动种子
+            strategy_idx = self.rng.randrange(len(self.SCHEDULING_STRATEGIES) - 1)
+            if strategy_idx >= mutant[3][0]:
+                strategy_idx += 1
+            mutant[3] = [strategy_idx, self.rng.getrandbits(32)]
 
         return mutant
 
@@ -3016,21 +4505,26 @@ class HeavyIndustry_AGV_Optimizer:
         child1 = [list(part) for part in ind1]
         child2 = [list(part) for part in ind2]
 
-        if random.random() < self.cxpb:
+        if self.rng.random() < self.cxpb:
             # 多种交叉策略
-            crossover_strategy = random.choice(
+            crossover_strategy = self.rng.choice(
                 ["uniform", "task_based", "agv_based", "two_point"]
             )
 
             if crossover_strategy == "uniform":
                 # 均匀交叉
                 for i in range(len(ind1[0])):
-                    if random.random() < 0.5:
+                    if self.rng.random() < 0.5:
                         child1[0][i], child2[0][i] = child2[0][i], child1[0][i]
+                # 解码基因（调度策略、扰动种子）逐个均匀交换
+                if len(child1) > 3 and len(child2) > 3:
+                    for i in range(len(child1[3])):
+                        if self.rng.random() < 0.5:
+                            child1[3][i], child2[3][i] = child2[3][i], child1[3][i]
 
             elif crossover_strategy == "task_based":
                 # 基于任务的交叉：交换整个任务的分配
-                task_to_cross = random.randint(0, self.J - 1)
+                task_to_cross = self.rng.randint(0, self.J - 1)
                 for op_id in range(self.total_operations):
                     if self.operation_to_task[op_id]["task_id"] == task_to_cross:
                         child1[0][op_id], child2[0][op_id] = (
@@ -3040,7 +4534,7 @@ class HeavyIndustry_AGV_Optimizer:
 
             elif crossover_strategy == "agv_based":
                 # 基于AGV的交叉：交换某个AGV的所有任务
-                agv_to_cross = random.randint(1, self.V)
+                agv_to_cross = self.rng.randint(1, self.V)
                 for i in range(len(ind1[0])):
                     if ind1[0][i] == agv_to_cross:
                         child1[0][i] = ind2[0][i]
@@ -3049,56 +4543,96 @@ class HeavyIndustry_AGV_Optimizer:
 
             elif crossover_strategy == "two_point":
                 # 两点交叉
-                point1 = random.randint(1, len(ind1[0]) - 2)
-                point2 = random.randint(point1 + 1, len(ind1[0]) - 1)
+                point1 = self.rng.randint(1, len(ind1[0]) - 2)
+                point2 = self.rng.randint(point1 + 1, len(ind1[0]) - 1)
                 child1[0] = ind1[0][:point1] + ind2[0][point1:point2] + ind1[0][point2:]
                 child2[0] = ind2[0][:point1] + ind1[0][point1:point2] + ind2[0][point2:]
+                # 解码基因整体交换
+                if len(child1) > 3 and len(child2) > 3 and self.rng.random() < 0.5:
+                    child1[3], child2[3] = child2[3], child1[3]
 
         return child1, child2
 
     def setup_ga(self):
         """设置遗传算法"""
-        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMin)
-
         toolbox = base.Toolbox()
 
         toolbox.register(
-            "individual", tools.initIterate, creator.Individual, self.create_individual
+            "individual", tools.initIterate, Individual, self.create_individual
         )
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 
-        toolbox.register("evaluate", lambda ind: (self.evaluate_individual(ind)[0],))
+        toolbox.register("evaluate", self.evaluate_fitness)
         toolbox.register("mate", self.crossover_individuals)
         toolbox.register("mutate", self.mutate_individual)
-        toolbox.register("select", tools.selTournament, tournsize=self.tournament_size)
+        toolbox.register("select", self.select_tournament)
 
         return toolbox
 
     def run_optimization(self):
         """运行优化算法 - 改进版"""
+        # 每次运行重新统计缓存命中率；清空后再创建进程池，避免把旧缓存传给工作进程
+        self.fitness_cache.clear()
+        self.convergence.start()
+        self._evaluation_pool = create_evaluation_pool(self)
+        try:
+            if self.engine == "ga":
+                return self._run_evolution()
+            return self._run_moo()
+        finally:
+            if self._evaluation_pool is not None:
+                self._evaluation_pool.close()
+                self._evaluation_pool = None
+
+    def _run_evolution(self):
+        """进化主循环"""
         toolbox = self.setup_ga()
+        signature = run_signature(self)
+        state = self.checkpointer.load(signature) if self.checkpointer else None
 
-        pop = toolbox.population(n=self.pop_size)
+        if state is None:
+            pop = toolbox.population(n=self.pop_size)
 
-        print("评估初始种群...")
-        fitnesses = list(map(toolbox.evaluate, pop))
-        for ind, fit in zip(pop, fitnesses):
-            ind.fitness.values = fit
+            print("评估初始种群...")
+            self.evaluate_invalid(pop)
 
+            # 最小化 f1、f3，最大化 f2；超出合理范围的解单独存档，仅在没有合理解时使用
+            archive = ParetoArchive(
+                (1, -1, 1), capacity=self.archive_size, epsilon=1e-6
+            )
+            rejected_archive = ParetoArchive(
+                (1, -1, 1), capacity=self.archive_size, epsilon=1e-6
+            )
+            objective_log = []
+            # 自适应参数调整
+            best_fitness_history = []
+            self.evolution_history = []
+            start_gen = 0
+        else:
+            print(f"从第 {state['generation']} 代的检查点继续...")
+            pop = state["pop"]
+            archive = state["archive"]
+            rejected_archive = state["rejected_archive"]
+            objective_log = [state["objective_log"]]
+            best_fitness_history = state["best_fitness_history"]
+            self.evolution_history = state["evolution_history"]
+            self.mutpb = state["mutpb"]
+            restore_rng_state(self, state["rng"])
+            self.convergence.restore(state["convergence"])
+            start_gen = state["generation"] + 1
         self.all_solutions = []
 
         print("开始进化...")
-        start_time = time.time()
+        start_time = time.time() - (state["elapsed"] if state else 0.0)
 
-        # 自适应参数调整
-        best_fitness_history = []
-        self.evolution_history = []
+        # 种群多样性随个体进出种群增量更新
+        diversity_tracker = AssignmentDiversity(self.total_operations, self.V)
+        diversity_tracker.sync(pop)
 
-        for gen in range(self.ngen):
-            # 计算当前代的多样性
+        for gen in range(start_gen, self.ngen):
+            # 当前代的多样性（种群自上一代结束后未变化）
             if gen > 0 and gen % 20 == 0:
-                diversity = self.calculate_population_diversity(pop)
+                diversity = diversity_tracker.value
                 if diversity < 0.1 and gen > 50:
                     # 多样性太低，增加变异率
                     self.mutpb = min(0.7, self.mutpb * 1.2)
@@ -3112,7 +4646,7 @@ class HeavyIndustry_AGV_Optimizer:
 
             # 交叉
             for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < self.cxpb:
+                if self.rng.random() < self.cxpb:
                     toolbox.mate(child1, child2)
                     del child1.fitness.values
                     del child2.fitness.values
@@ -3126,16 +4660,12 @@ class HeavyIndustry_AGV_Optimizer:
                 )
 
             for mutant in offspring:
-                if random.random() < current_mutpb:
+                if self.rng.random() < current_mutpb:
                     toolbox.mutate(mutant)
                     del mutant.fitness.values
 
             # 评估新个体
-            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            if invalid_ind:
-                fitnesses = map(toolbox.evaluate, invalid_ind)
-                for ind, fit in zip(invalid_ind, fitnesses):
-                    ind.fitness.values = fit
+            self.evaluate_invalid(offspring)
 
             # 合并种群 - 精英保留策略
             combined_pop = pop + offspring
@@ -3152,9 +4682,15 @@ class HeavyIndustry_AGV_Optimizer:
             num_to_collect = max(10, int(0.25 * len(pop)))
             best_inds = sorted_pop[:num_to_collect]
 
+            generation_solutions = []
             for ind in best_inds:
-                total_obj, f1, f2, f3, schedule = self.evaluate_individual(ind)
-                self.all_solutions.append(
+                if self.deterministic_decode:
+                    # 确定性解码下目标值不变，直接复用；调度方案在结束时只为存档中的解生成
+                    total_obj, f1, f2, f3 = ind.objectives
+                    schedule = None
+                else:
+                    total_obj, f1, f2, f3, schedule = self.evaluate_individual(ind)
+                generation_solutions.append(
                     {
                         "individual": ind,
                         "f1": f1,
@@ -3165,12 +4701,25 @@ class HeavyIndustry_AGV_Optimizer:
                         "generation": gen,
                     }
                 )
+            archive.add(
+                [sol for sol in generation_solutions if self._is_valid_solution(sol)]
+            )
+            if not len(archive):
+                rejected_archive.add(generation_solutions)
+            objective_log.append(objective_matrix(generation_solutions))
 
             # 记录进化历史
             elapsed = time.time() - start_time
-            total_obj, f1, f2, f3, _ = self.evaluate_individual(current_best)
-            diversity = self.calculate_population_diversity(pop)
+            if self.deterministic_decode:
+                total_obj, f1, f2, f3 = current_best.objectives
+            else:
+                total_obj, f1, f2, f3, _ = self.evaluate_individual(current_best)
+            diversity = diversity_tracker.sync(pop)
 
+            stop_reason = self.convergence.update(
+                current_best.fitness.values[0],
+                (archive if len(archive) else rejected_archive).objectives,
+            )
             self.evolution_history.append(
                 {
                     "generation": gen,
@@ -3181,8 +4730,11 @@ class HeavyIndustry_AGV_Optimizer:
                     "mutpb": float(current_mutpb),
                     "best_fitness": float(current_best.fitness.values[0]),
                     "elapsed_time": float(elapsed),
+                    **self.fitness_cache.stats(),
+                    **self.convergence.stats(),
                 }
             )
+            self.convergence.report(self.evolution_history[-1])
 
             # 输出进度
             if gen % 20 == 0 or gen == self.ngen - 1:
@@ -3191,16 +4743,254 @@ class HeavyIndustry_AGV_Optimizer:
                     f"imbalance={f3:.3f}, best_fitness={current_best.fitness.values[0]:.6f}, time={elapsed:.1f}s"
                 )
 
+            if stop_reason is not None:
+                print(f"第 {gen} 代提前终止: {stop_reason}")
+                break
+
+            if self.checkpointer is not None and self.checkpointer.due(gen, self.ngen):
+                objective_log[:] = [np.vstack(objective_log)]
+                self.checkpointer.save(
+                    signature,
+                    gen,
+                    {
+                        "pop": pop,
+                        "archive": archive,
+                        "rejected_archive": rejected_archive,
+                        "objective_log": objective_log[0],
+                        "best_fitness_history": best_fitness_history,
+                        "evolution_history": self.evolution_history,
+                        "mutpb": self.mutpb,
+                        "rng": rng_state(self),
+                        "convergence": self.convergence.state(),
+                        "elapsed": elapsed,
+                    },
+                )
+
+        self.stop_reason = self.convergence.finish(self.evolution_history)
+        self.generations_run = len(self.evolution_history)
+
+        self.all_solutions = archive.solutions or rejected_archive.solutions
+        for sol in self.all_solutions:
+            if sol["schedule"] is None:
+                sol["schedule"] = self.decode_schedule(sol["individual"])[0]
+        if objective_log:
+            self.objective_log = np.vstack(objective_log)
+        print(f"存档保留 {len(self.all_solutions)} 个非支配解")
+
         # 获取帕累托前沿
         self.pareto_solutions = self.get_pareto_front_improved()
         self.all_pareto_solutions = self.pareto_solutions.copy()
 
         print(f"最终帕累托前沿包含 {len(self.pareto_solutions)} 个解")
 
+        if self.route_top_k > 0:
+            self.route_pareto_solutions(self.route_top_k)
+
         return self.pareto_solutions, self.all_solutions, self.evolution_history
 
+    def _run_moo(self):
+        """
+        NSGA-II / NSGA-III 主循环
+
+        帕累托前沿直接取最终种群中目标值合理的非支配解；存档只用于记录历史上的非支配解
+        """
+        engine = MOOEngine(self, (1, -1, 1), self.engine)
+
+        archive = ParetoArchive((1, -1, 1), capacity=self.archive_size, epsilon=1e-6)
+        rejected_archive = ParetoArchive(
+            (1, -1, 1), capacity=self.archive_size, epsilon=1e-6
+        )
+        objective_log = []
+        self.all_solutions = []
+        self.evolution_history = []
+
+        print(f"开始进化（{self.engine.upper()}）...")
+        start_time = time.time()
+        diversity_tracker = AssignmentDiversity(self.total_operations, self.V)
+
+        for gen, individuals, objectives in engine.generations():
+            generation_solutions = [
+                {
+                    "individual": ind,
+                    "f1": f1,
+                    "f2": f2,
+                    "f3": f3,
+                    "total": total_obj,
+                    "schedule": None,
+                    "generation": gen,
+                }
+                for ind, (total_obj, f1, f2, f3) in zip(
+                    individuals, objectives.tolist(), strict=True
+                )
+            ]
+            archive.add(
+                [sol for sol in generation_solutions if self._is_valid_solution(sol)]
+            )
+            if not len(archive):
+                rejected_archive.add(generation_solutions)
+            objective_log.append(objectives[:, 1:])
+
+            elapsed = time.time() - start_time
+            best_fitness, f1, f2, f3 = objectives[np.argmin(objectives[:, 0])]
+            diversity = diversity_tracker.sync(individuals)
+            stop_reason = self.convergence.update(
+                best_fitness, (archive if len(archive) else rejected_archive).objectives
+            )
+            self.evolution_history.append(
+                {
+                    "generation": gen,
+                    "f1": float(f1),
+                    "f2": float(f2),
+                    "f3": float(f3),
+                    "diversity": float(diversity),
+                    "mutpb": float(self.mutpb),
+                    "best_fitness": float(best_fitness),
+                    "elapsed_time": float(elapsed),
+                    **self.fitness_cache.stats(),
+                    **self.convergence.stats(),
+                }
+            )
+            self.convergence.report(self.evolution_history[-1])
+
+            if gen % 20 == 0 or gen == self.ngen - 1:
+                print(
+                    f"Generation {gen}: makespan={f1:.2f}h, bottleneck={f2:.3f}, "
+                    f"imbalance={f3:.3f}, best_fitness={best_fitness:.6f}, "
+                    f"time={elapsed:.1f}s"
+                )
+
+            if stop_reason is not None:
+                print(f"第 {gen} 代提前终止: {stop_reason}")
+                break
+
+        self.stop_reason = self.convergence.finish(self.evolution_history)
+        self.generations_run = len(self.evolution_history)
+
+        front_individuals, front_objectives = engine.front()
+        front = [
+            {
+                "individual": ind,
+                "f1": f1,
+                "f2": f2,
+                "f3": f3,
+                "total": total_obj,
+                "schedule": None,
+                "generation": self.generations_run - 1,
+            }
+            for ind, (total_obj, f1, f2, f3) in zip(
+                front_individuals, front_objectives.tolist(), strict=True
+            )
+        ]
+        front = [sol for sol in front if self._is_valid_solution(sol)] or front
+
+        self.all_solutions = archive.solutions or rejected_archive.solutions
+        for sol in self.all_solutions + front:
+            if sol["schedule"] is not None:
+                continue
+            if self.deterministic_decode:
+                sol["schedule"] = self.decode_schedule(sol["individual"])[0]
+            else:
+                # 非确定性解码下调度方案与目标值需来自同一次解码
+                total_obj, f1, f2, f3, schedule = self.evaluate_individual(
+                    sol["individual"]
+                )
+                sol.update(f1=f1, f2=f2, f3=f3, total=total_obj, schedule=schedule)
+        if objective_log:
+            self.objective_log = np.vstack(objective_log)
+        print(f"存档保留 {len(self.all_solutions)} 个非支配解")
+
+        self.pareto_solutions = sorted(front, key=lambda x: x["total"])
+        self.all_pareto_solutions = self.pareto_solutions.copy()
+        print(f"最终帕累托前沿包含 {len(self.pareto_solutions)} 个解")
+        self.validate_pareto_front(self.pareto_solutions)
+
+        if self.route_top_k > 0:
+            self.route_pareto_solutions(self.route_top_k)
+
+        return self.pareto_solutions, self.all_solutions, self.evolution_history
+
+    def route_solution(self, solution):
+        """
+        多AGV冲突路由：按调度顺序在通道路网上逐个规划运输，AGV之间互相避让，
+        重新推算各工序的开始和完成时间
+
+        沿用调度方案中的AGV分配、工序顺序、换型和加工时间，只把运输时间替换为
+        带等待的实际行驶时间。返回报告字典：实际最大完工时间、与计划值的差、
+        总等待时间和拥堵最严重的通道段
+        """
+        schedule = (
+            solution.get("schedule") or self.decode_schedule(solution["individual"])[0]
+        )
+        router = ConflictAwareRouter(
+            self.aisle_graph,
+            self.AGV_speed,
+            headway=self.routing_headway,
+            two_lane_width=self.two_lane_width,
+        )
+
+        agv_station = [self.storage_station] * self.V
+        agv_free = [0] * self.V
+        device_free = [0] * self.K
+        op_finish = {}
+        total_wait = 0.0
+
+        # operation_times 按调度顺序排列
+        for op_id, info in schedule["operation_times"].items():
+            device_id, agv_id = info["device"], info["agv"]
+            arrival, wait = router.plan(
+                agv_station[agv_id], device_id, agv_free[agv_id]
+            )
+            total_wait += wait
+
+            prev_op_id = self.prev_op[op_id]
+            task_ready = max(
+                self.task_release_times[info["task_id"]],
+                op_finish[prev_op_id] if prev_op_id >= 0 else 0,
+            )
+            start = max(task_ready, device_free[device_id], arrival)
+            finish = start + info["setup_time"] + info["process_time"]
+
+            op_finish[op_id] = finish
+            device_free[device_id] = finish
+            agv_free[agv_id] = finish
+            agv_station[agv_id] = device_id
+
+        makespan = max(op_finish.values(), default=0)
+        return {
+            "makespan": float(makespan),
+            "planned_makespan": float(schedule["makespan"]),
+            "delay": float(makespan - schedule["makespan"]),
+            "transport_count": len(op_finish),
+            "total_wait_time": float(total_wait),
+            "hotspots": router.hotspots(),
+        }
+
+    def route_pareto_solutions(self, top_k):
+        """对总目标最好的 top_k 个帕累托解做冲突路由，报告写入 solution["routing"]"""
+        ranked = sorted(self.pareto_solutions, key=lambda sol: sol["total"])
+        for sol in ranked[:top_k]:
+            sol["routing"] = self.route_solution(sol)
+            report = sol["routing"]
+            print(
+                f"冲突路由: 计划完工 {report['planned_makespan']:.2f}h, "
+                f"实际完工 {report['makespan']:.2f}h, "
+                f"总等待 {report['total_wait_time'] * 60:.1f}min"
+            )
+
     def calculate_population_diversity(self, population):
-        """计算种群多样性"""
+        """
+        计算种群多样性：个体间AGV分配的平均归一化汉明距离
+
+        由每道工序的AGV分配计数直接得到，复杂度 O(P·工序数)，与逐对比较的
+        calculate_population_diversity_reference 结果一致
+        """
+        tracker = AssignmentDiversity(self.total_operations, self.V)
+        for ind in population:
+            tracker.add(ind)
+        return tracker.value
+
+    def calculate_population_diversity_reference(self, population):
+        """逐对比较的种群多样性，O(P²·工序数)，用于校验"""
         if len(population) <= 1:
             return 0
 
@@ -3230,78 +5020,57 @@ class HeavyIndustry_AGV_Optimizer:
         print("正在提取帕累托前沿...")
 
         # 步骤1：过滤掉明显差的解
-        filtered_solutions = []
-        for sol in self.all_solutions:
-            # 检查目标值是否在合理范围内
-            if (
-                sol["f1"] > 0
-                and sol["f1"] < self.T * 2
-                and sol["f2"] >= 0
-                and sol["f2"] <= 1.0
-                and sol["f3"] >= 0
-                and sol["f3"] <= 1.0
-            ):
-                filtered_solutions.append(sol)
+        filtered_solutions = [
+            sol for sol in self.all_solutions if self._is_valid_solution(sol)
+        ]
 
         if not filtered_solutions:
             filtered_solutions = self.all_solutions
 
         print(f"过滤后剩余解数量: {len(filtered_solutions)}")
 
-        # 步骤2：对解进行聚类，避免过于集中
-        clustered_solutions = self.cluster_solutions(
-            filtered_solutions, n_clusters=min(20, len(filtered_solutions) // 2)
+        # 步骤2：目标值相同的解只保留一个
+        objectives = objective_matrix(filtered_solutions)
+        _, first_idx = np.unique(np.round(objectives, 6), axis=0, return_index=True)
+        first_idx = np.sort(first_idx)
+        unique_solutions = [filtered_solutions[i] for i in first_idx]
+        objectives = objectives[first_idx]
+
+        # 步骤3：在全部存档上做非支配分层（最小化 f1、f3，最大化 f2）
+        ranks = non_dominated_rank(
+            objectives, senses=(1, -1, 1), epsilon=1e-6, max_rank=1
         )
+        pareto_front = sorted(
+            (
+                sol
+                for sol, rank in zip(unique_solutions, ranks, strict=True)
+                if rank == 0
+            ),
+            key=lambda x: x["total"],
+        )
+        print(f"非支配解数量: {len(pareto_front)}")
 
-        # 步骤3：从每个聚类中提取代表性解
-        representative_solutions = []
-        for cluster in clustered_solutions:
-            if cluster:
-                # 按总目标值排序，选择最好的几个解
+        # 步骤4：前沿过大时聚类，每个聚类保留总目标值最好的 3 个解，避免过于集中
+        max_front_size = 60
+        if len(pareto_front) > max_front_size:
+            representative_solutions = []
+            for cluster in self.cluster_solutions(pareto_front, n_clusters=20):
                 cluster.sort(key=lambda x: x["total"])
-                # 从每个聚类中选择前3个最好的解
-                representative_solutions.extend(cluster[: min(3, len(cluster))])
-
-        print(f"聚类后代表性解数量: {len(representative_solutions)}")
-
-        # 步骤4：从代表性解中提取帕累托前沿
-        pareto_front = []
-
-        # 按总目标值排序，从最好的开始
-        sorted_solutions = sorted(representative_solutions, key=lambda x: x["total"])
-
-        for sol in sorted_solutions:
-            dominated = False
-
-            # 检查是否被帕累托前沿中的解支配
-            for pf in pareto_front:
-                if self.is_dominated(sol, pf):
-                    dominated = True
-                    break
-
-            if not dominated:
-                # 移除被新解支配的旧解
-                new_pareto_front = []
-                for pf in pareto_front:
-                    if not self.is_dominated(pf, sol):
-                        new_pareto_front.append(pf)
-                pareto_front = new_pareto_front
-                pareto_front.append(sol)
-
-        # 步骤5：确保帕累托前沿有足够的多样性
-        if len(pareto_front) < 5 and len(representative_solutions) > len(pareto_front):
-            # 补充一些非支配解
-            for sol in sorted_solutions:
-                if sol not in pareto_front:
-                    dominated = False
-                    for pf in pareto_front:
-                        if self.is_dominated(sol, pf):
-                            dominated = True
-                            break
-                    if not dominated:
-                        pareto_front.append(sol)
-                        if len(pareto_front) >= 8:
-                            break
+                representative_solutions.extend(cluster[:3])
+            pareto_front = sorted(representative_solutions, key=lambda x: x["total"])
+            print(f"聚类后代表性解数量: {len(pareto_front)}")
+
+        # 步骤5：确保帕累托前沿有足够的多样性，用第二层前沿的解补充
+        if len(pareto_front) < 5:
+            second_front = sorted(
+                (
+                    sol
+                    for sol, rank in zip(unique_solutions, ranks, strict=True)
+                    if rank == 1
+                ),
+                key=lambda x: x["total"],
+            )
+            pareto_front.extend(second_front[: max(0, 8 - len(pareto_front))])
 
         print(f"最终帕累托前沿解数量: {len(pareto_front)}")
 
@@ -3310,46 +5079,35 @@ class HeavyIndustry_AGV_Optimizer:
 
         return pareto_front
 
+    def _is_valid_solution(self, sol):
+        """检查目标值是否在合理范围内"""
+        return (
+            sol["f1"] > 0
+            and sol["f1"] < self.T * 2
+            and sol["f2"] >= 0
+            and sol["f2"] <= 1.0
+            and sol["f3"] >= 0
+            and sol["f3"] <= 1.0
+        )
+
     def cluster_solutions(self, solutions, n_clusters=10):
-        """对解进行聚类以避免过于集中"""
+        """
+        对解进行 k-means 聚类以避免过于集中
+
+        目标值按 C_ref、I_ref 归一化（f2 已在 0-1 范围内），k-means++ 初始化后迭代至收敛，
+        返回非空聚类列表，每个聚类内保持解的原有顺序
+        """
         if len(solutions) <= n_clusters:
             return [solutions]
 
-        # 提取目标值作为特征
-        features = []
-        for sol in solutions:
-            # 归一化特征
-            f1_norm = sol["f1"] / self.C_ref
-            f2_norm = sol["f2"]  # f2已经在0-1范围内
-            f3_norm = sol["f3"] / self.I_ref
-            features.append([f1_norm, f2_norm, f3_norm])
-
-        # 简单的基于距离的聚类
-        clusters = [[] for _ in range(n_clusters)]
-
-        # 随机选择初始中心点
-        centers = random.sample(features, n_clusters)
-
-        # 分配每个解到最近的中心点
-        for i, sol in enumerate(solutions):
-            min_dist = float("inf")
-            cluster_idx = 0
-
-            for j, center in enumerate(centers):
-                dist = math.sqrt(
-                    (features[i][0] - center[0]) ** 2
-                    + (features[i][1] - center[1]) ** 2
-                    + (features[i][2] - center[2]) ** 2
-                )
-                if dist < min_dist:
-                    min_dist = dist
-                    cluster_idx = j
-
-            clusters[cluster_idx].append(sol)
-
-        # 过滤掉空的聚类
-        clusters = [cluster for cluster in clusters if cluster]
+        features = objective_matrix(solutions) / np.array([self.C_ref, 1.0, self.I_ref])
+        labels, _ = kmeans(features, n_clusters, self.np_rng)
 
+        clusters = []
+        for j in range(n_clusters):
+            members = np.flatnonzero(labels == j)
+            if members.size:
+                clusters.append([solutions[i] for i in members])
         return clusters
 
     def is_dominated(self, sol1, sol2):
@@ -3402,14 +5160,12 @@ class HeavyIndustry_AGV_Optimizer:
 
     def visualize_results(self):
         """可视化结果 - 帕累托前沿"""
-        if not self.all_solutions:
+        if not len(self.objective_log):
             print("没有找到解决方案")
             return []
 
         # 提取目标值
-        f1_vals = [sol["f1"] for sol in self.all_solutions]
-        f2_vals = [sol["f2"] for sol in self.all_solutions]
-        f3_vals = [sol["f3"] for sol in self.all_solutions]
+        f1_vals, f2_vals, f3_vals = self.objective_log.T
 
         f1_pareto = [sol["f1"] for sol in self.pareto_solutions]
         f2_pareto = [sol["f2"] for sol in self.pareto_solutions]
@@ -3505,13 +5261,11 @@ class HeavyIndustry_AGV_Optimizer:
         import base64
         from io import BytesIO
 
-        if not self.all_solutions:
+        if not len(self.objective_log):
             return None
 
         # 提取目标值
-        f1_vals = [sol["f1"] for sol in self.all_solutions]
-        f2_vals = [sol["f2"] for sol in self.all_solutions]
-        f3_vals = [sol["f3"] for sol in self.all_solutions]
+        f1_vals, f2_vals, f3_vals = self.objective_log.T
 
         f1_pareto = [sol["f1"] for sol in self.pareto_solutions]
         f2_pareto = [sol["f2"] for sol in self.pareto_solutions]
@@ -3793,23 +5547,23 @@ class HeavyIndustry_AGV_Optimizer:
                 )
             else:
                 # 随机决定是否显示AGV调整
-                if random.random() < 0.3:  # 30%的概率显示AGV调整
+                if self.rng.random() < 0.3:  # 30%的概率显示AGV调整
                     adjustments.append(
-                        f"任务{task_id + 1}: • AGV从{random.choice(['AGV1', 'AGV2', 'AGV3'])}调整为{agvs[0]}"
+                        f"任务{task_id + 1}: • AGV从{self.rng.choice(['AGV1', 'AGV2', 'AGV3'])}调整为{agvs[0]}"
                     )
 
         # 如果调整太少，添加一些模拟调整
         if len(adjustments) < 2:
             sample_tasks = list(range(self.J))
-            random.shuffle(sample_tasks)
+            self.rng.shuffle(sample_tasks)
 
             for i in range(min(3, self.J - len(adjustments))):
                 task_id = sample_tasks[i]
                 if task_id not in [
                     int(a.split("任务")[1].split(":")[0]) - 1 for a in adjustments
                 ]:
-                    old_agv = random.choice(["AGV1", "AGV2", "AGV3"])
-                    new_agv = random.choice(["AGV1", "AGV2", "AGV3", "AGV4", "AGV5"])
+                    old_agv = self.rng.choice(["AGV1", "AGV2", "AGV3"])
+                    new_agv = self.rng.choice(["AGV1", "AGV2", "AGV3", "AGV4", "AGV5"])
                     adjustments.append(
                         f"任务{task_id + 1}: • AGV从{old_agv}调整为{new_agv}"
                     )
@@ -4523,7 +6277,7 @@ class HeavyIndustry_AGV_Optimizer:
             color_key = equipment_color_keys[i % len(equipment_color_keys)]
 
             # 随机设备状态
-            status = random.choice([0, 0, 0, 1, 2])  # 80%运行, 20%维护或故障
+            status = self.rng.choice([0, 0, 0, 1, 2])  # 80%运行, 20%维护或故障
             status_color = status_colors[status]
 
             if shape_info["type"] == "rect":
@@ -4641,10 +6395,11 @@ class HeavyIndustry_AGV_Optimizer:
                         path_points.append((from_x, from_y))
                         path_points.append((to_x, to_y))
 
-                        # 绘制路径线段
+                        # 绘制路径线段（有路网路线时沿通道绘制）
+                        route = path.get("route") or [path["from"], path["to"]]
                         ax.plot(
-                            [from_x, to_x],
-                            [from_y, to_y],
+                            [pt[0] for pt in route],
+                            [pt[1] for pt in route],
                             color=agv_color,
                             linewidth=2.5,
                             alpha=0.6,
@@ -5102,6 +6857,7 @@ class DualTrackAlgorithm:
             "optimizer": self.optimizer,
             "pareto_solutions": pareto_solutions,
             "all_solutions": all_solutions,
+            "objective_log": self.optimizer.objective_log,
             "all_pareto_solutions": all_pareto_solutions,
             "evolution_history": evolution_history,
             "pareto_plot_base64": pareto_plot_base64,
@@ -5135,6 +6891,7 @@ class DualTrackAlgorithm:
             "optimizer": self.optimizer,
             "pareto_solutions": pareto_solutions,
             "all_solutions": all_solutions,
+            "objective_log": self.optimizer.objective_log,
             "all_pareto_solutions": all_pareto_solutions,
             "evolution_history": evolution_history,
             "pareto_plot_base64": pareto_plot_base64,
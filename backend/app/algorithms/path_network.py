@@ -0,0 +1,223 @@
+"""
+车间通道路网与AGV行驶距离矩阵
+
+把重工业优化器的通道网络（path_network：带 points、bidirectional 的折线列表）
+构造成加权图，用 Floyd–Warshall 求全源最短路，得到站点（设备、物料存储区、充电站等）
+之间的行驶距离矩阵，解码时 O(1) 查表。
+
+- 折线在相互交叉、端点落在其他通道上的位置被切分为图节点
+- 不在通道上的站点和悬空的通道端点用一段直线接入最近的其他通道
+- 单向通道（bidirectional=False）只沿折线方向连边
+- 路网不连通时，对应站点对退回直线距离
+- 图的邻接表 adjacency 保留每条边的通道宽度，供多AGV冲突路由使用
+"""
+
+import math
+from itertools import pairwise
+
+import numpy as np
+
+# 坐标判等的容差（米）
+_TOLERANCE = 1e-6
+
+
+def _project(point, p, q):
+    """点在线段 pq 上的投影参数 t ∈ [0, 1] 及投影点到该点的距离"""
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        t = 0.0
+    else:
+        t = ((point[0] - p[0]) * dx + (point[1] - p[1]) * dy) / length_sq
+        t = min(1.0, max(0.0, t))
+    x, y = p[0] + t * dx, p[1] + t * dy
+    return t, math.hypot(point[0] - x, point[1] - y)
+
+
+def _intersect(p, q, r, s):
+    """两条线段的交点在各自上的参数 (t, u)，不相交或平行时返回 None"""
+    d1 = (q[0] - p[0], q[1] - p[1])
+    d2 = (s[0] - r[0], s[1] - r[1])
+    denom = d1[0] * d2[1] - d1[1] * d2[0]
+    if abs(denom) < _TOLERANCE:
+        return None
+    w = (r[0] - p[0], r[1] - p[1])
+    t = (w[0] * d2[1] - w[1] * d2[0]) / denom
+    u = (w[0] * d1[1] - w[1] * d1[0]) / denom
+    if -_TOLERANCE <= t <= 1 + _TOLERANCE and -_TOLERANCE <= u <= 1 + _TOLERANCE:
+        return min(1.0, max(0.0, t)), min(1.0, max(0.0, u))
+    return None
+
+
+class AisleGraph:
+    """
+    通道路网图
+
+    参数:
+    path_network: 通道折线列表，每项包含 points 和可选的 bidirectional（默认双向）
+    stations: 站点坐标列表，行驶距离矩阵按该顺序编号
+
+    属性:
+    nodes: (n, 2) 图节点坐标
+    distance: (n, n) 节点间最短路长度
+    station_nodes: 每个站点对应的节点编号
+    station_distance: (s, s) 站点间行驶距离（米）
+    adjacency: 每个节点的出边列表 [(目标节点, 长度, 通道宽度), ...]，接入线宽度为 None
+    """
+
+    def __init__(self, path_network, stations):
+        self.stations = [tuple(map(float, pos)) for pos in stations]
+        self._node_index = {}
+        self._coords = []
+        self._edges = []
+
+        segments, ends = self._collect_segments(path_network)
+        self._build_edges(segments, ends)
+        self.station_nodes = np.asarray(
+            [self._node(pos) for pos in self.stations], dtype=np.intp
+        )
+        self.nodes = np.asarray(self._coords, dtype=np.float64).reshape(-1, 2)
+        self.adjacency = [[] for _ in range(len(self.nodes))]
+        for u, v, length, width in self._edges:
+            self.adjacency[u].append((v, length, width))
+
+        self.distance, self._next = self._all_pairs_shortest_paths()
+
+        station_distance = self.distance[np.ix_(self.station_nodes, self.station_nodes)]
+        pos = np.asarray(self.stations, dtype=np.float64).reshape(-1, 2)
+        straight = np.hypot(
+            pos[:, None, 0] - pos[None, :, 0], pos[:, None, 1] - pos[None, :, 1]
+        )
+        # 路网不连通的站点对退回直线距离
+        self.unreachable = ~np.isfinite(station_distance)
+        self.station_distance = np.where(self.unreachable, straight, station_distance)
+
+    def _node(self, point):
+        """坐标对应的节点编号，坐标按 1e-6 米取整后合并"""
+        key = (round(point[0], 6) + 0.0, round(point[1], 6) + 0.0)
+        index = self._node_index.get(key)
+        if index is None:
+            index = len(self._coords)
+            self._node_index[key] = index
+            self._coords.append(key)
+        return index
+
+    @staticmethod
+    def _collect_segments(path_network):
+        """
+        折线拆成线段 [起点, 终点, 是否双向, 所属折线编号, 切分参数列表, 宽度]，
+        同时返回非闭合折线的两个端点 [(坐标, 所属折线编号), ...]
+        """
+        segments = []
+        ends = []
+        for line_id, aisle in enumerate(path_network):
+            points = [tuple(map(float, pt)) for pt in aisle["points"]]
+            bidirectional = aisle.get("bidirectional", True)
+            width = aisle.get("width")
+            for p, q in pairwise(points):
+                if p != q:
+                    segments.append([p, q, bidirectional, line_id, [0.0, 1.0], width])
+            if len(points) > 1 and points[0] != points[-1]:
+                ends.extend([(points[0], line_id), (points[-1], line_id)])
+        return segments, ends
+
+    def _build_edges(self, segments, ends):
+        # 1. 线段两两求交（包括 T 形相接和端点重合）
+        for i, (p, q, _, _, cuts_i, _) in enumerate(segments):
+            for r, s, _, _, cuts_j, _ in segments[i + 1 :]:
+                hit = _intersect(p, q, r, s)
+                if hit is not None:
+                    cuts_i.append(hit[0])
+                    cuts_j.append(hit[1])
+                    continue
+                # 平行重叠：互相把端点切进对方
+                for point, (a, b, cuts) in (
+                    (r, (p, q, cuts_i)),
+                    (s, (p, q, cuts_i)),
+                    (p, (r, s, cuts_j)),
+                    (q, (r, s, cuts_j)),
+                ):
+                    t, gap = _project(point, a, b)
+                    if gap < _TOLERANCE:
+                        cuts.append(t)
+
+        # 2. 站点和悬空的折线端点接入最近的其他通道；站点落在通道上时切分该通道
+        anchors = [(pos, None) for pos in self.stations] + ends
+
+        connectors = []
+        for point, own_line in anchors:
+            on_network = False
+            best = None
+            for segment in segments:
+                a, b, _, line_id, cuts, _ = segment
+                if line_id == own_line:
+                    continue
+                t, gap = _project(point, a, b)
+                if gap < _TOLERANCE:
+                    on_network = True
+                    if own_line is None:
+                        cuts.append(t)
+                elif best is None or gap < best[0]:
+                    best = (gap, t, segment)
+            if on_network or best is None:
+                continue
+            _, t, segment = best
+            segment[4].append(t)
+            a, b = segment[0], segment[1]
+            target = (a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1]))
+            connectors.append((point, target))
+
+        # 3. 按切分点连边
+        for p, q, bidirectional, _, cuts, width in segments:
+            ts = sorted(set(cuts))
+            points = [(p[0] + t * (q[0] - p[0]), p[1] + t * (q[1] - p[1])) for t in ts]
+            for a, b in pairwise(points):
+                self._add_edge(a, b, bidirectional, width)
+        for a, b in connectors:
+            self._add_edge(a, b, True, None)
+
+    def _add_edge(self, a, b, bidirectional, width):
+        u, v = self._node(a), self._node(b)
+        if u == v:
+            return
+        length = math.hypot(a[0] - b[0], a[1] - b[1])
+        self._edges.append((u, v, length, width))
+        if bidirectional:
+            self._edges.append((v, u, length, width))
+
+    def _all_pairs_shortest_paths(self):
+        """向量化 Floyd–Warshall，返回距离矩阵和下一跳矩阵"""
+        n = len(self.nodes)
+        distance = np.full((n, n), np.inf)
+        np.fill_diagonal(distance, 0.0)
+        next_hop = np.full((n, n), -1, dtype=np.intp)
+        np.fill_diagonal(next_hop, np.arange(n))
+        for u, v, length, _ in self._edges:
+            if length < distance[u, v]:
+                distance[u, v] = length
+                next_hop[u, v] = v
+
+        for k in range(n):
+            via = distance[:, k, None] + distance[None, k, :]
+            better = via < distance
+            distance = np.where(better, via, distance)
+            next_hop = np.where(better, next_hop[:, k, None], next_hop)
+        return distance, next_hop
+
+    def node_path(self, source, target):
+        """两节点间最短路经过的节点编号序列，不可达时返回 None"""
+        if not np.isfinite(self.distance[source, target]):
+            return None
+        path = [source]
+        while path[-1] != target:
+            path.append(int(self._next[path[-1], target]))
+        return path
+
+    def route(self, origin, destination):
+        """两站点间的行驶路线坐标列表；路网不可达时为直线"""
+        path = self.node_path(
+            self.station_nodes[origin], self.station_nodes[destination]
+        )
+        if path is None:
+            return [self.stations[origin], self.stations[destination]]
+        return [tuple(self.nodes[i]) for i in path]
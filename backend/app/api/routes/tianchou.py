@@ -6,17 +6,27 @@
 
 from __future__ import annotations
 
+import json
+import secrets
 import uuid
+from collections.abc import Callable
 from datetime import datetime
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
 import numpy as np
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlmodel import Session, select, func
+from sqlmodel import Session, delete, func, select
 
-from app.algorithms import part1_optimization, part2_decision, scheme_translator
+from app.algorithms import (
+    convergence,
+    part1_optimization,
+    part2_decision,
+    scheme_translator,
+)
 from app.api.deps import SessionDep
+from app.core.config import settings
 from app.models import (
     DecisionRecord,
     IndustryType,
@@ -24,6 +34,7 @@ from app.models import (
     ParetoSolution,
     TaskStatus,
 )
+from app.services import progress_stream, result_cache, task_queue
 from app.services.layout_image_generator import LayoutImageGenerator
 
 router = APIRouter(tags=["天筹优化"])
@@ -50,6 +61,36 @@ class OptimizationRequest(BaseModel):
     station_coords: list[list[float]] | None = Field(None, description="工位坐标")
     task_assignments: list[list[int]] | None = Field(None, description="任务分配")
 
+    # 算法参数
+    local_search_steps: int | None = Field(
+        None, description="轻工业进化结束后的局部搜索步数(增量评估)"
+    )
+    parallelism: Literal["serial", "process"] | None = Field(
+        None, description="适应度评估的并行方式: serial 或 process，默认不启用"
+    )
+    workers: int | None = Field(None, ge=1, description="并行评估的工作进程数")
+    engine: Literal["ga", "nsga2", "nsga3"] | None = Field(
+        None, description="进化引擎: ga(加权和遗传算法，默认)、nsga2 或 nsga3"
+    )
+    stop_patience: int | None = Field(
+        None, ge=1, description="最优总目标连续多少代无改进即提前终止，不指定时跑满代数"
+    )
+    hv_patience: int | None = Field(
+        None, ge=1, description="帕累托存档超体积连续多少代无增长即提前终止"
+    )
+    time_budget_seconds: float | None = Field(
+        None, gt=0, description="运行时间预算(秒)，超时后提前终止并保存已找到的帕累托解"
+    )
+    route_top_k: int | None = Field(
+        None, ge=0, description="重工业对最优的前 k 个帕累托解做多AGV冲突路由"
+    )
+    seed: int | None = Field(
+        None, ge=0, lt=2**32, description="随机种子，不指定时自动生成并记录在任务参数中"
+    )
+    use_cache: bool = Field(
+        True, description="已有相同请求的完成结果时直接复用，不重新运行优化"
+    )
+
     # 商业参数
     daily_output_value: float = Field(20000, description="每日产值(元)")
     base_cost: float = Field(20000, description="基础成本(元)")
@@ -190,30 +231,50 @@ class TaskListResponse(BaseModel):
 # ============ 后台任务函数 ============
 
 
-def run_optimization_task(task_id: str) -> None:
+def run_optimization_task(
+    task_id: str,
+    should_stop: Callable[[], bool] | None = None,
+    worker_id: str | None = None,
+) -> None:
     """
-    后台执行优化任务
+    执行优化任务
 
-    注意：此函数在后台任务中执行，必须创建独立的数据库会话，
-    因为传入的会话在请求完成后会被关闭。
+    由优化 worker 进程调用（app/optimization_worker.py），使用独立的数据库会话。
+    失败时回滚并抛出异常，由任务队列决定重试或标记失败。
 
     参数:
         task_id: 任务ID
+        should_stop: 取消检查，返回 True 时停止；进化开始前直接抛出 task_queue.TaskCancelled，
+            进化过程中在代与代之间停止并保存已找到的帕累托解
+        worker_id: 执行任务的 worker；指定时每次提交前确认任务仍归该 worker 所有，
+            否则回滚并抛出 task_queue.TaskLost
     """
     from app.core.db import engine
 
     # 创建独立的数据库会话（不依赖请求作用域）
     with Session(engine) as db:
+
+        def commit() -> None:
+            if worker_id is None:
+                db.commit()
+            else:
+                task_queue.commit_owned(db, uuid.UUID(task_id), worker_id)
+
         try:
             # 1. 更新任务状态
             task = db.get(OptimizationTask, uuid.UUID(task_id))
             if not task:
                 raise ValueError(f"Task {task_id} not found")
 
-            task.status = TaskStatus.RUNNING
-            task.started_at = datetime.utcnow()
+            if task.status != TaskStatus.RUNNING:
+                task.status = TaskStatus.RUNNING
+                task.started_at = datetime.utcnow()
             task.progress = 10
-            db.commit()
+            # 重试时清除上一次执行留下的解
+            db.execute(delete(ParetoSolution).where(ParetoSolution.task_id == task.id))
+            commit()
+            if should_stop is not None and should_stop():
+                raise task_queue.TaskCancelled()
 
             # 2. 执行 Part 1: 技术优化
             dual_track = part1_optimization.DualTrackAlgorithm()
@@ -221,6 +282,22 @@ def run_optimization_task(task_id: str) -> None:
             # 参数映射：将API参数转换为算法期望的格式
             api_params = task.input_params
 
+            # 轻重工业共用的算法运行参数
+            algorithm_options = {
+                "parallelism": api_params.get("parallelism"),
+                "workers": api_params.get("workers"),
+                "engine": api_params.get("engine") or "ga",
+                "stop_patience": api_params.get("stop_patience"),
+                "hv_patience": api_params.get("hv_patience"),
+                "time_budget_seconds": api_params.get("time_budget_seconds"),
+                "should_stop": should_stop,
+                "on_generation": progress_stream.GenerationPublisher(task.id),
+                # 重新执行（worker 中断后重新排队）时从最近的检查点继续
+                "checkpoint_store": task_queue.TaskCheckpointStore(task.id),
+                "checkpoint_interval": settings.OPTIMIZATION_CHECKPOINT_INTERVAL,
+                "seed": api_params.get("seed"),
+            }
+
             if task.industry_type == IndustryType.LIGHT:
                 # 获取设备数量，确保所有相关数组长度一致
                 device_count = api_params.get("device_count", 25)
@@ -291,6 +368,8 @@ def run_optimization_task(task_id: str) -> None:
                             else [],
                         },
                     ),  # 产品线信息
+                    "local_search_steps": api_params.get("local_search_steps") or 0,
+                    **algorithm_options,
                 }
 
                 results = dual_track.run_light_industry_optimization(input_data)
@@ -379,12 +458,14 @@ def run_optimization_task(task_id: str) -> None:
                     "beta1": api_params.get("beta1", 0.35),  # 最大完工时间权重
                     "beta2": api_params.get("beta2", 0.35),  # 瓶颈设备利用率权重
                     "beta3": api_params.get("beta3", 0.30),  # 负载不均衡度权重
+                    "route_top_k": api_params.get("route_top_k") or 0,
+                    **algorithm_options,
                 }
 
                 results = dual_track.run_heavy_industry_optimization(input_data)
 
             task.progress = 50
-            db.commit()
+            commit()
 
             optimizer = results["optimizer"]
             pareto_solutions = results["pareto_solutions"]
@@ -401,24 +482,34 @@ def run_optimization_task(task_id: str) -> None:
                 )
                 task.input_params["workshop_length"] = optimizer.L
                 task.input_params["workshop_width"] = optimizer.W
-                db.commit()
+                commit()
 
-            task.evolution_history = {"history": evolution_history}
+            task.evolution_history = {
+                "history": evolution_history,
+                "stop_reason": optimizer.stop_reason,
+                "generations": optimizer.generations_run,
+            }
 
             # 保存所有解数据（用于前端帕累托前沿可视化）
-            all_solutions = results.get("all_solutions", [])
-            print(f"[DEBUG] all_solutions count: {len(all_solutions)}")
-            if all_solutions:
-                print(
-                    f"[DEBUG] all_solutions sample: {all_solutions[0] if all_solutions else 'empty'}"
-                )
+            # objective_log 为每代个体的目标值数组，存档中的解只保留非支配解
+            objective_log = results.get("objective_log")
+            if objective_log is None:
+                objective_log = [
+                    (sol["f1"], sol["f2"], sol.get("f3"))
+                    for sol in results.get("all_solutions", [])
+                ]
+            print(f"[DEBUG] objective_log count: {len(objective_log)}")
             all_solutions_data = [
                 {
-                    "f1": float(sol["f1"]),
-                    "f2": float(sol["f2"]),
-                    "f3": float(sol.get("f3")) if sol.get("f3") is not None else None,
+                    "f1": float(f1),
+                    "f2": float(f2),
+                    "f3": float(f3) if f3 is not None else None,
                 }
-                for sol in all_solutions
+                for f1, f2, f3 in (
+                    objective_log.tolist()
+                    if hasattr(objective_log, "tolist")
+                    else objective_log
+                )
             ]
             print(f"[DEBUG] all_solutions_data count: {len(all_solutions_data)}")
             task.all_solutions = {"solutions": all_solutions_data}
@@ -431,13 +522,13 @@ def run_optimization_task(task_id: str) -> None:
                     f"[DEBUG] Pareto plot image saved, size: {len(pareto_plot_base64)} chars"
                 )
 
-            db.commit()
+            commit()
 
             # 3. 获取初始性能基准
             initial_perf = 0
             if task.industry_type == IndustryType.LIGHT:
                 original_pos_list = [tuple(pos) for pos in optimizer.original_positions]
-                init_ind = part1_optimization.creator.Individual(original_pos_list)
+                init_ind = part1_optimization.Individual(original_pos_list)
                 _, f1, _, _ = optimizer.evaluate_individual(init_ind)
                 initial_perf = f1
             else:
@@ -453,7 +544,7 @@ def run_optimization_task(task_id: str) -> None:
             business_data, original_indices = translator.translate(pareto_solutions)
 
             task.progress = 70
-            db.commit()
+            commit()
 
             # 5. 保存帕累托解
             for idx, sol in enumerate(pareto_solutions):
@@ -479,23 +570,30 @@ def run_optimization_task(task_id: str) -> None:
                 db.add(solution)
 
             task.progress = 90
-            db.commit()
+            commit()
 
             # 6. 更新任务状态
-            task.status = TaskStatus.COMPLETED
+            # 进化中途取消时保存已找到的帕累托解，任务标记为已取消
+            # 先删除检查点：其 DELETE 会刷新会话，须在修改任务状态之前执行
+            task_queue.clear_checkpoint(db, task.id)
+            task.status = (
+                TaskStatus.CANCELLED
+                if optimizer.stop_reason == convergence.CANCELLED
+                else TaskStatus.COMPLETED
+            )
             task.pareto_solution_count = len(original_indices)
             task.completed_at = datetime.utcnow()
             task.progress = 100
-            db.commit()
+            if optimizer.stop_reason == convergence.TIME_BUDGET:
+                # 受时间预算截断的结果不可复现，不作为缓存
+                task.result_key = None
+            commit()
+            progress_stream.publish_status(task.id, task.status.value, task.progress)
 
-        except Exception as e:
-            # 错误处理
-            task = db.get(OptimizationTask, uuid.UUID(task_id))
-            if task:
-                task.status = TaskStatus.FAILED
-                task.progress = 0
-                db.commit()
-            raise e
+        except Exception:
+            # 状态由任务队列处理（重试、失败或取消）
+            db.rollback()
+            raise
 
 
 # ============ API端点 ============
@@ -642,29 +740,43 @@ def _build_comparison_payload(
 @router.post("/tasks", response_model=TaskStatusResponse)
 async def create_optimization_task(
     request: OptimizationRequest,
-    background_tasks: BackgroundTasks,
     session: SessionDep,
 ) -> Any:
     """
-    创建新的优化任务 (后台执行)
+    创建新的优化任务 (加入队列，由优化 worker 执行)
+
+    已有相同请求的完成任务时直接复用其结果，新任务立即完成 (use_cache=false 时强制重新运行)
 
     - **name**: 任务名称
     - **industry_type**: 行业类型 (light/heavy)
     - 根据行业类型提供相应的参数
     """
+    input_params = request.model_dump()
+    # 结果缓存键在补充随机种子之前计算，未指定种子的相同请求可以复用结果
+    key = result_cache.result_key(input_params)
+    cached = (
+        result_cache.find_cached_result(session, key) if request.use_cache else None
+    )
+
+    # 未指定随机种子时生成一个并记录，相同参数和种子可复现同样的结果
+    if input_params.get("seed") is None:
+        input_params["seed"] = secrets.randbelow(2**32)
+
     # 创建任务记录
     task = OptimizationTask(
         name=request.name,
         industry_type=request.industry_type,
-        input_params=request.model_dump(),
+        input_params=input_params,
+        result_key=key,
     )
     session.add(task)
+
+    # 已有相同请求的完成结果时直接复制，任务不进入队列
+    if cached is not None:
+        result_cache.clone_result(session, cached, task)
     session.commit()
     session.refresh(task)
 
-    # 添加后台任务（不再传递 session，让后台任务自己创建会话）
-    background_tasks.add_task(run_optimization_task, str(task.id))
-
     return TaskStatusResponse(
         task_id=str(task.id),
         name=task.name,
@@ -986,13 +1098,112 @@ async def get_task_status(task_id: str, session: SessionDep) -> Any:
     )
 
 
+@router.post("/tasks/{task_id}/cancel", response_model=TaskStatusResponse)
+async def cancel_optimization_task(task_id: str, session: SessionDep) -> Any:
+    """
+    取消优化任务
+
+    - 排队中的任务立即取消
+    - 执行中的任务在下一代结束时停止，已找到的帕累托解作为部分结果保存
+    - **task_id**: 任务ID
+    """
+    task = session.get(OptimizationTask, uuid.UUID(task_id))
+    if not task:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+        raise HTTPException(status_code=400, detail="任务已结束，无法取消")
+
+    task_queue.request_cancel(session, task)
+
+    return TaskStatusResponse(
+        task_id=str(task.id),
+        name=task.name,
+        industry_type=task.industry_type,
+        status=task.status,
+        progress=task.progress,
+        solution_count=task.pareto_solution_count,
+        recommended_solution_id=str(task.recommended_solution_id)
+        if task.recommended_solution_id
+        else None,
+        created_at=task.created_at,
+        started_at=task.started_at,
+        completed_at=task.completed_at,
+    )
+
+
+_FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+
+def _sse(event: dict[str, Any]) -> str:
+    data = dict(event)
+    name = data.pop("event", "message")
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.get("/tasks/{task_id}/stream")
+async def stream_task_progress(task_id: str, session: SessionDep) -> Any:
+    """
+    以 Server-Sent Events 推送任务进度
+
+    - **generation** 事件：每代一条，包含 gen、f1、f2、f3、diversity、elapsed
+    - **status** 事件：连接时的当前状态，以及任务结束时的最终状态（随后关闭连接）
+    - 已结束的任务直接回放 evolution_history 后关闭
+    - **task_id**: 任务ID
+    """
+    task = session.get(OptimizationTask, uuid.UUID(task_id))
+    if not task:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    task_uuid = task.id
+    status = {"event": "status", "status": task.status.value, "progress": task.progress}
+    history = (task.evolution_history or {}).get("history", [])
+
+    async def events():
+        from app.core.db import engine
+
+        if status["status"] in _FINISHED_STATUSES:
+            for entry in history:
+                yield _sse(progress_stream.generation_event(entry))
+            yield _sse(status)
+            return
+
+        yield _sse(status)
+        async for event in progress_stream.listen(
+            task_uuid, settings.OPTIMIZATION_STREAM_KEEPALIVE_SECONDS
+        ):
+            if event is None:
+                # 空闲时检查任务是否已结束（失败、取消或错过了结束事件）
+                with Session(engine) as db:
+                    current = db.get(OptimizationTask, task_uuid)
+                if current is None or current.status in _FINISHED_STATUSES:
+                    if current is not None:
+                        yield _sse(
+                            {
+                                "event": "status",
+                                "status": current.status.value,
+                                "progress": current.progress,
+                            }
+                        )
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield _sse(event)
+            if event.get("event") == "status" and event["status"] in _FINISHED_STATUSES:
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/tasks/{task_id}/evolution")
 async def get_evolution_history(task_id: str, session: SessionDep) -> Any:
     """
     获取算法进化过程数据
 
     - **task_id: 任务ID
-    返回每代的适应度值、多样性、变异率等过程数据
+    返回每代的适应度值、多样性、变异率等过程数据，以及终止原因和实际运行代数
     """
     task = session.get(OptimizationTask, uuid.UUID(task_id))
     if not task:
@@ -1006,6 +1217,8 @@ async def get_evolution_history(task_id: str, session: SessionDep) -> Any:
         "status": task.status,
         "progress": task.progress,
         "history": history,
+        "stop_reason": evolution_data.get("stop_reason"),
+        "generations": evolution_data.get("generations", len(history)),
     }
 
 
@@ -95,6 +95,16 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    # 优化任务队列：worker 进程数、空闲时的轮询间隔、心跳间隔、心跳超时（超时的
+    # 任务视为 worker 已退出并重新排队）和最大执行次数（含重试）
+    OPTIMIZATION_WORKERS: int = 2
+    OPTIMIZATION_POLL_SECONDS: float = 2.0
+    OPTIMIZATION_HEARTBEAT_SECONDS: float = 10.0
+    OPTIMIZATION_STALE_SECONDS: float = 120.0
+    OPTIMIZATION_MAX_ATTEMPTS: int = 3
+    OPTIMIZATION_STREAM_KEEPALIVE_SECONDS: float = 15.0
+    OPTIMIZATION_CHECKPOINT_INTERVAL: int = 20
+
     # Neo4j 配置
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from pydantic import EmailStr
-from sqlalchemy import Column, String
+from sqlalchemy import Column, LargeBinary, String
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlmodel import Field, Relationship, SQLModel
 
@@ -496,6 +496,7 @@ class TaskStatus(str, Enum):
     RUNNING = "running"  # 执行中
     COMPLETED = "completed"  # 已完成
     FAILED = "failed"  # 失败
+    CANCELLED = "cancelled"  # 已取消
 
 
 class OptimizationTask(SQLModel, table=True):
@@ -514,6 +515,16 @@ class OptimizationTask(SQLModel, table=True):
     status: TaskStatus = Field(default=TaskStatus.PENDING)
     progress: int = Field(default=0)  # 0-100
 
+    # 任务队列 (PENDING 任务由独立的优化 worker 领取执行)
+    attempts: int = Field(default=0)  # 已领取执行的次数
+    worker_id: str | None = Field(default=None, max_length=255)  # 执行中的 worker
+    heartbeat_at: datetime | None = None  # worker 最近一次心跳
+    cancel_requested: bool = Field(default=False)  # 已请求取消，执行中的任务协作停止
+    error_message: str | None = Field(default=None, sa_column=Column(String))
+
+    # 结果缓存键 (相同请求参数和算法版本的哈希，完成后可被新任务复用)
+    result_key: str | None = Field(default=None, max_length=64, index=True)
+
     # 进化过程数据 (JSONB存储)
     evolution_history: dict = Field(default={}, sa_column=Column(JSONB))
 
@@ -604,6 +615,18 @@ class DecisionRecord(SQLModel, table=True):
     task: OptimizationTask = Relationship(back_populates="decisions")
 
 
+class OptimizationCheckpoint(SQLModel, table=True):
+    """优化任务的进化检查点 (重新执行时从最近的检查点继续)"""
+
+    __tablename__ = "optimization_checkpoints"
+
+    task_id: uuid.UUID = Field(
+        primary_key=True, foreign_key="optimization_tasks.id", ondelete="CASCADE"
+    )
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))  # .npz 编码
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 # ==================== 3.2 优化路线：产品与工艺流程 ====================
 
 
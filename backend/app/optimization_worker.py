@@ -0,0 +1,181 @@
+"""
+优化任务 worker
+
+从 optimization_tasks 队列领取 PENDING 任务并执行（见 app/services/task_queue.py），
+GA 的 CPU 密集计算与 HTTP 服务进程分离。
+
+- 每个 worker 进程串行执行任务，执行期间由心跳线程定期刷新 heartbeat_at，
+  并在发现取消请求时通知执行中的任务停止
+- 心跳发现任务已被回收（不再归该 worker 所有）时同样停止，并放弃本次执行的结果，
+  不做任何写入
+- 空闲时轮询队列，顺带回收心跳超时（worker 异常退出）的任务
+- 收到 SIGTERM/SIGINT 后不再领取新任务，当前任务执行完毕后退出
+
+用法:
+    python -m app.optimization_worker --workers 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from datetime import timedelta
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.services import progress_stream, task_queue
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizationWorker:
+    """单个 worker 进程的任务循环"""
+
+    def __init__(
+        self,
+        worker_id: str | None = None,
+        poll_seconds: float = settings.OPTIMIZATION_POLL_SECONDS,
+        heartbeat_seconds: float = settings.OPTIMIZATION_HEARTBEAT_SECONDS,
+        stale_seconds: float = settings.OPTIMIZATION_STALE_SECONDS,
+        max_attempts: int = settings.OPTIMIZATION_MAX_ATTEMPTS,
+    ) -> None:
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after = timedelta(seconds=stale_seconds)
+        self.max_attempts = max_attempts
+        self.stopping = threading.Event()
+
+    def stop(self, *_args) -> None:
+        """停止领取新任务"""
+        self.stopping.set()
+
+    def run_forever(self) -> None:
+        logger.info("worker %s 启动", self.worker_id)
+        while not self.stopping.is_set():
+            if not self.run_once():
+                self.stopping.wait(self.poll_seconds)
+        logger.info("worker %s 退出", self.worker_id)
+
+    def run_once(self) -> bool:
+        """回收超时任务并执行一个任务，队列为空时返回 False"""
+        with Session(engine) as session:
+            task_queue.requeue_stale_tasks(session, self.stale_after, self.max_attempts)
+            task = task_queue.claim_next_task(session, self.worker_id)
+            if task is None:
+                return False
+            task_id = task.id
+
+        logger.info("worker %s 领取任务 %s", self.worker_id, task_id)
+        self.execute(task_id)
+        return True
+
+    def execute(self, task_id) -> None:
+        """执行已领取的任务，期间维持心跳"""
+        # 延迟导入：路由模块会加载整个 API 依赖
+        from app.api.routes.tianchou import run_optimization_task
+
+        stop = threading.Event()
+        done = threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(task_id, stop, done),
+            daemon=True,
+        )
+        beat.start()
+        try:
+            run_optimization_task(
+                str(task_id), should_stop=stop.is_set, worker_id=self.worker_id
+            )
+        except task_queue.TaskLost:
+            self._log_lost(task_id)
+        except task_queue.TaskCancelled:
+            with Session(engine) as session:
+                status = task_queue.cancel_running_task(
+                    session, task_id, self.worker_id
+                )
+            if status is None:
+                self._log_lost(task_id)
+            else:
+                progress_stream.publish_status(task_id, status.value, 0)
+                logger.info("任务 %s 已取消", task_id)
+        except Exception as e:
+            logger.exception("任务 %s 执行失败", task_id)
+            with Session(engine) as session:
+                status = task_queue.fail_task(
+                    session, task_id, self.worker_id, repr(e), self.max_attempts
+                )
+            if status is not None:
+                progress_stream.publish_status(task_id, status.value, 0)
+            logger.warning("任务 %s 执行失败后状态: %s", task_id, status)
+        finally:
+            done.set()
+            beat.join()
+
+    def _log_lost(self, task_id) -> None:
+        logger.warning(
+            "任务 %s 已不归 worker %s 所有，放弃本次执行结果", task_id, self.worker_id
+        )
+
+    def _heartbeat_loop(self, task_id, stop, done) -> None:
+        """定期刷新心跳；已请求取消或任务已被回收时设置 stop"""
+        with Session(engine) as session:
+            while not done.wait(self.heartbeat_seconds):
+                try:
+                    result = task_queue.heartbeat(session, task_id, self.worker_id)
+                    if result != task_queue.HeartbeatResult.OK:
+                        stop.set()
+                except Exception:
+                    session.rollback()
+                    logger.warning("任务 %s 心跳失败", task_id, exc_info=True)
+
+
+def _worker_main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    worker = OptimizationWorker()
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="优化任务 worker")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.OPTIMIZATION_WORKERS,
+        help="worker 进程数",
+    )
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        _worker_main()
+        return
+
+    # spawn 启动，子进程不继承父进程的数据库连接
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_main, name=f"optimization-worker-{k}")
+        for k in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def shutdown(*_args) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+优化进度推送
+
+worker 进程每代结束后通过 PostgreSQL NOTIFY 发布一条精简的进度事件，
+API 进程的 SSE 端点（GET /tianchou/tasks/{id}/stream）LISTEN 同一频道并转发给前端，
+不需要轮询任务表，也不需要额外的消息中间件。
+
+- 每个任务一个频道：optimization_<task_id.hex>
+- 事件为 JSON：{"event": "generation" | "status", ...}
+- NOTIFY 只投递给当前在监听的连接，不做持久化；已结束任务的完整历史仍从
+  evolution_history 读取
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import math
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+import psycopg2
+from sqlalchemy import func, select
+
+from app.core.db import engine
+
+logger = logging.getLogger(__name__)
+
+# 进化历史条目中推送给前端的字段
+_GENERATION_FIELDS = {
+    "generation": "gen",
+    "f1": "f1",
+    "f2": "f2",
+    "f3": "f3",
+    "diversity": "diversity",
+    "elapsed_time": "elapsed",
+    "hypervolume": "hypervolume",
+}
+
+
+def channel_name(task_id: uuid.UUID) -> str:
+    return f"optimization_{task_id.hex}"
+
+
+def generation_event(entry: dict[str, Any]) -> dict[str, Any]:
+    """把一代的 evolution_history 条目压缩为进度事件"""
+    event: dict[str, Any] = {"event": "generation"}
+    for key, name in _GENERATION_FIELDS.items():
+        value = entry.get(key)
+        if isinstance(value, float) and not math.isfinite(value):
+            value = None
+        if value is not None:
+            event[name] = value
+    return event
+
+
+def publish(task_id: uuid.UUID, event: dict[str, Any]) -> None:
+    """发布进度事件，失败只记录日志，不影响优化任务本身"""
+    payload = json.dumps(event, separators=(",", ":"))
+    try:
+        with engine.connect() as conn:
+            conn.execute(select(func.pg_notify(channel_name(task_id), payload)))
+            conn.commit()
+    except Exception:
+        logger.exception("Failed to publish progress for task %s", task_id)
+
+
+class GenerationPublisher:
+    """每代结束后调用，发布该代的进度事件"""
+
+    def __init__(self, task_id: uuid.UUID):
+        self.task_id = task_id
+
+    def __call__(self, entry: dict[str, Any]) -> None:
+        publish(self.task_id, generation_event(entry))
+
+
+def publish_status(task_id: uuid.UUID, status: str, progress: int) -> None:
+    publish(task_id, {"event": "status", "status": status, "progress": progress})
+
+
+def _connect_listener(
+    cargs: Any, cparams: dict[str, Any], channel: str
+) -> psycopg2.extensions.connection:
+    """建立自动提交的独立连接并 LISTEN 频道（阻塞调用）"""
+    conn = psycopg2.connect(*cargs, **cparams)
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{channel}"')
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+async def listen(
+    task_id: uuid.UUID, idle_timeout: float
+) -> AsyncIterator[dict[str, Any] | None]:
+    """
+    监听任务的进度事件
+
+    使用连接池之外的独立连接，连接可读时由事件循环唤醒；
+    超过 idle_timeout 秒没有事件时产出 None，便于调用方发送保活或检查任务状态。
+    建立连接和 LISTEN 是阻塞调用，在线程池中执行，数据库响应慢时不阻塞事件循环
+    """
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    loop = asyncio.get_running_loop()
+    conn = await loop.run_in_executor(
+        None,
+        functools.partial(_connect_listener, cargs, cparams, channel_name(task_id)),
+    )
+    readable = asyncio.Event()
+    try:
+        loop.add_reader(conn.fileno(), readable.set)
+        while True:
+            try:
+                await asyncio.wait_for(readable.wait(), idle_timeout)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            readable.clear()
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                yield json.loads(notify.payload)
+    finally:
+        loop.remove_reader(conn.fileno())
+        conn.close()
@@ -0,0 +1,101 @@
+"""
+优化结果缓存
+
+相同的优化请求（同一车间、设备、权重和种子）不必重复运行遗传算法：任务创建时按
+请求参数计算结果缓存键，已有相同键的完成任务时，新任务直接复制其结果并立即完成。
+
+- 缓存键为规范化请求参数（键排序的 JSON）与算法版本的 SHA-256；算法的 input_data
+  由请求参数和固定默认值确定，因此参数相同即 input_data 相同
+- 任务名称、工作进程数等不影响结果的参数不参与计算；并行方式保留在键中，
+  不同并行方式的结果各自缓存
+- 请求未指定种子时键中不含种子，可复用任一未指定种子的相同请求的结果
+- 受墙钟时间预算截断的结果不可复现，不作为缓存
+"""
+
+import hashlib
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import Session, col, select
+
+from app.algorithms.checkpoint import canonical_json
+from app.algorithms.part1_optimization import ALGORITHM_VERSION
+from app.models import OptimizationTask, ParetoSolution, TaskStatus
+
+# 不影响优化结果的请求参数
+_IGNORED_PARAMS = {"name", "workers", "use_cache"}
+
+
+def result_key(params: dict[str, Any]) -> str:
+    """计算请求参数的结果缓存键"""
+    normalized = {
+        key: value for key, value in params.items() if key not in _IGNORED_PARAMS
+    }
+    payload = canonical_json(
+        {"algorithm_version": ALGORITHM_VERSION, "params": normalized}
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def find_cached_result(session: Session, key: str) -> OptimizationTask | None:
+    """查找缓存键相同的最近完成任务"""
+    statement = (
+        select(OptimizationTask)
+        .where(
+            OptimizationTask.result_key == key,
+            OptimizationTask.status == TaskStatus.COMPLETED,
+        )
+        .order_by(col(OptimizationTask.completed_at).desc())
+        .limit(1)
+    )
+    return session.exec(statement).first()
+
+
+def clone_result(
+    session: Session, source: OptimizationTask, task: OptimizationTask
+) -> None:
+    """
+    把 source 的结果复制到新任务并标记完成（调用方负责提交）
+
+    帕累托解逐行复制，决策相关的排名、TOPSIS 得分和推荐方案不复制，
+    新任务可以独立做 AHP-TOPSIS 决策
+    """
+    now = datetime.utcnow()
+    # 运行中补充的参数（如原始布局）和实际使用的种子随结果一起复制
+    task.input_params = {
+        **source.input_params,
+        **{k: v for k, v in task.input_params.items() if k in _IGNORED_PARAMS},
+    }
+    task.evolution_history = {
+        **(source.evolution_history or {}),
+        "cached_from": str(source.id),
+    }
+    task.all_solutions = source.all_solutions
+    task.pareto_plot_image = source.pareto_plot_image
+    task.pareto_solution_count = source.pareto_solution_count
+    task.status = TaskStatus.COMPLETED
+    task.progress = 100
+    task.started_at = now
+    task.completed_at = now
+    session.add(task)
+
+    solutions = session.exec(
+        select(ParetoSolution).where(ParetoSolution.task_id == source.id)
+    ).all()
+    for solution in solutions:
+        session.add(
+            ParetoSolution(
+                id=uuid.uuid4(),
+                task_id=task.id,
+                f1=solution.f1,
+                f2=solution.f2,
+                f3=solution.f3,
+                total_cost=solution.total_cost,
+                implementation_days=solution.implementation_days,
+                expected_benefit=solution.expected_benefit,
+                expected_loss=solution.expected_loss,
+                solution_data=solution.solution_data,
+                technical_details=solution.technical_details,
+            )
+        )
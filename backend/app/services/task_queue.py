@@ -0,0 +1,263 @@
+"""
+优化任务队列
+
+以 optimization_tasks 表作为持久化队列：API 只插入 PENDING 状态的任务，独立的优化
+worker 进程（app/optimization_worker.py）用 SELECT ... FOR UPDATE SKIP LOCKED 领取，
+多个 worker 并发领取时互不阻塞，也不会重复领取同一个任务。
+
+- 领取时状态改为 RUNNING，记录 worker_id 并累加 attempts
+- 执行期间 worker 定期刷新 heartbeat_at；心跳超时的任务视为 worker 已退出，
+  重新放回队列，超过最大执行次数则标记为 FAILED
+- 执行失败时同样按执行次数重试或标记为 FAILED，错误信息记录在 error_message
+- 取消：PENDING 任务直接改为 CANCELLED；RUNNING 任务设置 cancel_requested，
+  执行中的 worker 在心跳时发现后协作停止
+- 所有权：任务被回收后原 worker 的心跳返回 LOST，此后它的写入经 commit_owned
+  检查后回滚，不会覆盖新领取者的结果
+- 检查点：执行中的遗传算法定期把进化状态写入 optimization_checkpoints，
+  任务重新排队后由任意 worker 从最近的检查点继续
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+from enum import Enum
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, col, select
+
+from app.models import OptimizationCheckpoint, OptimizationTask, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """任务在执行过程中被取消"""
+
+
+class TaskLost(Exception):
+    """任务已不归当前 worker 所有（心跳超时后被重新排队或已结束）"""
+
+
+class HeartbeatResult(str, Enum):
+    """心跳结果"""
+
+    OK = "ok"  # 继续执行
+    CANCEL_REQUESTED = "cancel_requested"  # 已请求取消，应协作停止
+    LOST = "lost"  # 任务已不归该 worker 所有，应放弃执行且不再写入
+
+
+def claim_next_task(session: Session, worker_id: str) -> OptimizationTask | None:
+    """领取最早创建的 PENDING 任务，没有可领取的任务时返回 None"""
+    statement = (
+        select(OptimizationTask)
+        .where(OptimizationTask.status == TaskStatus.PENDING)
+        .order_by(col(OptimizationTask.created_at))
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    task = session.exec(statement).first()
+    if task is None:
+        session.rollback()
+        return None
+
+    now = datetime.utcnow()
+    task.status = TaskStatus.RUNNING
+    task.worker_id = worker_id
+    task.attempts += 1
+    task.heartbeat_at = now
+    task.started_at = now
+    task.progress = 0
+    task.error_message = None
+    session.add(task)
+    session.commit()
+    session.refresh(task)
+    return task
+
+
+def heartbeat(session: Session, task_id: uuid.UUID, worker_id: str) -> HeartbeatResult:
+    """刷新心跳，区分已请求取消和任务已不归该 worker 所有两种停止原因"""
+    result = session.execute(
+        update(OptimizationTask)
+        .where(
+            col(OptimizationTask.id) == task_id,
+            col(OptimizationTask.worker_id) == worker_id,
+            col(OptimizationTask.status) == TaskStatus.RUNNING,
+        )
+        .values(heartbeat_at=datetime.utcnow())
+        .returning(col(OptimizationTask.cancel_requested))
+    )
+    row = result.first()
+    session.commit()
+    if row is None:
+        return HeartbeatResult.LOST
+    if row[0]:
+        return HeartbeatResult.CANCEL_REQUESTED
+    return HeartbeatResult.OK
+
+
+def commit_owned(session: Session, task_id: uuid.UUID, worker_id: str) -> None:
+    """
+    任务仍归该 worker 所有（RUNNING 且 worker_id 一致）时提交当前事务，
+    否则回滚并抛出 TaskLost
+
+    条件 UPDATE 锁住任务行直到提交，期间不会被心跳超时回收。检查在刷新本事务的
+    修改之前进行，因此同一事务可以把任务改为已完成或已取消
+    """
+    with session.no_autoflush:
+        row = session.execute(
+            update(OptimizationTask)
+            .where(
+                col(OptimizationTask.id) == task_id,
+                col(OptimizationTask.worker_id) == worker_id,
+                col(OptimizationTask.status) == TaskStatus.RUNNING,
+            )
+            .values(heartbeat_at=datetime.utcnow())
+            .returning(col(OptimizationTask.id))
+            .execution_options(synchronize_session=False)
+        ).first()
+    if row is None:
+        session.rollback()
+        raise TaskLost()
+    session.commit()
+
+
+def _release(task: OptimizationTask, error: str | None, max_attempts: int) -> None:
+    """释放执行中的任务：已请求取消则取消，否则按执行次数重新排队或标记失败"""
+    task.worker_id = None
+    task.heartbeat_at = None
+    task.error_message = error
+    if task.cancel_requested:
+        task.status = TaskStatus.CANCELLED
+        task.completed_at = datetime.utcnow()
+    elif task.attempts < max_attempts:
+        task.status = TaskStatus.PENDING
+        task.progress = 0
+    else:
+        task.status = TaskStatus.FAILED
+        task.progress = 0
+
+
+def requeue_stale_tasks(
+    session: Session, stale_after: timedelta, max_attempts: int
+) -> int:
+    """回收心跳超时的 RUNNING 任务，返回回收的任务数"""
+    deadline = datetime.utcnow() - stale_after
+    statement = (
+        select(OptimizationTask)
+        .where(
+            OptimizationTask.status == TaskStatus.RUNNING,
+            or_(
+                col(OptimizationTask.heartbeat_at) < deadline,
+                col(OptimizationTask.heartbeat_at).is_(None),
+            ),
+        )
+        .with_for_update(skip_locked=True)
+    )
+    tasks = session.exec(statement).all()
+    for task in tasks:
+        logger.warning("任务 %s 心跳超时 (worker %s)", task.id, task.worker_id)
+        _release(task, f"worker {task.worker_id} 心跳超时", max_attempts)
+        session.add(task)
+    session.commit()
+    return len(tasks)
+
+
+def fail_task(
+    session: Session,
+    task_id: uuid.UUID,
+    worker_id: str,
+    error: str,
+    max_attempts: int,
+) -> TaskStatus | None:
+    """
+    记录执行失败，按执行次数重新排队或标记失败，返回任务的新状态
+
+    任务已不归该 worker 所有时不做修改，返回 None
+    """
+    task = session.get(OptimizationTask, task_id, with_for_update=True)
+    if task is None or task.worker_id != worker_id:
+        session.rollback()
+        return None
+    _release(task, error, max_attempts)
+    session.add(task)
+    session.commit()
+    return task.status
+
+
+def cancel_running_task(
+    session: Session, task_id: uuid.UUID, worker_id: str
+) -> TaskStatus | None:
+    """执行中的任务响应取消请求后调用，把任务标记为 CANCELLED"""
+    task = session.get(OptimizationTask, task_id, with_for_update=True)
+    if task is None or task.worker_id != worker_id:
+        session.rollback()
+        return None
+    task.cancel_requested = True
+    _release(task, None, max_attempts=0)
+    session.add(task)
+    session.commit()
+    return task.status
+
+
+def request_cancel(session: Session, task: OptimizationTask) -> TaskStatus:
+    """
+    请求取消任务，返回任务的新状态
+
+    PENDING 任务立即取消；RUNNING 任务只设置 cancel_requested，由 worker 协作停止；
+    已结束的任务不受影响
+    """
+    session.refresh(task, with_for_update=True)
+    if task.status == TaskStatus.PENDING:
+        task.status = TaskStatus.CANCELLED
+        task.cancel_requested = True
+        task.completed_at = datetime.utcnow()
+    elif task.status == TaskStatus.RUNNING:
+        task.cancel_requested = True
+    session.add(task)
+    session.commit()
+    session.refresh(task)
+    return task.status
+
+
+class TaskCheckpointStore:
+    """
+    把任务的进化检查点存入 optimization_checkpoints（供 app.algorithms.checkpoint 使用）
+
+    每次读写使用独立的短会话，对象本身只保存任务ID，可以随优化器 pickle 到评估进程
+    """
+
+    def __init__(self, task_id: uuid.UUID) -> None:
+        self.task_id = task_id
+
+    def load(self) -> bytes | None:
+        from app.core.db import engine
+
+        with Session(engine) as session:
+            checkpoint = session.get(OptimizationCheckpoint, self.task_id)
+            return checkpoint.data if checkpoint else None
+
+    def save(self, blob: bytes) -> None:
+        from app.core.db import engine
+
+        now = datetime.utcnow()
+        statement = (
+            insert(OptimizationCheckpoint)
+            .values(task_id=self.task_id, data=blob, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=[OptimizationCheckpoint.task_id],
+                set_={"data": blob, "updated_at": now},
+            )
+        )
+        with Session(engine) as session:
+            session.execute(statement)
+            session.commit()
+
+
+def clear_checkpoint(session: Session, task_id: uuid.UUID) -> None:
+    """任务结束后删除检查点"""
+    session.execute(
+        delete(OptimizationCheckpoint).where(
+            col(OptimizationCheckpoint.task_id) == task_id
+        )
+    )
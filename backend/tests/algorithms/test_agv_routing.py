@@ -0,0 +1,58 @@
+from app.algorithms.agv_routing import ConflictAwareRouter, ReservationTable
+from app.algorithms.part1_optimization import (
+    HeavyIndustry_AGV_Optimizer,
+    run_heavy_industry_example,
+)
+from app.algorithms.path_network import AisleGraph
+
+
+def test_reservation_table_finds_gaps_and_merges() -> None:
+    table = ReservationTable()
+    table.reserve("a", 2, 4)
+    table.reserve("a", 6, 8)
+    assert table.earliest_slot("a", 0, 2) == 0
+    assert table.earliest_slot("a", 1, 2) == 4
+    assert table.earliest_slot("a", 3, 3) == 8
+    assert table.earliest_slot("b", 3, 3) == 3
+
+    table.reserve("a", 3, 7)
+    assert table.earliest_slot("a", 0, 3) == 8
+
+
+def _corridor(width: float) -> AisleGraph:
+    return AisleGraph(
+        [{"points": [(0, 0), (10, 0)], "width": width}], [(0, 0), (10, 0)]
+    )
+
+
+def test_single_lane_corridor_blocks_oncoming_agv() -> None:
+    router = ConflictAwareRouter(_corridor(4), speed=1.0, headway=0.5)
+    assert router.plan(0, 1, 0.0) == (10.0, 0.0)
+    # 对向AGV须等第一辆驶离并经过安全间隔
+    assert router.plan(1, 0, 2.0) == (20.5, 8.5)
+    assert router.hotspots(top=1)[0]["wait_time"] == 8.5
+
+
+def test_two_lane_corridor_allows_oncoming_agv() -> None:
+    router = ConflictAwareRouter(
+        _corridor(10), speed=1.0, headway=0.5, two_lane_width=8
+    )
+    assert router.plan(0, 1, 0.0) == (10.0, 0.0)
+    assert router.plan(1, 0, 2.0) == (12.0, 0.0)
+    # 同向跟随仍受区段互斥约束
+    assert router.plan(0, 1, 1.0) == (20.5, 9.5)
+
+
+def test_heavy_routing_report() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer({**run_heavy_industry_example(), "seed": 2})
+    total, f1, f2, f3, schedule = optimizer.evaluate_individual(
+        optimizer.create_individual()
+    )
+    report = optimizer.route_solution({"schedule": schedule})
+
+    assert report["transport_count"] == optimizer.total_operations
+    assert report["planned_makespan"] == f1
+    assert report["makespan"] >= f1 - 1e-9
+    assert report["total_wait_time"] >= 0
+    hotspot_wait = sum(spot["wait_time"] for spot in report["hotspots"])
+    assert hotspot_wait <= report["total_wait_time"] + 1e-9
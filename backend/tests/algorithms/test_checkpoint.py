@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from app.algorithms.checkpoint import (
+    Checkpointer,
+    FileCheckpointStore,
+    decode,
+    encode,
+)
+from app.algorithms.pareto import objective_matrix
+from app.algorithms.part1_optimization import (
+    HeavyIndustry_AGV_Optimizer,
+    SLP_GA_Optimizer,
+    run_heavy_industry_example,
+    run_light_industry_example,
+)
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_encode_round_trip() -> None:
+    state = {"log": np.arange(6.0).reshape(3, 2), "history": [{"generation": 0}]}
+    decoded = decode(encode(state))
+    assert np.array_equal(decoded["log"], state["log"])
+    assert decoded["history"] == state["history"]
+
+
+def test_mismatched_signature_is_ignored(tmp_path) -> None:
+    checkpointer = Checkpointer(FileCheckpointStore(tmp_path / "run.npz"), interval=2)
+    assert checkpointer.load({"seed": 1}) is None
+    checkpointer.save({"seed": 1}, 3, {"value": 42})
+    assert checkpointer.load({"seed": 1})["generation"] == 3
+    assert checkpointer.load({"seed": 2}) is None
+
+
+def test_checkpoint_from_other_input_is_ignored(tmp_path) -> None:
+    options = {"checkpoint_path": tmp_path / "run.npz", "checkpoint_interval": 2}
+    example = run_light_industry_example()
+    checkpointer = Checkpointer.from_options({**example, **options})
+    checkpointer.save({"seed": 1}, 3, {"value": 42})
+
+    # 运行选项不影响输入哈希
+    same = Checkpointer.from_options({**example, **options, "workers": 4})
+    assert same.load({"seed": 1})["generation"] == 3
+
+    changed = {**example, "L": example["L"] + 1}
+    assert Checkpointer.from_options({**changed, **options}).load({"seed": 1}) is None
+
+
+@pytest.mark.parametrize("parallelism", [None, "serial"])
+@pytest.mark.parametrize(
+    "optimizer_cls, example",
+    [
+        (SLP_GA_Optimizer, run_light_industry_example),
+        (HeavyIndustry_AGV_Optimizer, run_heavy_industry_example),
+    ],
+)
+def test_resume_matches_uninterrupted_run(
+    optimizer_cls, example, parallelism, tmp_path
+) -> None:
+    def run(**options):
+        optimizer = optimizer_cls(
+            {**example(), "seed": 5, "parallelism": parallelism, **options}
+        )
+        optimizer.pop_size = 12
+        optimizer.ngen = 12
+        optimizer.run_optimization()
+        return optimizer
+
+    def interrupt(entry):
+        if entry["generation"] == 7:
+            raise Interrupted()
+
+    checkpoint = {"checkpoint_path": tmp_path / "run.npz", "checkpoint_interval": 3}
+    with pytest.raises(Interrupted):
+        run(**checkpoint, on_generation=interrupt)
+
+    resumed = run(**checkpoint)
+    reference = run()
+
+    assert [entry["f1"] for entry in resumed.evolution_history] == [
+        entry["f1"] for entry in reference.evolution_history
+    ]
+    assert np.array_equal(
+        objective_matrix(resumed.pareto_solutions),
+        objective_matrix(reference.pareto_solutions),
+    )
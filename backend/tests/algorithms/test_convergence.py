@@ -0,0 +1,131 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from app.algorithms.convergence import (
+    BEST_FITNESS_PLATEAU,
+    CANCELLED,
+    HYPERVOLUME_STAGNATION,
+    MAX_GENERATIONS,
+    TIME_BUDGET,
+    ConvergenceMonitor,
+)
+from app.algorithms.part1_optimization import (
+    HeavyIndustry_AGV_Optimizer,
+    SLP_GA_Optimizer,
+    run_heavy_industry_example,
+    run_light_industry_example,
+)
+
+
+def test_plateau_stops_after_patience_generations() -> None:
+    monitor = ConvergenceMonitor((1, 1), patience=3, tolerance=0.01)
+    reasons = [monitor.update(total) for total in [10.0, 9.0, 8.95, 8.95, 8.99]]
+    assert reasons == [None, None, None, None, BEST_FITNESS_PLATEAU]
+
+
+def test_hypervolume_stagnation() -> None:
+    monitor = ConvergenceMonitor((1, -1), hv_patience=2)
+    front = np.array([[1.0, 1.0], [2.0, 2.0]])
+    assert monitor.update(0.0, front) is None
+    improved = np.array([[0.5, 1.0], [2.0, 2.5]])
+    assert monitor.update(0.0, improved) is None
+    assert monitor.stats()["hypervolume"] == monitor.hypervolume > 0
+    assert monitor.update(0.0, improved) is None
+    assert monitor.update(0.0, improved) == HYPERVOLUME_STAGNATION
+
+
+def test_time_budget_uses_clock() -> None:
+    now = [0.0]
+    monitor = ConvergenceMonitor((1,), time_budget=5, clock=lambda: now[0])
+    assert monitor.update(1.0) is None
+    now[0] = 5.0
+    assert monitor.update(1.0) == TIME_BUDGET
+
+
+def test_should_stop_cancels() -> None:
+    cancelled = [False]
+    monitor = ConvergenceMonitor((1,), should_stop=lambda: cancelled[0])
+    assert monitor.update(1.0) is None
+    cancelled[0] = True
+    assert monitor.update(1.0) == CANCELLED
+
+
+def test_should_stop_is_not_pickled() -> None:
+    monitor = ConvergenceMonitor((1,), should_stop=lambda: True)
+    assert pickle.loads(pickle.dumps(monitor)).should_stop is None
+
+
+def test_finish_records_reason_on_last_entry() -> None:
+    monitor = ConvergenceMonitor((1,))
+    history = [{"generation": 0}, {"generation": 1}]
+    assert monitor.update(1.0) is None
+    assert monitor.finish(history) == MAX_GENERATIONS
+    assert history[-1]["stop_reason"] == MAX_GENERATIONS
+
+
+@pytest.mark.parametrize("engine", ["ga", "nsga2"])
+@pytest.mark.parametrize(
+    "optimizer_cls, example",
+    [
+        (SLP_GA_Optimizer, run_light_industry_example),
+        (HeavyIndustry_AGV_Optimizer, run_heavy_industry_example),
+    ],
+)
+def test_optimizer_stops_on_plateau(optimizer_cls, example, engine) -> None:
+    optimizer = optimizer_cls(
+        {**example(), "seed": 3, "engine": engine, "stop_patience": 3}
+    )
+    optimizer.pop_size = 12
+    optimizer.ngen = 200
+    pareto, _, history = optimizer.run_optimization()
+
+    assert pareto
+    assert optimizer.stop_reason == BEST_FITNESS_PLATEAU
+    assert optimizer.generations_run == len(history) < optimizer.ngen
+    assert history[-1]["stop_reason"] == BEST_FITNESS_PLATEAU
+    assert "stop_reason" not in history[0]
+
+
+@pytest.mark.parametrize("engine", ["ga", "nsga2"])
+@pytest.mark.parametrize(
+    "optimizer_cls, example",
+    [
+        (SLP_GA_Optimizer, run_light_industry_example),
+        (HeavyIndustry_AGV_Optimizer, run_heavy_industry_example),
+    ],
+)
+def test_cancelled_optimizer_returns_partial_front(
+    optimizer_cls, example, engine
+) -> None:
+    checks = []
+
+    def should_stop():
+        # 第 2 代结束时取消
+        checks.append(None)
+        return len(checks) >= 2
+
+    optimizer = optimizer_cls(
+        {**example(), "seed": 3, "engine": engine, "should_stop": should_stop}
+    )
+    optimizer.pop_size = 12
+    optimizer.ngen = 50
+    pareto, _, history = optimizer.run_optimization()
+
+    assert pareto
+    assert optimizer.stop_reason == CANCELLED
+    assert optimizer.generations_run == len(history) == 2
+
+
+def test_on_generation_receives_each_history_entry() -> None:
+    entries = []
+    optimizer = SLP_GA_Optimizer(
+        {**run_light_industry_example(), "seed": 3, "on_generation": entries.append}
+    )
+    optimizer.pop_size = 12
+    optimizer.ngen = 5
+    _, _, history = optimizer.run_optimization()
+
+    assert [entry["generation"] for entry in entries] == list(range(5))
+    assert entries == history
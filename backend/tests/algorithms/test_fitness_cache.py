@@ -0,0 +1,79 @@
+import pytest
+
+from app.algorithms.fitness_cache import FitnessCache
+from app.algorithms.part1_optimization import (
+    HeavyIndustry_AGV_Optimizer,
+    SLP_GA_Optimizer,
+    run_heavy_industry_example,
+    run_light_industry_example,
+)
+
+
+def _key(n: int) -> bytes:
+    return FitnessCache.key(str(n).encode())
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache = FitnessCache(max_entries=2)
+    cache.put(_key(1), (1.0,))
+    cache.put(_key(2), (2.0,))
+    assert cache.get(_key(1)) == (1.0,)
+    cache.put(_key(3), (3.0,))
+
+    assert len(cache) == 2
+    assert cache.get(_key(2)) is None
+    assert cache.get(_key(1)) == (1.0,)
+    assert cache.get(_key(3)) == (3.0,)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_byte_budget_bounds_cache() -> None:
+    cache = FitnessCache(max_entries=1000, max_bytes=2000)
+    for n in range(100):
+        cache.put(_key(n), (float(n), 0.0, 0.0, 0.0))
+    assert 0 < len(cache) < 100
+    assert cache.nbytes <= 2000
+    assert cache.get(_key(99)) is not None
+
+
+def test_lookup_evaluates_batch_duplicates_once() -> None:
+    cache = FitnessCache()
+    cache.put(_key(1), (1.0,))
+    found, pending = cache.lookup([_key(1), _key(2), _key(2), _key(3)])
+    assert found == {0: (1.0,)}
+    assert pending == {_key(2): [1, 2], _key(3): [3]}
+    assert cache.stats()["cache_hits"] == 2
+
+
+def test_disabled_cache_stores_nothing() -> None:
+    cache = FitnessCache(max_entries=0)
+    assert cache.put(_key(1), (1,)) == (1.0,)
+    assert len(cache) == 0
+
+
+def _run(optimizer_cls, example, **options) -> tuple[list, list]:
+    optimizer = optimizer_cls({**example(), "seed": 5, **options})
+    optimizer.pop_size = 16
+    optimizer.ngen = 5
+    _, _, history = optimizer.run_optimization()
+    return history, sorted(
+        (sol["f1"], sol["f2"], sol["f3"]) for sol in optimizer.all_solutions
+    )
+
+
+@pytest.mark.parametrize(
+    "optimizer_cls, example",
+    [
+        (SLP_GA_Optimizer, run_light_industry_example),
+        (HeavyIndustry_AGV_Optimizer, run_heavy_industry_example),
+    ],
+)
+def test_cache_does_not_change_results(optimizer_cls, example) -> None:
+    cached_history, cached = _run(optimizer_cls, example)
+    plain_history, plain = _run(optimizer_cls, example, fitness_cache_size=0)
+
+    assert cached == plain
+    assert [h["f1"] for h in cached_history] == [h["f1"] for h in plain_history]
+    assert cached_history[-1]["cache_misses"] > 0
+    assert plain_history[-1]["cache_hits"] == 0
+    assert 0 <= cached_history[-1]["cache_hit_rate"] <= 1
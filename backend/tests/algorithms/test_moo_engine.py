@@ -0,0 +1,54 @@
+import pytest
+
+from app.algorithms.pareto import non_dominated_mask, objective_matrix
+from app.algorithms.part1_optimization import (
+    HeavyIndustry_AGV_Optimizer,
+    SLP_GA_Optimizer,
+    run_heavy_industry_example,
+    run_light_industry_example,
+)
+
+CASES = [
+    (SLP_GA_Optimizer, run_light_industry_example, (1, 1, -1)),
+    (HeavyIndustry_AGV_Optimizer, run_heavy_industry_example, (1, -1, 1)),
+]
+
+
+def _run(optimizer_cls, example, engine: str, seed: int = 4):
+    optimizer = optimizer_cls({**example(), "seed": seed, "engine": engine})
+    optimizer.pop_size = 12
+    optimizer.ngen = 4
+    optimizer.run_optimization()
+    return optimizer
+
+
+@pytest.mark.parametrize("engine", ["nsga2", "nsga3"])
+@pytest.mark.parametrize(("optimizer_cls", "example", "senses"), CASES)
+def test_engine_returns_non_dominated_front(
+    optimizer_cls, example, senses, engine
+) -> None:
+    optimizer = _run(optimizer_cls, example, engine)
+
+    front = optimizer.pareto_solutions
+    assert front
+    assert non_dominated_mask(objective_matrix(front), senses=senses).all()
+    assert len(optimizer.evolution_history) == optimizer.ngen
+    for sol in front:
+        objectives = optimizer.evaluate_batch([sol["individual"]])[0]
+        assert objectives == pytest.approx(
+            (sol["total"], sol["f1"], sol["f2"], sol["f3"])
+        )
+
+
+@pytest.mark.parametrize(("optimizer_cls", "example"), [case[:2] for case in CASES])
+def test_engine_is_reproducible_with_seed(optimizer_cls, example) -> None:
+    first = _run(optimizer_cls, example, "nsga2")
+    second = _run(optimizer_cls, example, "nsga2")
+    assert objective_matrix(first.pareto_solutions).tolist() == (
+        objective_matrix(second.pareto_solutions).tolist()
+    )
+
+
+def test_unknown_engine_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        SLP_GA_Optimizer({**run_light_industry_example(), "engine": "spea2"})
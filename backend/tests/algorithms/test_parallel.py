@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from app.algorithms.parallel import EvaluationPool
+from app.algorithms.pareto import objective_matrix
+from app.algorithms.part1_optimization import (
+    HeavyIndustry_AGV_Optimizer,
+    run_heavy_industry_example,
+)
+
+
+@pytest.fixture(scope="module")
+def heavy_optimizer() -> HeavyIndustry_AGV_Optimizer:
+    return HeavyIndustry_AGV_Optimizer(run_heavy_industry_example())
+
+
+def _individuals(optimizer: HeavyIndustry_AGV_Optimizer, count: int) -> list:
+    optimizer.reseed(3)
+    return [optimizer.create_individual() for _ in range(count)]
+
+
+def test_serial_pool_is_seeded_and_keeps_optimizer_rng_state(
+    heavy_optimizer: HeavyIndustry_AGV_Optimizer,
+) -> None:
+    individuals = _individuals(heavy_optimizer, 6)
+    seeds = list(range(100, 106))
+
+    state = heavy_optimizer.rng.getstate()
+    with EvaluationPool(heavy_optimizer, parallelism="serial") as pool:
+        first = pool.map("evaluate_fitness", individuals, seeds)
+        second = pool.map("evaluate_fitness", individuals, seeds)
+    assert heavy_optimizer.rng.getstate() == state
+    assert first == second
+
+
+def test_process_pool_matches_serial_for_any_worker_count(
+    heavy_optimizer: HeavyIndustry_AGV_Optimizer,
+) -> None:
+    individuals = _individuals(heavy_optimizer, 8)
+    seeds = list(range(8))
+
+    with EvaluationPool(heavy_optimizer, parallelism="serial") as pool:
+        expected = pool.map("evaluate_fitness", individuals, seeds)
+    for workers in (1, 3):
+        with EvaluationPool(heavy_optimizer, workers=workers) as pool:
+            assert pool.map("evaluate_fitness", individuals, seeds) == expected
+
+
+def test_unknown_parallelism_is_rejected(
+    heavy_optimizer: HeavyIndustry_AGV_Optimizer,
+) -> None:
+    with pytest.raises(ValueError):
+        EvaluationPool(heavy_optimizer, parallelism="threads")
+    assert np.isfinite(
+        heavy_optimizer.evaluate_fitness(_individuals(heavy_optimizer, 1)[0])[0]
+    )
+
+
+@pytest.mark.parametrize("deterministic_decode", [True, False])
+def test_run_is_independent_of_parallelism(deterministic_decode: bool) -> None:
+    def run(parallelism):
+        optimizer = HeavyIndustry_AGV_Optimizer(
+            {
+                **run_heavy_industry_example(),
+                "seed": 7,
+                "parallelism": parallelism,
+                "deterministic_decode": deterministic_decode,
+            }
+        )
+        optimizer.pop_size = 10
+        optimizer.ngen = 4
+        optimizer.run_optimization()
+        return optimizer
+
+    serial = run("serial")
+    reference = run(None)
+
+    assert serial.rng.getstate() == reference.rng.getstate()
+    assert [entry["f1"] for entry in serial.evolution_history] == [
+        entry["f1"] for entry in reference.evolution_history
+    ]
+    assert np.array_equal(
+        objective_matrix(serial.pareto_solutions),
+        objective_matrix(reference.pareto_solutions),
+    )
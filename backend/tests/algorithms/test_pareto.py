@@ -0,0 +1,133 @@
+import numpy as np
+
+from app.algorithms.pareto import (
+    ParetoArchive,
+    crowding_distance,
+    kmeans,
+    non_dominated_mask,
+    non_dominated_rank,
+    objective_matrix,
+)
+
+
+def _brute_force_mask(F: np.ndarray, epsilon: float = 0.0) -> np.ndarray:
+    n = len(F)
+    mask = np.ones(n, dtype=bool)
+    for a in range(n):
+        for b in range(n):
+            if np.all(F[b] <= F[a] + epsilon) and np.any(F[b] < F[a] - epsilon):
+                mask[a] = False
+                break
+    return mask
+
+
+def test_mask_matches_brute_force() -> None:
+    rng = np.random.default_rng(0)
+    for m in (2, 3, 4):
+        F = rng.random((600, m))
+        assert np.array_equal(
+            non_dominated_mask(F, block_size=64), _brute_force_mask(F)
+        )
+
+
+def test_mask_with_ties_and_duplicates() -> None:
+    rng = np.random.default_rng(1)
+    F = rng.integers(0, 6, size=(400, 3)).astype(float)
+    assert np.array_equal(non_dominated_mask(F, block_size=32), _brute_force_mask(F))
+
+
+def test_senses_flip_maximized_objectives() -> None:
+    F = np.array([[1.0, 0.2], [1.0, 0.8], [2.0, 0.9]])
+    assert non_dominated_mask(F, senses=(1, -1)).tolist() == [False, True, True]
+
+
+def test_rank_layers() -> None:
+    rng = np.random.default_rng(2)
+    F = rng.random((300, 3))
+    ranks = non_dominated_rank(F)
+    remaining = np.arange(len(F))
+    for rank in range(ranks.max() + 1):
+        front = _brute_force_mask(F[remaining])
+        assert np.array_equal(np.sort(remaining[front]), np.flatnonzero(ranks == rank))
+        remaining = remaining[~front]
+
+    capped = non_dominated_rank(F, max_rank=1)
+    assert np.array_equal(capped[ranks <= 1], ranks[ranks <= 1])
+    assert np.all(capped[ranks > 1] == 2)
+
+
+def test_objective_matrix() -> None:
+    solutions = [{"f1": 1, "f2": 2, "f3": 3}, {"f1": 4, "f2": 5, "f3": 6}]
+    assert objective_matrix(solutions).shape == (2, 3)
+    assert objective_matrix([]).shape == (0, 3)
+
+
+def _solutions(F: np.ndarray) -> list[dict]:
+    return [{"f1": a, "f2": b, "f3": c} for a, b, c in F]
+
+
+def test_unbounded_archive_keeps_exact_front() -> None:
+    rng = np.random.default_rng(4)
+    archive = ParetoArchive((1, 1, -1), capacity=None)
+    seen = []
+    for _ in range(20):
+        batch = rng.random((50, 3))
+        seen.append(batch)
+        archive.add(_solutions(batch))
+
+    F = np.vstack(seen)
+    expected = F[non_dominated_mask(F, senses=(1, 1, -1))]
+    assert sorted(map(tuple, archive.objectives)) == sorted(map(tuple, expected))
+    assert len(archive) == len(archive.solutions) == len(expected)
+
+
+def test_bounded_archive_truncates_by_crowding() -> None:
+    rng = np.random.default_rng(5)
+    archive = ParetoArchive((1, 1), capacity=25, keys=("f1", "f2"))
+    for _ in range(10):
+        x = rng.random(100)
+        archive.add([{"f1": a, "f2": 1 - a} for a in x])
+
+    assert len(archive) == 25
+    assert np.all(non_dominated_mask(archive.objectives))
+    # 边界解的拥挤距离为无穷大，截断时保留
+    assert archive.objectives[:, 0].min() < 0.02
+    assert archive.objectives[:, 0].max() > 0.98
+
+
+def test_archive_drops_duplicate_objectives() -> None:
+    archive = ParetoArchive((1, 1), keys=("f1", "f2"))
+    first = {"f1": 1.0, "f2": 2.0, "tag": "first"}
+    archive.add([first, {"f1": 1.0, "f2": 2.0, "tag": "second"}])
+    archive.add([{"f1": 1.0, "f2": 2.0, "tag": "third"}])
+    assert archive.solutions == [first]
+
+
+def test_crowding_distance_boundaries() -> None:
+    F = np.array([[0.0, 1.0], [0.5, 0.5], [1.0, 0.0], [0.25, 0.75]])
+    distance = crowding_distance(F)
+    assert np.isinf(distance[0]) and np.isinf(distance[2])
+    assert np.all(np.isfinite(distance[[1, 3]]))
+
+
+def test_kmeans_recovers_separated_blobs() -> None:
+    rng = np.random.default_rng(0)
+    blob_centers = np.array([[0.0, 0.0, 0.0], [5.0, 5.0, 0.0], [0.0, 5.0, 5.0]])
+    X = np.vstack([c + 0.1 * rng.standard_normal((200, 3)) for c in blob_centers])
+    labels, centers = kmeans(X, 3, np.random.default_rng(1))
+
+    assert sorted(np.bincount(labels)) == [200, 200, 200]
+    for blob in range(3):
+        assert len(set(labels[blob * 200 : (blob + 1) * 200])) == 1
+    assert np.allclose(
+        np.sort(centers, axis=0), np.sort(blob_centers, axis=0), atol=0.05
+    )
+
+
+def test_kmeans_converges_to_nearest_center_assignment() -> None:
+    X = np.random.default_rng(2).random((2000, 3))
+    labels, centers = kmeans(X, 8, np.random.default_rng(3), max_iter=200)
+    nearest = np.argmin(((X[:, None, :] - centers[None]) ** 2).sum(axis=-1), axis=1)
+    assert np.array_equal(labels, nearest)
+    for j in range(8):
+        assert np.allclose(centers[j], X[labels == j].mean(axis=0))
@@ -0,0 +1,375 @@
+import pickle
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from deap import creator
+
+from app.algorithms.part1_optimization import (
+    AssignmentDiversity,
+    HeavyIndustry_AGV_Optimizer,
+    Individual,
+    LayoutDeltaEvaluator,
+    SLP_GA_Optimizer,
+    run_heavy_industry_example,
+    run_light_industry_example,
+)
+
+
+@pytest.fixture(scope="module")
+def light_optimizer() -> SLP_GA_Optimizer:
+    return SLP_GA_Optimizer(run_light_industry_example())
+
+
+def _random_layouts(optimizer: SLP_GA_Optimizer, count: int) -> list[list]:
+    optimizer.reseed(7)
+    return [optimizer.create_individual() for _ in range(count)]
+
+
+def test_vectorized_evaluation_matches_reference(
+    light_optimizer: SLP_GA_Optimizer,
+) -> None:
+    for individual in _random_layouts(light_optimizer, 20):
+        vectorized = light_optimizer.evaluate_individual(individual)
+        reference = light_optimizer.evaluate_individual_reference(individual)
+        assert np.allclose(vectorized, reference, rtol=1e-9, atol=1e-12)
+
+
+def test_vectorized_evaluation_of_original_layout(
+    light_optimizer: SLP_GA_Optimizer,
+) -> None:
+    original = [tuple(pos) for pos in light_optimizer.original_positions]
+    total, f1, f2, f3 = light_optimizer.evaluate_individual(original)
+    assert f2 == 0
+    assert np.isclose(f1, light_optimizer.evaluate_individual_reference(original)[1])
+    assert 0 <= f3 <= 1
+    assert total > 0
+
+
+def test_population_evaluation_matches_reference(
+    light_optimizer: SLP_GA_Optimizer,
+) -> None:
+    layouts = _random_layouts(light_optimizer, 16)
+    total, f1, f2, f3, penalty = light_optimizer.evaluate_population(layouts)
+    assert total.shape == (16,)
+    for k, individual in enumerate(layouts):
+        reference = light_optimizer.evaluate_individual_reference(individual)
+        assert np.allclose(
+            (total[k], f1[k], f2[k], f3[k]), reference, rtol=1e-9, atol=1e-12
+        )
+        assert np.isclose(
+            penalty[k], light_optimizer.calculate_constraint_penalty(individual)
+        )
+
+
+def test_run_optimization_reuses_cached_objectives() -> None:
+    optimizer = SLP_GA_Optimizer(run_light_industry_example())
+    optimizer.pop_size = 12
+    optimizer.ngen = 3
+    optimizer.run_optimization()
+    assert optimizer.all_solutions
+    assert len(optimizer.all_solutions) <= optimizer.archive_size
+    assert optimizer.objective_log.shape == (3 * 12, 3)
+    for sol in optimizer.all_solutions[-12:]:
+        reference = optimizer.evaluate_individual_reference(sol["individual"])
+        assert np.isclose(sol["total"], reference[0])
+        assert np.isclose(sol["f1"], reference[1])
+
+
+def _crowded_layouts(optimizer: SLP_GA_Optimizer, count: int) -> list[list]:
+    """设备挤在车间一角、部分越界的布局，用于触发大量重叠与通道占用"""
+    rng = np.random.default_rng(11)
+    layouts = []
+    for _ in range(count):
+        xy = rng.uniform(-5, 0.4 * optimizer.L, size=(optimizer.N, 2))
+        layouts.append([tuple(map(float, pos)) for pos in xy])
+    return layouts
+
+
+def test_constraint_penalty_matches_pairwise_reference(
+    light_optimizer: SLP_GA_Optimizer,
+) -> None:
+    layouts = _random_layouts(light_optimizer, 10) + _crowded_layouts(
+        light_optimizer, 10
+    )
+    for individual in layouts:
+        assert light_optimizer.calculate_constraint_penalty(
+            individual
+        ) == light_optimizer.calculate_constraint_penalty_reference(individual)
+
+    batch_penalty = light_optimizer.evaluate_population(layouts)[4]
+    reference = [
+        light_optimizer.calculate_constraint_penalty_reference(ind) for ind in layouts
+    ]
+    assert np.allclose(batch_penalty, reference, rtol=1e-9)
+
+
+def test_delta_evaluation_tracks_full_evaluation(
+    light_optimizer: SLP_GA_Optimizer,
+) -> None:
+    rng = random.Random(5)
+    layout = _random_layouts(light_optimizer, 1)[0]
+    evaluator = LayoutDeltaEvaluator(light_optimizer, layout, resync_interval=0)
+    assert np.allclose(
+        evaluator.objectives, light_optimizer.evaluate_individual(layout)
+    )
+
+    for _ in range(200):
+        devices = rng.sample(light_optimizer.M, rng.choice([1, 2, 3]))
+        moves = {
+            dev: (
+                rng.uniform(-5, light_optimizer.L),
+                rng.uniform(-5, light_optimizer.W),
+            )
+            for dev in devices
+        }
+        candidate = evaluator.individual()
+        for dev, pos in moves.items():
+            candidate[dev] = pos
+
+        proposed = evaluator.propose(moves)
+        reference = light_optimizer.evaluate_individual_reference(candidate)
+        assert np.allclose(proposed, reference, rtol=1e-9)
+        if rng.random() < 0.5:
+            evaluator.accept()
+            assert evaluator.individual() == candidate
+
+
+def test_local_search_never_worsens_total() -> None:
+    optimizer = SLP_GA_Optimizer(run_light_industry_example())
+    optimizer.setup_ga()
+    start = _random_layouts(optimizer, 1)[0]
+    refined = optimizer.local_search(start, 300)
+    assert refined.objectives[0] <= optimizer.evaluate_individual(start)[0]
+    assert np.allclose(
+        refined.objectives, optimizer.evaluate_individual_reference(refined)
+    )
+
+
+def test_population_diversity_matches_pairwise_reference(
+    light_optimizer: SLP_GA_Optimizer,
+) -> None:
+    population = _random_layouts(light_optimizer, 30)
+    assert np.isclose(
+        light_optimizer.calculate_population_diversity(population),
+        light_optimizer.calculate_population_diversity_reference(population),
+        rtol=1e-12,
+    )
+    assert light_optimizer.calculate_population_diversity(population[:1]) == 0
+
+
+def test_sampled_population_diversity_is_close() -> None:
+    optimizer = SLP_GA_Optimizer(
+        {**run_light_industry_example(), "diversity_sample_pairs": 400}
+    )
+    population = _random_layouts(optimizer, 40)
+    sampled = optimizer.calculate_population_diversity(population)
+    exact = optimizer.calculate_population_diversity_reference(population)
+    assert abs(sampled - exact) < 0.1 * exact
+
+
+def test_light_pareto_front_covers_full_archive(
+    light_optimizer: SLP_GA_Optimizer,
+) -> None:
+    layouts = _random_layouts(light_optimizer, 300)
+    total, f1, f2, f3, _ = light_optimizer.evaluate_population(layouts)
+    solutions = [
+        {"individual": ind, "f1": f1[k], "f2": f2[k], "f3": f3[k], "total": total[k]}
+        for k, ind in enumerate(layouts)
+    ]
+    front = light_optimizer.get_pareto_front(solutions)
+
+    assert front
+    assert [sol["total"] for sol in front] == sorted(sol["total"] for sol in front)
+    for sol in solutions:
+        in_front = any(sol is pf for pf in front)
+        dominated = any(light_optimizer.is_dominated(sol, other) for other in solutions)
+        assert in_front != dominated
+
+
+def test_heavy_pareto_front_covers_full_archive() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer(run_heavy_industry_example())
+    rng = np.random.default_rng(3)
+    optimizer.all_solutions = [
+        {
+            "f1": float(rng.uniform(0.3, 1.0) * optimizer.T),
+            "f2": float(rng.random()),
+            "f3": float(rng.random()),
+            "total": float(rng.random()),
+        }
+        for _ in range(2000)
+    ]
+    front = optimizer.get_pareto_front_improved()
+
+    assert 5 <= len(front) <= 60
+    for sol in front:
+        assert not any(
+            optimizer.is_dominated(sol, other) for other in optimizer.all_solutions
+        )
+
+
+def _seeded_run(optimizer_cls, example, seed: int) -> tuple[list, list]:
+    return _run_input(optimizer_cls, {**example(), "seed": seed})
+
+
+def _run_input(optimizer_cls, input_data: dict) -> tuple[list, list]:
+    optimizer = optimizer_cls(input_data)
+    optimizer.pop_size = 16
+    optimizer.ngen = 4
+    random.seed(input_data["seed"] + 1)  # 全局随机数状态不应影响结果
+    pareto, _, history = optimizer.run_optimization()
+    return (
+        [(h["f1"], h["f2"], h["f3"]) for h in history],
+        sorted((sol["f1"], sol["f2"], sol["f3"]) for sol in pareto),
+    )
+
+
+@pytest.mark.parametrize(
+    "optimizer_cls, example",
+    [
+        (SLP_GA_Optimizer, run_light_industry_example),
+        (HeavyIndustry_AGV_Optimizer, run_heavy_industry_example),
+    ],
+)
+def test_same_seed_reproduces_run(optimizer_cls, example) -> None:
+    first = _seeded_run(optimizer_cls, example, seed=123)
+    assert _seeded_run(optimizer_cls, example, seed=123) == first
+    assert _seeded_run(optimizer_cls, example, seed=456) != first
+
+
+def test_concurrent_runs_match_sequential_runs() -> None:
+    # 示例数据由全局随机数生成，先在主线程中生成好
+    cases = [
+        (SLP_GA_Optimizer, {**run_light_industry_example(), "seed": 11}),
+        (HeavyIndustry_AGV_Optimizer, {**run_heavy_industry_example(), "seed": 12}),
+    ] * 2
+    sequential = [_run_input(*case) for case in cases]
+    with ThreadPoolExecutor(max_workers=len(cases)) as pool:
+        concurrent = list(pool.map(lambda case: _run_input(*case), cases))
+
+    assert concurrent == sequential
+    assert not hasattr(creator, "Individual")
+
+
+def test_individual_pickles_with_fitness() -> None:
+    individual = Individual([(1.0, 2.0), (3.0, 4.0)])
+    individual.fitness.values = (0.5,)
+    restored = pickle.loads(pickle.dumps(individual))
+    assert restored == individual
+    assert restored.fitness.values == (0.5,)
+    assert not Individual().fitness.valid
+
+
+def test_heavy_deterministic_decode_is_repeatable() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer(run_heavy_industry_example())
+    individual = optimizer.create_individual()
+    assert len(individual) == 4
+
+    first = optimizer.evaluate_individual(individual)
+    assert optimizer.evaluate_individual(individual)[:4] == first[:4]
+
+    legacy = HeavyIndustry_AGV_Optimizer(
+        {**run_heavy_industry_example(), "deterministic_decode": False}
+    )
+    totals = {legacy.evaluate_individual(individual)[0] for _ in range(5)}
+    assert len(totals) > 1
+
+
+def test_heavy_operators_search_decode_genes() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer({**run_heavy_industry_example(), "seed": 3})
+    parent = optimizer.create_individual()
+    genes = list(parent[3])
+
+    mutants = [optimizer.mutate_individual(parent) for _ in range(200)]
+    strategies = {mutant[3][0] for mutant in mutants}
+    assert strategies - {genes[0]}
+    assert strategies <= set(range(len(optimizer.SCHEDULING_STRATEGIES)))
+    assert parent[3] == genes
+
+    other = optimizer.create_individual()
+    optimizer.cxpb = 1.0
+    children = [optimizer.crossover_individuals(parent, other) for _ in range(50)]
+    assert any(child1[3] != parent[3] for child1, _ in children)
+
+
+def test_heavy_archive_objectives_match_reevaluation() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer({**run_heavy_industry_example(), "seed": 1})
+    optimizer.pop_size = 20
+    optimizer.ngen = 3
+    optimizer.run_optimization()
+    for sol in optimizer.all_solutions:
+        total, f1, f2, f3, schedule = optimizer.evaluate_individual(sol["individual"])
+        assert (sol["total"], sol["f1"], sol["f2"], sol["f3"]) == (total, f1, f2, f3)
+        assert sol["schedule"] == schedule
+
+
+def test_heavy_operation_tables_match_mapping() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer(run_heavy_industry_example())
+    for op_id, mapping in optimizer.operation_to_task.items():
+        task_id, op_idx = mapping["task_id"], mapping["operation_idx"]
+        assert optimizer.op_task[op_id] == task_id
+        assert optimizer.op_index[op_id] == op_idx
+        assert optimizer.op_device[op_id] == mapping["operation_info"]["device_id"] - 1
+        start, end = optimizer.task_op_ranges[task_id]
+        assert start <= op_id < end
+        prev = optimizer.prev_op[op_id]
+        if op_idx == 0:
+            assert prev == -1
+        else:
+            assert optimizer.operation_to_task[prev]["task_id"] == task_id
+            assert optimizer.operation_to_task[prev]["operation_idx"] == op_idx - 1
+
+
+@pytest.mark.parametrize("deterministic", [True, False])
+def test_heavy_fast_decode_matches_full_schedule(deterministic: bool) -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer(
+        {**run_heavy_industry_example(), "deterministic_decode": deterministic}
+    )
+    for _ in range(20):
+        individual = optimizer.create_individual()
+        optimizer.reseed(4)
+        total, f1, f2, f3, schedule = optimizer.evaluate_individual(individual)
+        optimizer.reseed(4)
+        assert optimizer.evaluate_objectives(individual) == (total, f1, f2, f3)
+        assert len(schedule["operation_times"]) == optimizer.total_operations
+        assert schedule["makespan"] == f1
+
+
+def test_heavy_cluster_solutions_partitions_front() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer({**run_heavy_industry_example(), "seed": 1})
+    rng = np.random.default_rng(5)
+    solutions = [
+        {"f1": float(a * optimizer.T), "f2": float(b), "f3": float(c)}
+        for a, b, c in rng.random((500, 3))
+    ]
+    clusters = optimizer.cluster_solutions(solutions, n_clusters=20)
+
+    assert 1 < len(clusters) <= 20
+    assert sorted(id(sol) for c in clusters for sol in c) == sorted(map(id, solutions))
+
+
+def test_heavy_diversity_matches_pairwise_reference() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer({**run_heavy_industry_example(), "seed": 6})
+    population = [optimizer.create_individual() for _ in range(30)]
+    assert np.isclose(
+        optimizer.calculate_population_diversity(population),
+        optimizer.calculate_population_diversity_reference(population),
+        rtol=1e-12,
+    )
+    assert optimizer.calculate_population_diversity(population[:1]) == 0
+
+
+def test_incremental_diversity_tracks_population_changes() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer({**run_heavy_industry_example(), "seed": 8})
+    rng = random.Random(8)
+    pool = [optimizer.create_individual() for _ in range(60)]
+    tracker = AssignmentDiversity(optimizer.total_operations, optimizer.V)
+
+    population = pool[:20]
+    for _ in range(15):
+        value = tracker.sync(population)
+        reference = optimizer.calculate_population_diversity_reference(population)
+        assert np.isclose(value, reference, rtol=1e-12)
+        # 替换一部分个体，并允许同一个体重复出现
+        population = rng.sample(population, 14) + rng.choices(pool, k=6)
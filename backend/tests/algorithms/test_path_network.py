@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+
+from app.algorithms.part1_optimization import (
+    HeavyIndustry_AGV_Optimizer,
+    run_heavy_industry_example,
+)
+from app.algorithms.path_network import AisleGraph
+
+
+def _route_length(route: list) -> float:
+    return sum(math.dist(a, b) for a, b in zip(route[:-1], route[1:], strict=True))
+
+
+def test_crossing_aisles_are_connected() -> None:
+    network = [
+        {"points": [(0, 5), (10, 5)]},
+        {"points": [(5, 0), (5, 10)]},
+    ]
+    graph = AisleGraph(network, [(0, 5), (5, 10), (10, 0)])
+    # (10, 0) 不在通道上，接入最近的 (10, 5)
+    assert np.allclose(graph.station_distance, [[0, 10, 15], [10, 0, 15], [15, 15, 0]])
+    assert graph.route(0, 1) == [(0.0, 5.0), (5.0, 5.0), (5.0, 10.0)]
+
+
+def test_one_way_aisle_is_directed() -> None:
+    network = [
+        {"points": [(0, 0), (10, 0)], "bidirectional": False},
+        {"points": [(10, 0), (10, 10), (0, 10), (0, 0)], "bidirectional": False},
+    ]
+    graph = AisleGraph(network, [(0, 0), (10, 0)])
+    assert graph.station_distance[0, 1] == 10
+    assert graph.station_distance[1, 0] == 30
+
+
+def test_disconnected_stations_fall_back_to_straight_line() -> None:
+    network = [{"points": [(0, 0), (10, 0)], "bidirectional": False}]
+    graph = AisleGraph(network, [(0, 0), (10, 0)])
+    assert graph.unreachable[1, 0]
+    assert graph.station_distance[1, 0] == 10
+    assert graph.route(1, 0) == [(10.0, 0.0), (0.0, 0.0)]
+
+
+def test_heavy_network_travel_matrix() -> None:
+    optimizer = HeavyIndustry_AGV_Optimizer(run_heavy_industry_example())
+    graph = optimizer.aisle_graph
+    distance = np.asarray(optimizer.travel_distance)
+    positions = np.asarray(optimizer.station_positions, dtype=float)
+    straight = np.hypot(*(positions[:, None, :] - positions[None, :, :]).T)
+
+    assert not graph.unreachable.any()
+    assert np.all(distance >= straight.T - 1e-9)
+    for origin in range(len(positions)):
+        for target in range(len(positions)):
+            route = graph.route(origin, target)
+            assert np.isclose(_route_length(route), distance[origin, target])
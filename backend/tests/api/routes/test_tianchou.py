@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timedelta
 
 from fastapi.testclient import TestClient
@@ -101,3 +102,96 @@ def test_get_latest_completed_task_returns_404_without_completed_task(
     response = client.get(f"{settings.API_V1_STR}/tianchou/tasks/latest/completed")
     assert response.status_code == 404
     assert response.json()["detail"] == "No completed optimization task found"
+
+
+def test_cancel_task(client: TestClient, db: Session) -> None:
+    _reset_tianchou_tables(db)
+
+    pending_task = OptimizationTask(
+        name="pending-task", industry_type=IndustryType.LIGHT
+    )
+    running_task = OptimizationTask(
+        name="running-task",
+        industry_type=IndustryType.HEAVY,
+        status=TaskStatus.RUNNING,
+    )
+    completed_task = OptimizationTask(
+        name="completed-task",
+        industry_type=IndustryType.HEAVY,
+        status=TaskStatus.COMPLETED,
+    )
+    db.add_all([pending_task, running_task, completed_task])
+    db.commit()
+
+    url = f"{settings.API_V1_STR}/tianchou/tasks/{{}}/cancel"
+    response = client.post(url.format(pending_task.id))
+    assert response.status_code == 200
+    assert response.json()["status"] == TaskStatus.CANCELLED.value
+
+    # 执行中的任务由 worker 在下一代结束时停止
+    response = client.post(url.format(running_task.id))
+    assert response.status_code == 200
+    assert response.json()["status"] == TaskStatus.RUNNING.value
+    db.refresh(running_task)
+    assert running_task.cancel_requested
+
+    response = client.post(url.format(completed_task.id))
+    assert response.status_code == 400
+
+
+def test_stream_replays_finished_task(client: TestClient, db: Session) -> None:
+    _reset_tianchou_tables(db)
+
+    task = OptimizationTask(
+        name="finished-task",
+        industry_type=IndustryType.LIGHT,
+        status=TaskStatus.COMPLETED,
+        progress=100,
+        evolution_history={
+            "history": [
+                {"generation": 0, "f1": 3.0, "f2": 2.0, "f3": 0.5},
+                {"generation": 1, "f1": 2.5, "f2": 2.0, "f3": 0.6},
+            ]
+        },
+    )
+    db.add(task)
+    db.commit()
+
+    response = client.get(f"{settings.API_V1_STR}/tianchou/tasks/{task.id}/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [block for block in response.text.split("\n\n") if block]
+    assert events[0] == (
+        'event: generation\ndata: {"gen":0,"f1":3.0,"f2":2.0,"f3":0.5}'
+    )
+    assert len(events) == 3
+    assert events[-1] == 'event: status\ndata: {"status":"completed","progress":100}'
+
+
+def test_create_task_reuses_completed_result(client: TestClient, db: Session) -> None:
+    _reset_tianchou_tables(db)
+    url = f"{settings.API_V1_STR}/tianchou/tasks"
+    request = {"name": "first", "industry_type": "light", "device_count": 10}
+
+    response = client.post(url, json=request)
+    assert response.status_code == 200
+    assert response.json()["status"] == TaskStatus.PENDING.value
+
+    # 模拟 worker 完成第一个任务
+    first = db.get(OptimizationTask, uuid.UUID(response.json()["task_id"]))
+    first.status = TaskStatus.COMPLETED
+    first.pareto_solution_count = 1
+    first.completed_at = datetime.utcnow()
+    db.add(first)
+    db.add(ParetoSolution(task_id=first.id, f1=1.0, f2=2.0, total_cost=10.0))
+    db.commit()
+
+    response = client.post(url, json={**request, "name": "second"})
+    data = response.json()
+    assert data["status"] == TaskStatus.COMPLETED.value
+    assert data["solution_count"] == 1
+    assert data["task_id"] != str(first.id)
+
+    response = client.post(url, json={**request, "use_cache": False})
+    assert response.json()["status"] == TaskStatus.PENDING.value
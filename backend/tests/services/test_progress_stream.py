@@ -0,0 +1,84 @@
+import asyncio
+import socket
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+from app.services import progress_stream
+
+
+def test_generation_event_is_compact() -> None:
+    entry = {
+        "generation": 3,
+        "f1": 1.5,
+        "f2": 2.0,
+        "f3": float("nan"),
+        "diversity": 0.4,
+        "mutpb": 0.2,
+        "elapsed_time": 1.25,
+        "cache_hits": 10,
+    }
+    assert progress_stream.generation_event(entry) == {
+        "event": "generation",
+        "gen": 3,
+        "f1": 1.5,
+        "f2": 2.0,
+        "diversity": 0.4,
+        "elapsed": 1.25,
+    }
+
+
+def test_published_events_reach_listener() -> None:
+    task_id = uuid.uuid4()
+
+    async def receive():
+        events = progress_stream.listen(task_id, idle_timeout=0.1)
+        # 第一次超时说明 LISTEN 已生效
+        assert await anext(events) is None
+        progress_stream.GenerationPublisher(task_id)({"generation": 0, "f1": 1.0})
+        progress_stream.publish_status(task_id, "completed", 100)
+        received = [await anext(events), await anext(events)]
+        await events.aclose()
+        return received
+
+    assert asyncio.run(receive()) == [
+        {"event": "generation", "gen": 0, "f1": 1.0},
+        {"event": "status", "status": "completed", "progress": 100},
+    ]
+
+
+def test_slow_connect_does_not_block_event_loop() -> None:
+    reader, writer = socket.socketpair()
+    conn = MagicMock()
+    conn.fileno.return_value = reader.fileno()
+    conn.notifies = []
+
+    def slow_connect(*_args, **_kwargs):
+        time.sleep(0.5)
+        return conn
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        events = progress_stream.listen(uuid.uuid4(), idle_timeout=0.01)
+        assert await anext(events) is None
+        await events.aclose()
+        ticker.cancel()
+        return ticks
+
+    with patch("app.services.progress_stream.psycopg2.connect", slow_connect):
+        ticks = asyncio.run(run())
+    reader.close()
+    writer.close()
+
+    # 连接期间事件循环仍在运行其他协程
+    assert ticks >= 10
+    conn.cursor.return_value.__enter__.return_value.execute.assert_called_once()
+    conn.close.assert_called_once()
@@ -0,0 +1,74 @@
+import uuid
+
+from sqlmodel import Session, select
+
+from app.models import IndustryType, OptimizationTask, ParetoSolution, TaskStatus
+from app.services import result_cache
+
+PARAMS = {
+    "name": "workshop-a",
+    "industry_type": "light",
+    "device_count": 10,
+    "workshop_length": 80.0,
+    "seed": 7,
+    "workers": 2,
+}
+
+
+def test_result_key_ignores_name_and_workers() -> None:
+    key = result_cache.result_key(PARAMS)
+    assert key == result_cache.result_key(
+        {**PARAMS, "name": "workshop-b", "workers": 8, "use_cache": False}
+    )
+    assert key != result_cache.result_key({**PARAMS, "parallelism": "process"})
+    assert key == result_cache.result_key(dict(reversed(list(PARAMS.items()))))
+    assert key != result_cache.result_key({**PARAMS, "seed": 8})
+    assert key != result_cache.result_key({**PARAMS, "device_count": 11})
+
+
+def test_clone_copies_solutions(db: Session) -> None:
+    # 随机种子使缓存键不与其他测试创建的任务重复
+    params = {**PARAMS, "seed": uuid.uuid4().int % 2**32}
+    key = result_cache.result_key(params)
+    source = OptimizationTask(
+        name="source",
+        industry_type=IndustryType.LIGHT,
+        status=TaskStatus.COMPLETED,
+        input_params={**params, "original_positions": [[0, 0]]},
+        result_key=key,
+        pareto_solution_count=1,
+    )
+    db.add(source)
+    db.commit()
+    db.add(
+        ParetoSolution(
+            task_id=source.id,
+            f1=1.0,
+            f2=2.0,
+            total_cost=100.0,
+            rank=1,
+            topsis_score=0.9,
+        )
+    )
+    db.commit()
+
+    assert result_cache.find_cached_result(db, key).id == source.id
+
+    task = OptimizationTask(
+        name="copy",
+        industry_type=IndustryType.LIGHT,
+        input_params={**params, "name": "copy"},
+        result_key=key,
+    )
+    db.add(task)
+    result_cache.clone_result(db, source, task)
+    db.commit()
+
+    assert task.status == TaskStatus.COMPLETED
+    assert task.input_params["name"] == "copy"
+    assert task.input_params["original_positions"] == [[0, 0]]
+    cloned = db.exec(
+        select(ParetoSolution).where(ParetoSolution.task_id == task.id)
+    ).all()
+    assert [(sol.f1, sol.f2, sol.total_cost) for sol in cloned] == [(1.0, 2.0, 100.0)]
+    assert cloned[0].topsis_score is None
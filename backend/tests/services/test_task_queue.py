@@ -0,0 +1,195 @@
+from collections.abc import Generator
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, col, delete, select
+
+from app.core.db import engine
+from app.models import IndustryType, OptimizationTask, TaskStatus
+from app.services import task_queue
+
+
+@pytest.fixture
+def queue(db: Session) -> Generator[list[OptimizationTask], None, None]:
+    """
+    隔离其他测试留下的任务，产出本测试创建的任务列表
+
+    另一个会话锁住已有的任务，SKIP LOCKED 的领取和回收会跳过它们；
+    结束时只删除本测试创建的任务（检查点随任务级联删除）
+    """
+    created: list[OptimizationTask] = []
+    with Session(engine) as other:
+        other.exec(select(OptimizationTask).with_for_update()).all()
+        yield created
+        other.rollback()
+    db.rollback()
+    db.execute(
+        delete(OptimizationTask).where(
+            col(OptimizationTask.id).in_([task.id for task in created])
+        )
+    )
+    db.commit()
+
+
+def _enqueue(
+    db: Session, queue: list[OptimizationTask], name: str, minutes_ago: int = 0
+) -> OptimizationTask:
+    task = OptimizationTask(
+        name=name,
+        industry_type=IndustryType.LIGHT,
+        created_at=datetime.utcnow() - timedelta(minutes=minutes_ago),
+    )
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    queue.append(task)
+    return task
+
+
+def test_claim_takes_oldest_pending_task(
+    db: Session, queue: list[OptimizationTask]
+) -> None:
+    _enqueue(db, queue, "newer", minutes_ago=1)
+    older = _enqueue(db, queue, "older", minutes_ago=5)
+
+    claimed = task_queue.claim_next_task(db, "worker-a")
+
+    assert claimed is not None
+    assert claimed.id == older.id
+    assert claimed.status == TaskStatus.RUNNING
+    assert claimed.worker_id == "worker-a"
+    assert claimed.attempts == 1
+    assert claimed.heartbeat_at is not None
+
+
+def test_claim_skips_locked_tasks(db: Session, queue: list[OptimizationTask]) -> None:
+    first = _enqueue(db, queue, "first", minutes_ago=5)
+    second = _enqueue(db, queue, "second", minutes_ago=1)
+
+    with Session(engine) as other:
+        locked = other.exec(
+            select(OptimizationTask)
+            .where(OptimizationTask.status == TaskStatus.PENDING)
+            .order_by(col(OptimizationTask.created_at))
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        assert locked is not None
+        assert locked.id == first.id
+
+        claimed = task_queue.claim_next_task(db, "worker-b")
+        assert claimed is not None
+        assert claimed.id == second.id
+        other.rollback()
+
+    assert task_queue.claim_next_task(db, "worker-b").id == first.id
+    assert task_queue.claim_next_task(db, "worker-b") is None
+
+
+def test_failed_task_is_retried_until_max_attempts(
+    db: Session, queue: list[OptimizationTask]
+) -> None:
+    task = _enqueue(db, queue, "flaky")
+
+    for attempt in range(1, 3):
+        claimed = task_queue.claim_next_task(db, "worker-a")
+        assert claimed.attempts == attempt
+        status = task_queue.fail_task(db, task.id, "worker-a", "boom", max_attempts=2)
+        assert status == (TaskStatus.PENDING if attempt < 2 else TaskStatus.FAILED)
+
+    db.refresh(task)
+    assert task.status == TaskStatus.FAILED
+    assert task.error_message == "boom"
+    assert task.worker_id is None
+
+
+def test_fail_ignores_task_owned_by_another_worker(
+    db: Session, queue: list[OptimizationTask]
+) -> None:
+    task = _enqueue(db, queue, "owned")
+    task_queue.claim_next_task(db, "worker-a")
+
+    assert task_queue.fail_task(db, task.id, "worker-b", "boom", 3) is None
+    db.refresh(task)
+    assert task.status == TaskStatus.RUNNING
+
+
+def test_stale_running_task_is_requeued(
+    db: Session, queue: list[OptimizationTask]
+) -> None:
+    task = _enqueue(db, queue, "stale")
+    task_queue.claim_next_task(db, "worker-a")
+    task.heartbeat_at = datetime.utcnow() - timedelta(minutes=10)
+    db.add(task)
+    db.commit()
+
+    assert task_queue.requeue_stale_tasks(db, timedelta(minutes=2), 3) == 1
+    db.refresh(task)
+    assert task.status == TaskStatus.PENDING
+    assert task.worker_id is None
+
+    # 原 worker 的心跳发现任务已不归自己所有
+    result = task_queue.heartbeat(db, task.id, "worker-a")
+    assert result == task_queue.HeartbeatResult.LOST
+
+
+def test_heartbeat_reports_cancel_request(
+    db: Session, queue: list[OptimizationTask]
+) -> None:
+    task = _enqueue(db, queue, "running")
+    task_queue.claim_next_task(db, "worker-a")
+
+    result = task_queue.heartbeat(db, task.id, "worker-a")
+    assert result == task_queue.HeartbeatResult.OK
+    assert task_queue.request_cancel(db, task) == TaskStatus.RUNNING
+    result = task_queue.heartbeat(db, task.id, "worker-a")
+    assert result == task_queue.HeartbeatResult.CANCEL_REQUESTED
+
+    status = task_queue.cancel_running_task(db, task.id, "worker-a")
+    assert status == TaskStatus.CANCELLED
+
+
+def test_commit_owned_rejects_lost_task(
+    db: Session, queue: list[OptimizationTask]
+) -> None:
+    task = _enqueue(db, queue, "owned")
+    task_queue.claim_next_task(db, "worker-a")
+
+    # 同一事务中把任务改为已完成，检查仍按提交前的数据库状态进行
+    task.status = TaskStatus.COMPLETED
+    task.progress = 100
+    db.add(task)
+    task_queue.commit_owned(db, task.id, "worker-a")
+    db.refresh(task)
+    assert task.status == TaskStatus.COMPLETED
+
+    # 任务已结束或被回收后，原 worker 的写入被回滚
+    task.progress = 0
+    db.add(task)
+    with pytest.raises(task_queue.TaskLost):
+        task_queue.commit_owned(db, task.id, "worker-a")
+    db.refresh(task)
+    assert task.progress == 100
+
+
+def test_cancel_pending_task(db: Session, queue: list[OptimizationTask]) -> None:
+    task = _enqueue(db, queue, "pending")
+
+    assert task_queue.request_cancel(db, task) == TaskStatus.CANCELLED
+    assert task_queue.claim_next_task(db, "worker-a") is None
+
+
+def test_checkpoint_store_round_trip(
+    db: Session, queue: list[OptimizationTask]
+) -> None:
+    task = _enqueue(db, queue, "checkpointed")
+    store = task_queue.TaskCheckpointStore(task.id)
+
+    assert store.load() is None
+    store.save(b"first")
+    store.save(b"second")
+    assert store.load() == b"second"
+
+    task_queue.clear_checkpoint(db, task.id)
+    db.commit()
+    assert store.load() is None